@@ -0,0 +1,120 @@
+"""
+Measure the startup time and memory of the Chrome profiles in chrome_utils.
+
+- render: chrome_render_options, the minimal headless profile of the PDF render pool
+- scraping: chrome_scraping_options, the profile that loads job pages (headed unless --headless-scraping)
+
+For each launch the time init_browser takes and the resident memory of the whole browser process
+tree are reported, once right after startup and once after rendering a sample resume to PDF.
+RSS is read with psutil when it is installed, otherwise from /proc (Linux only).
+
+Usage:
+    python benchmarks/benchmark_browser_profiles.py [--launches 3] [--headless-scraping]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.benchmark_html_load import make_document  # noqa: E402
+from src.utils.chrome_utils import HTML_to_PDF_bytes, chrome_render_options, chrome_scraping_options, init_browser  # noqa: E402
+
+
+def _children_from_proc(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if parent == pid:
+            children.append(int(entry))
+            children.extend(_children_from_proc(int(entry)))
+    return children
+
+
+def _rss_from_proc(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def tree_rss(pid: int):
+    """
+    Resident memory in bytes of the process and all of its descendants, or None if it cannot be read.
+    """
+    try:
+        import psutil
+    except ImportError:
+        if not os.path.isdir("/proc"):
+            return None
+        return sum(_rss_from_proc(p) for p in [pid] + _children_from_proc(pid))
+    process = psutil.Process(pid)
+    total = 0
+    for p in [process] + process.children(recursive=True):
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def format_mb(value) -> str:
+    return "n/a" if value is None else f"{value / 2**20:.0f}MB"
+
+
+def measure(options_factory, launches: int, html: str):
+    startups, idle_rss, rendered_rss = [], [], []
+    for _ in range(launches):
+        start = time.perf_counter()
+        driver = init_browser(options_factory())
+        startups.append(time.perf_counter() - start)
+        try:
+            # chromedriver is the root of the browser process tree
+            pid = driver.service.process.pid
+            idle_rss.append(tree_rss(pid))
+            HTML_to_PDF_bytes(html, driver)
+            rendered_rss.append(tree_rss(pid))
+        finally:
+            driver.quit()
+    median = lambda values: None if None in values else statistics.median(values)  # noqa: E731
+    return statistics.median(startups), median(idle_rss), median(rendered_rss)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--launches", type=int, default=3, help="Browser launches per profile (median is reported)")
+    arg_parser.add_argument("--headless-scraping", action="store_true", help="Run the scraping profile headless, e.g. without a display")
+    args = arg_parser.parse_args()
+
+    def scraping_options():
+        options = chrome_scraping_options()
+        if args.headless_scraping:
+            options.add_argument("--headless=new")
+        return options
+
+    html = make_document(200)
+    profiles = {"render": chrome_render_options, "scraping": scraping_options}
+    # The first launch also resolves ChromeDriver, keep it out of the timings
+    init_browser(chrome_render_options()).quit()
+
+    print(f"{'profile':<10} {'startup':>10} {'RSS idle':>10} {'RSS after PDF':>14}")
+    for name, options_factory in profiles.items():
+        startup, idle, rendered = measure(options_factory, args.launches, html)
+        print(f"{name:<10} {startup * 1000:>8.0f}ms {format_mb(idle):>10} {format_mb(rendered):>14}")
+
+
+if __name__ == "__main__":
+    main()
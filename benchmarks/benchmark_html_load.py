@@ -0,0 +1,106 @@
+"""
+Compare the ways of loading a generated HTML document into Chrome before printing it to PDF.
+
+- data URL: percent-encode the document into a data: URL (the old HTML_to_PDF path)
+- setDocumentContent: hand the HTML to CDP Page.setDocumentContent (the current path)
+- file: write the document to a temporary file and load it with a file:// URL
+
+Documents from 50 KB to 2 MB are generated from a resume-like template. Without --browser only
+the encoding cost and size of the data URL are measured, which needs no Chrome.
+
+Usage:
+    python benchmarks/benchmark_html_load.py [--sizes 50,200,500,1000,2000] [--repeat 5] [--browser]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import urllib.parse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SECTION = """
+<section class="experience">
+  <h2>Senior Engineer — Company {index}</h2>
+  <p class="dates">2019 – 2023 · Città di Castello, Italia</p>
+  <ul>
+    <li>Designed and operated data pipelines processing 2 TB/day with 99.95% availability.</li>
+    <li>Cut infrastructure cost by 35% by moving batch jobs to spot instances & autoscaling.</li>
+    <li>Mentored 6 engineers; introduced code review guidelines and "on-call" rotations.</li>
+  </ul>
+</section>
+"""
+
+
+def make_document(size_kb: int) -> str:
+    head = "<!DOCTYPE html><html><head><meta charset='UTF-8'><style>body{font-family:sans-serif}</style></head><body>"
+    sections = []
+    length = len(head)
+    while length < size_kb * 1024:
+        sections.append(SECTION.format(index=len(sections)))
+        length += len(sections[-1])
+    return head + "".join(sections) + "</body></html>"
+
+
+def time_call(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def load_file(driver, html: str) -> None:
+    with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as f:
+        f.write(html)
+        path = f.name
+    try:
+        driver.get(Path(path).as_uri())
+    finally:
+        os.remove(path)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", default="50,200,500,1000,2000", help="Comma-separated document sizes in KB")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement (median is reported)")
+    arg_parser.add_argument("--browser", action="store_true", help="Also time loading the documents in headless Chrome")
+    args = arg_parser.parse_args()
+
+    documents = {int(size): make_document(int(size)) for size in args.sizes.split(",")}
+
+    print(f"{'size':>8} {'data URL size':>14} {'encode':>10}")
+    for size_kb, html in documents.items():
+        encoded = f"data:text/html;charset=utf-8,{urllib.parse.quote(html)}"
+        encode_time = time_call(lambda: urllib.parse.quote(html), args.repeat)
+        print(f"{size_kb:>6}KB {len(encoded) / len(html.encode('utf-8')):>13.2f}x {encode_time * 1000:>8.1f}ms")
+
+    if not args.browser:
+        return
+
+    from src.utils.chrome_utils import chrome_render_options, init_browser, load_html, load_html_data_url
+
+    driver = init_browser(chrome_render_options())
+    try:
+        methods = {
+            "data URL": load_html_data_url,
+            "setDocumentContent": load_html,
+            "file": load_file,
+        }
+        print(f"\n{'size':>8} " + " ".join(f"{name:>20}" for name in methods))
+        for size_kb, html in documents.items():
+            timings = []
+            for load in methods.values():
+                # readyState makes the timing include parsing, not just the command round trip
+                timings.append(time_call(lambda: (load(driver, html), driver.execute_script("return document.readyState")), args.repeat))
+            print(f"{size_kb:>6}KB " + " ".join(f"{t * 1000:>18.1f}ms" for t in timings))
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
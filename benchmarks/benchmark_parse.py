@@ -0,0 +1,77 @@
+"""
+Measure the throughput of the LLMParser parse stage on a folder of saved job pages.
+
+Compares the old path (write the page to a temporary file, read it back with
+TextLoader and encoding detection, then split) with the in-memory path used by
+LLMParser.set_body_html (build Documents straight from the string, then split).
+
+Usage:
+    python benchmarks/benchmark_parse.py path/to/saved_pages [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_community.document_loaders import TextLoader
+
+from src.libs.resume_and_cover_builder.html_cleaner import html_to_text
+from src.libs.resume_and_cover_builder.llm.llm_job_parser import LLMParser
+
+
+def parse_with_temp_file(page_text: str):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w", encoding="utf-8") as temp_file:
+        temp_file.write(page_text)
+        temp_file_path = temp_file.name
+    try:
+        documents = TextLoader(temp_file_path, encoding="utf-8", autodetect_encoding=True).load()
+    finally:
+        os.remove(temp_file_path)
+    return LLMParser._get_text_splitter().split_documents(documents)
+
+
+def parse_in_memory(page_text: str):
+    return LLMParser._get_text_splitter().create_documents([page_text], metadatas=[{"source": "job_page"}])
+
+
+def run_batch(parse, texts):
+    start = time.perf_counter()
+    chunk_count = sum(len(parse(text)) for text in texts)
+    return time.perf_counter() - start, chunk_count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("pages", type=Path, help="Folder containing saved job pages (*.html)")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Number of timed passes over the batch")
+    args = arg_parser.parse_args()
+
+    pages = sorted(args.pages.glob("*.html"))
+    if not pages:
+        sys.exit(f"No *.html files found in {args.pages}")
+
+    start = time.perf_counter()
+    texts = [html_to_text(page.read_text(encoding="utf-8", errors="replace")) for page in pages]
+    print(f"HTML cleaning: {len(pages) / (time.perf_counter() - start):.1f} pages/s")
+
+    # Warm up the tokenizer so its load time is not attributed to either path
+    LLMParser._get_text_splitter()
+    for name, parse in (("temp file + TextLoader", parse_with_temp_file), ("in-memory", parse_in_memory)):
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, chunk_count = run_batch(parse, texts)
+            timings.append(elapsed)
+        best = min(timings)
+        print(
+            f"{name:>24}: {len(texts) / best:.1f} pages/s, "
+            f"median batch {statistics.median(timings) * 1000:.1f} ms, {chunk_count} chunks"
+        )
+
+
+if __name__ == "__main__":
+    main()
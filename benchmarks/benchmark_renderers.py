@@ -0,0 +1,144 @@
+"""
+Compare the Chrome and ReportLab PDF renderers on a sample resume, for every style in resume_style.
+
+The sample body is assembled from the HTML templates in template_base.py, so it has the same markup
+the LLM produces. For each style the median render time of both backends is reported, and the two
+PDFs are compared: text similarity (pdfminer + Levenshtein) always, and the share of differing pixels
+on the first page when PyMuPDF is installed. Without --browser only ReportLab is timed.
+
+Usage:
+    python benchmarks/benchmark_renderers.py [--repeat 5] [--browser] [--output benchmarks/renderer_output]
+"""
+import argparse
+import io
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from string import Template
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.libs.resume_and_cover_builder import template_base  # noqa: E402
+from src.libs.resume_and_cover_builder.config import global_config  # noqa: E402
+from src.libs.resume_and_cover_builder.reportlab_renderer import HTML_to_PDF_reportlab  # noqa: E402
+from src.libs.resume_and_cover_builder.style_manager import StyleManager  # noqa: E402
+
+PLACEHOLDER_REGEX = re.compile(r"\[([^\]]+)\]")
+
+
+def sample_body() -> str:
+    """
+    Fill the fenced HTML templates of template_base.py with their placeholder names.
+    """
+    templates = [
+        template_base.prompt_header_template,
+        template_base.prompt_education_template,
+        template_base.prompt_working_experience_template,
+        template_base.prompt_projects_template,
+        template_base.prompt_achievements_template,
+        template_base.prompt_certifications_template,
+        template_base.prompt_additional_skills_template,
+    ]
+    sections = []
+    for template in templates:
+        match = re.search(r"```\s*\n(.*?)```", template, re.DOTALL) or re.search(r"'''\s*\n(.*?)'''", template, re.DOTALL)
+        if match:
+            sections.append(match.group(1))
+    return PLACEHOLDER_REGEX.sub(lambda m: m.group(1), "\n".join(sections))
+
+
+def time_call(fn, repeat: int):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def text_similarity(pdf_a: bytes, pdf_b: bytes) -> float:
+    import Levenshtein
+    from pdfminer.high_level import extract_text
+
+    text_a = " ".join(extract_text(io.BytesIO(pdf_a)).split())
+    text_b = " ".join(extract_text(io.BytesIO(pdf_b)).split())
+    return Levenshtein.ratio(text_a, text_b)
+
+
+def pixel_difference(pdf_a: bytes, pdf_b: bytes, diff_path: Path):
+    """
+    Share of pixels that differ on the first page, or None without PyMuPDF. The diff image is saved to diff_path.
+    """
+    try:
+        import fitz
+    except ImportError:
+        return None
+    from PIL import Image, ImageChops
+
+    images = []
+    for pdf in (pdf_a, pdf_b):
+        pixmap = fitz.open(stream=pdf, filetype="pdf")[0].get_pixmap(dpi=72)
+        images.append(Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples).convert("L"))
+    size = (min(images[0].width, images[1].width), min(images[0].height, images[1].height))
+    diff = ImageChops.difference(images[0].crop((0, 0) + size), images[1].crop((0, 0) + size))
+    diff.save(diff_path)
+    histogram = diff.point(lambda value: 255 if value > 32 else 0).histogram()
+    return histogram[255] / (size[0] * size[1])
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement (median is reported)")
+    arg_parser.add_argument("--browser", action="store_true", help="Also render with headless Chrome and compare the output")
+    arg_parser.add_argument("--output", default=str(Path(__file__).resolve().parent / "renderer_output"),
+                            help="Directory for the rendered PDFs and diff images")
+    args = arg_parser.parse_args()
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    style_manager = StyleManager()
+    body = sample_body()
+
+    pool = None
+    if args.browser:
+        from src.utils.chrome_utils import HTML_to_PDF_bytes
+        from src.utils.render_pool import RenderPool
+        pool = RenderPool(size=1)
+        # Warm the browser up so launching it is not counted in the first style
+        with pool.lease() as driver:
+            HTML_to_PDF_bytes("<p>warm up</p>", driver)
+
+    print(f"{'style':<28} {'reportlab':>10} {'chrome':>10} {'text sim':>9} {'pixel diff':>11}")
+    try:
+        for style_name, (file_name, _) in sorted(style_manager.get_styles().items()):
+            css = (style_manager.styles_directory / file_name).read_text(encoding="utf-8")
+            html = Template(global_config.html_template).substitute(body=body, style_css=css)
+            stem = Path(file_name).stem
+
+            reportlab_time, reportlab_pdf = time_call(lambda: HTML_to_PDF_reportlab(html), args.repeat)
+            (output_dir / f"{stem}_reportlab.pdf").write_bytes(reportlab_pdf)
+            row = f"{style_name[:28]:<28} {reportlab_time * 1000:>8.1f}ms"
+            if pool is None:
+                print(row)
+                continue
+
+            def render_chrome():
+                with pool.lease() as driver:
+                    return HTML_to_PDF_bytes(html, driver)
+
+            chrome_time, chrome_pdf = time_call(render_chrome, args.repeat)
+            (output_dir / f"{stem}_chrome.pdf").write_bytes(chrome_pdf)
+            similarity = text_similarity(chrome_pdf, reportlab_pdf)
+            pixels = pixel_difference(chrome_pdf, reportlab_pdf, output_dir / f"{stem}_diff.png")
+            pixels_text = "n/a" if pixels is None else f"{pixels:.1%}"
+            print(f"{row} {chrome_time * 1000:>8.1f}ms {similarity:>9.2f} {pixels_text:>11}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    print(f"\nPDFs written to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
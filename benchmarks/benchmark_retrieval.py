@@ -0,0 +1,82 @@
+"""
+Compare the LLMParser retrieval backends on a folder of saved job pages.
+
+For every *.html file the script measures the time to index the page and run the
+extraction queries with each backend, and how much the retrieved chunks overlap.
+With --extract it also runs the LLM extraction with each backend and reports how
+often the extracted fields agree (needs OPENAI_API_KEY).
+
+Usage:
+    python benchmarks/benchmark_retrieval.py path/to/saved_pages [--extract]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Levenshtein import ratio
+
+from src.libs.resume_and_cover_builder.llm.llm_job_parser import LLMParser
+from src.libs.resume_and_cover_builder.retrieval import RETRIEVAL_BACKENDS
+
+RETRIEVAL_QUERIES = [query for _, query in LLMParser.EXTRACTION_FIELDS.values()]
+EXTRACTED_FIELDS = ["role", "company", "location", "description"]
+
+
+def run_backend(backend: str, html: str, api_key: str, extract: bool):
+    parser = LLMParser(openai_api_key=api_key, retrieval_backend=backend)
+    start = time.perf_counter()
+    parser.set_body_html(html)
+    contexts = {query: parser._retrieve_context(query) for query in RETRIEVAL_QUERIES}
+    elapsed = time.perf_counter() - start
+    fields = parser.extract_all(EXTRACTED_FIELDS) if extract else {}
+    return elapsed, contexts, fields
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("pages", type=Path, help="Folder containing saved job pages (*.html)")
+    arg_parser.add_argument("--backends", nargs="+", default=list(RETRIEVAL_BACKENDS), choices=RETRIEVAL_BACKENDS)
+    arg_parser.add_argument("--extract", action="store_true", help="Also run LLM extraction and compare the fields")
+    args = arg_parser.parse_args()
+
+    api_key = os.environ.get("OPENAI_API_KEY", "sk-benchmark-placeholder")
+    pages = sorted(args.pages.glob("*.html"))
+    if not pages:
+        sys.exit(f"No *.html files found in {args.pages}")
+
+    latencies = {backend: [] for backend in args.backends}
+    overlaps = []
+    agreements = {name: [] for name in EXTRACTED_FIELDS}
+    reference, *others = args.backends
+
+    for page in pages:
+        html = page.read_text(encoding="utf-8", errors="replace")
+        results = {backend: run_backend(backend, html, api_key, args.extract) for backend in args.backends}
+        for backend, (elapsed, _, _) in results.items():
+            latencies[backend].append(elapsed)
+        for other in others:
+            for query in RETRIEVAL_QUERIES:
+                a = set(results[reference][1][query].split("\n\n"))
+                b = set(results[other][1][query].split("\n\n"))
+                overlaps.append(len(a & b) / max(1, len(a | b)))
+            for name in EXTRACTED_FIELDS if args.extract else ():
+                agreements[name].append(ratio(results[reference][2][name].lower(), results[other][2][name].lower()) >= 0.8)
+        print(f"{page.name}: " + ", ".join(f"{b}={results[b][0] * 1000:.0f} ms" for b in args.backends))
+
+    print(f"\n{len(pages)} pages")
+    for backend, values in latencies.items():
+        print(f"{backend:>8}: mean {statistics.mean(values) * 1000:.1f} ms, median {statistics.median(values) * 1000:.1f} ms")
+    if overlaps:
+        print(f"Retrieved chunk overlap ({reference} vs {', '.join(others)}): {statistics.mean(overlaps):.0%}")
+    for name, values in agreements.items():
+        if values:
+            print(f"Extraction agreement on {name}: {sum(values) / len(values):.0%}")
+
+
+if __name__ == "__main__":
+    main()
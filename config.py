@@ -13,10 +13,63 @@ MINIMUM_WAIT_TIME_IN_SECONDS = 60
 JOB_APPLICATIONS_DIR = "job_applications"
 JOB_SUITABILITY_SCORE = 7
 
+# Offline TF-IDF pre-filter run before the LLM suitability check.
+# Jobs below the reject threshold are skipped and the others are scored by the LLM.
+# Set an accept threshold (e.g. 0.45) to also keep jobs above it without the LLM.
+JOB_PREFILTER_ENABLED = True
+JOB_PREFILTER_REJECT_THRESHOLD = 0.05
+JOB_PREFILTER_ACCEPT_THRESHOLD = None
+JOB_PREFILTER_CACHE_DIR = "data_folder/output/cache/job_prefilter"
+
+# Maximum number of jobs scored concurrently by GPTAnswerer.triage_jobs
+JOB_TRIAGE_MAX_IN_FLIGHT = 8
+
 JOB_MAX_APPLICATIONS = 5
 JOB_MIN_APPLICATIONS = 1
 
 LLM_MODEL_TYPE = 'openai'
 LLM_MODEL = 'gpt-4o-mini'
 # Only required for OLLAMA models
-LLM_API_URL = ''
\ No newline at end of file
+LLM_API_URL = ''
+
+# Ollama tuning
+LLM_OLLAMA_KEEP_ALIVE = '30m'  # how long the server keeps the model loaded after the last request
+LLM_OLLAMA_WARM_UP = True  # load the model in the background as soon as the app starts
+LLM_OLLAMA_WARM_UP_TIMEOUT = 300
+LLM_OLLAMA_NUM_PARALLEL = None  # concurrent requests per server, defaults to $OLLAMA_NUM_PARALLEL or 1
+LLM_OLLAMA_MIN_NUM_CTX = 2048
+LLM_OLLAMA_MAX_NUM_CTX = 32768
+LLM_OLLAMA_REPLY_TOKENS = 1024  # room left in the context window for the reply
+
+# Retry policy for LLM calls (full-jitter exponential backoff)
+LLM_RETRY_MAX_ATTEMPTS = 8
+LLM_RETRY_BASE_DELAY = 2  # seconds
+LLM_RETRY_MAX_DELAY = 60  # seconds
+LLM_RETRY_DEADLINE = 600  # seconds per call including retries, None for no limit
+# Hedged requests: send a duplicate request when a call runs past the p95 latency
+LLM_HEDGE_REQUESTS = False
+LLM_HEDGE_PERCENTILE = 0.95
+LLM_HEDGE_MIN_SAMPLES = 20
+
+# Identical concurrent LLM requests share one call. The directory lets separate processes
+# share calls too; set it to None to deduplicate within a process only.
+LLM_SINGLE_FLIGHT = True
+LLM_SINGLE_FLIGHT_DIR = "data_folder/output/cache/single_flight"
+LLM_SINGLE_FLIGHT_RESULT_TTL = 60  # seconds before a result whose waiter died is removed; others are removed once read
+LLM_SINGLE_FLIGHT_LOCK_TIMEOUT = 900  # seconds, should exceed LLM_RETRY_DEADLINE
+
+# Headless Chrome instances kept warm for PDF rendering. A browser is replaced after
+# RENDER_POOL_MAX_RENDERS documents or once its JS heap grew by RENDER_POOL_MAX_HEAP_GROWTH_MB.
+RENDER_POOL_SIZE = 2
+RENDER_POOL_MAX_RENDERS = 50
+RENDER_POOL_MAX_HEAP_GROWTH_MB = 256
+# Viewport of the headless render browsers and the directory of their disk caches, one per pool slot
+RENDER_WINDOW_SIZE = "800,600"
+RENDER_DISK_CACHE_DIR = "data_folder/output/cache/render_browser"
+# Size of the style thumbnails relative to an A4 page at 96 DPI
+RENDER_THUMBNAIL_SCALE = 0.3
+# Maximum seconds HTML_to_PDF waits for fonts and images to load before printing
+RENDER_MAX_WAIT = 10
+
+# Resolved ChromeDriver path, Chrome version and checksum, reused until Chrome is updated
+CHROMEDRIVER_CACHE_FILE = "data_folder/output/cache/chromedriver.json"
@@ -1,4 +1,3 @@
-import base64
 import sys
 from pathlib import Path
 import traceback
@@ -16,7 +15,6 @@ from src.libs.resume_and_cover_builder import ResumeFacade, ResumeGenerator, Sty
 from src.resume_schemas.job_application_profile import JobApplicationProfile
 from src.resume_schemas.resume import Resume
 from src.logging import logger
-from src.utils.chrome_utils import init_browser
 from src.utils.constants import (
     PLAIN_TEXT_RESUME_YAML,
     SECRETS_YAML,
@@ -261,7 +259,6 @@ def create_cover_letter(parameters: dict, llm_api_key: str):
         job_url = answers.get('job_url')
         resume_generator = ResumeGenerator()
         resume_object = Resume(plain_text_resume)
-        driver = init_browser()
         resume_generator.set_resume_object(resume_object)
         resume_facade = ResumeFacade(            
             api_key=llm_api_key,
@@ -270,19 +267,9 @@ def create_cover_letter(parameters: dict, llm_api_key: str):
             resume_object=resume_object,
             output_path=Path("data_folder/output"),
         )
-        resume_facade.set_driver(driver)
-        resume_facade.link_to_job(job_url)
-        result_base64, suggested_name = resume_facade.create_cover_letter()         
-
-        # Decodifica Base64 in dati binari
-        try:
-            pdf_data = base64.b64decode(result_base64)
-        except base64.binascii.Error as e:
-            logger.error("Error decoding Base64: %s", e)
-            raise
-
+        resume_facade.link_to_job(job_url, refresh=parameters.get("refreshJobCache", False))
         # Definisci il percorso della cartella di output utilizzando `suggested_name`
-        output_dir = Path(parameters["outputFileDirectory"]) / suggested_name
+        output_dir = Path(parameters["outputFileDirectory"]) / resume_facade.suggested_name()
 
         # Crea la cartella se non esiste
         try:
@@ -292,10 +279,10 @@ def create_cover_letter(parameters: dict, llm_api_key: str):
             logger.error("Error creating output directory: %s", e)
             raise
         
+        # Il PDF viene scritto direttamente su disco
         output_path = output_dir / "cover_letter_tailored.pdf"
         try:
-            with open(output_path, "wb") as file:
-                file.write(pdf_data)
+            resume_facade.create_cover_letter(output_file=output_path)
             logger.info(f"CV salvato in: {output_path}")
         except IOError as e:
             logger.error("Error writing file: %s", e)
@@ -346,7 +333,6 @@ def create_resume_pdf_job_tailored(parameters: dict, llm_api_key: str):
         job_url = answers.get('job_url')
         resume_generator = ResumeGenerator()
         resume_object = Resume(plain_text_resume)
-        driver = init_browser()
         resume_generator.set_resume_object(resume_object)
         resume_facade = ResumeFacade(            
             api_key=llm_api_key,
@@ -355,19 +341,9 @@ def create_resume_pdf_job_tailored(parameters: dict, llm_api_key: str):
             resume_object=resume_object,
             output_path=Path("data_folder/output"),
         )
-        resume_facade.set_driver(driver)
-        resume_facade.link_to_job(job_url)
-        result_base64, suggested_name = resume_facade.create_resume_pdf_job_tailored()         
-
-        # Decodifica Base64 in dati binari
-        try:
-            pdf_data = base64.b64decode(result_base64)
-        except base64.binascii.Error as e:
-            logger.error("Error decoding Base64: %s", e)
-            raise
-
+        resume_facade.link_to_job(job_url, refresh=parameters.get("refreshJobCache", False))
         # Definisci il percorso della cartella di output utilizzando `suggested_name`
-        output_dir = Path(parameters["outputFileDirectory"]) / suggested_name
+        output_dir = Path(parameters["outputFileDirectory"]) / resume_facade.suggested_name()
 
         # Crea la cartella se non esiste
         try:
@@ -377,10 +353,10 @@ def create_resume_pdf_job_tailored(parameters: dict, llm_api_key: str):
             logger.error("Error creating output directory: %s", e)
             raise
         
+        # Il PDF viene scritto direttamente su disco
         output_path = output_dir / "resume_tailored.pdf"
         try:
-            with open(output_path, "wb") as file:
-                file.write(pdf_data)
+            resume_facade.create_resume_pdf_job_tailored(output_file=output_path)
             logger.info(f"CV salvato in: {output_path}")
         except IOError as e:
             logger.error("Error writing file: %s", e)
@@ -431,7 +407,6 @@ def create_resume_pdf(parameters: dict, llm_api_key: str):
         # Initialize the Resume Generator
         resume_generator = ResumeGenerator()
         resume_object = Resume(plain_text_resume)
-        driver = init_browser()
         resume_generator.set_resume_object(resume_object)
 
         # Create the ResumeFacade
@@ -442,24 +417,10 @@ def create_resume_pdf(parameters: dict, llm_api_key: str):
             resume_object=resume_object,
             output_path=Path("data_folder/output"),
         )
-        resume_facade.set_driver(driver)
-        result_base64 = resume_facade.create_resume_pdf()
-
-        # Decode Base64 to binary data
+        # Write the PDF straight to the output directory
+        output_path = Path(parameters["outputFileDirectory"]) / "resume_base.pdf"
         try:
-            pdf_data = base64.b64decode(result_base64)
-        except base64.binascii.Error as e:
-            logger.error("Error decoding Base64: %s", e)
-            raise
-
-        # Define the output directory using `suggested_name`
-        output_dir = Path(parameters["outputFileDirectory"])
-
-        # Write the PDF file
-        output_path = output_dir / "resume_base.pdf"
-        try:
-            with open(output_path, "wb") as file:
-                file.write(pdf_data)
+            resume_facade.create_resume_pdf(output_file=output_path)
             logger.info(f"Resume saved at: {output_path}")
         except IOError as e:
             logger.error("Error writing file: %s", e)
@@ -468,6 +429,37 @@ def create_resume_pdf(parameters: dict, llm_api_key: str):
         logger.exception(f"An error occurred while creating the CV: {e}")
         raise
 
+
+def create_resume_pdf_all_styles(parameters: dict, llm_api_key: str):
+    """
+    Logic to create a CV in every available style, from a single generation of its content.
+    """
+    try:
+        logger.info("Generating a CV in every available style.")
+
+        # Load the plain text resume
+        with open(parameters["uploads"]["plainTextResume"], "r", encoding="utf-8") as file:
+            plain_text_resume = file.read()
+
+        style_manager = StyleManager()
+        resume_generator = ResumeGenerator()
+        resume_object = Resume(plain_text_resume)
+        resume_generator.set_resume_object(resume_object)
+
+        resume_facade = ResumeFacade(
+            api_key=llm_api_key,
+            style_manager=style_manager,
+            resume_generator=resume_generator,
+            resume_object=resume_object,
+            output_path=Path("data_folder/output"),
+        )
+        output_dir = Path(parameters["outputFileDirectory"]) / "resume_styles"
+        pdf_paths = resume_facade.create_resume_pdf_all_styles(output_dir)
+        for style_name, pdf_path in pdf_paths.items():
+            logger.info(f"{style_name}: {pdf_path}")
+    except Exception as e:
+        logger.exception(f"An error occurred while creating the CV in every style: {e}")
+        raise
         
 def handle_inquiries(selected_actions: List[str], parameters: dict, llm_api_key: str):
     """
@@ -483,6 +475,10 @@ def handle_inquiries(selected_actions: List[str], parameters: dict, llm_api_key:
                 logger.info("Crafting a standout professional resume...")
                 create_resume_pdf(parameters, llm_api_key)
                 
+            if "Generate Resume in All Styles" == selected_actions:
+                logger.info("Rendering your resume in every available style...")
+                create_resume_pdf_all_styles(parameters, llm_api_key)
+
             if "Generate Resume Tailored for Job Description" == selected_actions:
                 logger.info("Customizing your resume to enhance your job application...")
                 create_resume_pdf_job_tailored(parameters, llm_api_key)
@@ -510,6 +506,7 @@ def prompt_user_action() -> str:
                 message="Select the action you want to perform:",
                 choices=[
                     "Generate Resume",
+                    "Generate Resume in All Styles",
                     "Generate Resume Tailored for Job Description",
                     "Generate Tailored Cover Letter for Job Description",
                 ],
@@ -525,7 +522,9 @@ def prompt_user_action() -> str:
         return ""
 
 
-def main():
+@click.command()
+@click.option("--refresh", is_flag=True, help="Fetch and parse job postings again instead of using the stored snapshots.")
+def main(refresh: bool = False):
     """Main entry point for the AIHawk Job Application Bot."""
     try:
         # Define and validate the data folder
@@ -539,6 +538,7 @@ def main():
         # Prepare parameters
         config["uploads"] = FileManager.get_uploads(plain_text_resume_file)
         config["outputFileDirectory"] = output_folder
+        config["refreshJobCache"] = refresh
 
         # Interactive prompt for user to select actions
         selected_actions = prompt_user_action()
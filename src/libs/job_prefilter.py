@@ -0,0 +1,221 @@
+"""
+Offline pre-filter that compares a job description with the resume before any LLM call.
+
+Texts are turned into hashed TF-IDF vectors with NumPy, so no network access and no
+model download is needed. Jobs well below the resume similarity threshold are rejected
+immediately and the rest are left for the LLM suitability check. Accepting clear matches
+without the LLM is opt-in, since word overlap alone says little about suitability.
+"""
+import atexit
+import hashlib
+import math
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from src.logging import logger
+
+REJECT = "reject"
+ACCEPT = "accept"
+BORDERLINE = "borderline"
+
+TOKEN_REGEX = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be been but by can do for from has have in into is it its of on or our
+    that the their there these they this to was we were will with you your yours us who what
+    which when where why how all any each about over under than then them also such not no
+    may might must should would could more most other some such only own same so very just
+    job role position work working team company candidate candidates
+    """.split()
+)
+
+
+class JobPrefilter:
+    def __init__(
+        self,
+        reject_threshold: float,
+        accept_threshold: Optional[float],
+        cache_dir: str,
+        dimensions: int = 2 ** 15,
+        save_every: int = 50,
+        max_seen_jobs: int = 100_000,
+    ):
+        """
+        Initialize the pre-filter.
+        Args:
+            reject_threshold (float): Cosine similarity below which a job is rejected without the LLM.
+            accept_threshold (float): Cosine similarity at or above which a job is accepted without the LLM,
+                None to always leave the decision to the LLM.
+            cache_dir (str): Directory where the document frequencies are stored.
+            dimensions (int): Size of the hashed feature space.
+            save_every (int): New jobs between two saves of the document frequency table; it is also saved at exit.
+            max_seen_jobs (int): Most recent jobs remembered so that a job seen again is not counted twice
+                in the document frequencies.
+        """
+        if not 0.0 <= reject_threshold <= (accept_threshold if accept_threshold is not None else 1.0):
+            raise ValueError("reject_threshold must be between 0 and accept_threshold.")
+        self.reject_threshold = reject_threshold
+        self.accept_threshold = accept_threshold
+        self.dimensions = dimensions
+        self.save_every = save_every
+        self.max_seen_jobs = max_seen_jobs
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._df_path = self.cache_dir / "document_frequencies.npz"
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._document_frequencies, self._document_count, self._seen_jobs = self._load_document_frequencies()
+        self._unsaved_jobs = 0
+        atexit.register(self.flush)
+        self._resume_vector: Optional[np.ndarray] = None
+        logger.debug(f"JobPrefilter initialized with cache at {self.cache_dir}")
+
+    @staticmethod
+    def resume_to_text(resume: Any) -> str:
+        """
+        Flatten a resume object (pydantic model, dict, list or plain string) into text.
+        """
+        if resume is None:
+            return ""
+        if isinstance(resume, str):
+            return resume
+        if hasattr(resume, "model_dump"):
+            resume = resume.model_dump()
+        elif hasattr(resume, "dict"):
+            resume = resume.dict()
+        if isinstance(resume, dict):
+            return " ".join(JobPrefilter.resume_to_text(value) for value in resume.values())
+        if isinstance(resume, (list, tuple, set)):
+            return " ".join(JobPrefilter.resume_to_text(value) for value in resume)
+        return str(resume)
+
+    @staticmethod
+    def _tokenize(text: str) -> list[str]:
+        tokens = [token for token in TOKEN_REGEX.findall(text.lower()) if token not in STOP_WORDS]
+        bigrams = [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        return tokens + bigrams
+
+    def _term_frequencies(self, text: str) -> np.ndarray:
+        """
+        Hash the tokens of a text into a sublinear term frequency vector.
+        """
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in self._tokenize(text):
+            vector[zlib.crc32(token.encode("utf-8")) % self.dimensions] += 1.0
+        nonzero = vector > 0
+        vector[nonzero] = 1.0 + np.log(vector[nonzero])
+        return vector
+
+    def _load_document_frequencies(self) -> tuple[np.ndarray, int, dict[int, None]]:
+        """
+        Load the document frequency table, the number of jobs it counts and the hashes of the most recent
+        of those jobs, in the order they were last seen.
+        """
+        if self._df_path.exists():
+            try:
+                with np.load(self._df_path) as data:
+                    frequencies = data["frequencies"]
+                    if frequencies.shape == (self.dimensions,):
+                        seen = data["seen"].tolist() if "seen" in data.files else []
+                        return frequencies.astype(np.int32), int(data["count"]), dict.fromkeys(seen)
+                logger.warning("Document frequency table has a different size, starting a new one.")
+            except Exception as e:
+                logger.warning(f"Could not load document frequencies, starting a new table: {e}")
+        return np.zeros(self.dimensions, dtype=np.int32), 0, {}
+
+    def _save_document_frequencies(self, frequencies: np.ndarray, count: int, seen: np.ndarray) -> None:
+        temp_path = self._df_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                np.savez(f, frequencies=frequencies, count=count, seen=seen)
+            os.replace(temp_path, self._df_path)
+        except OSError as e:
+            logger.warning(f"Could not save document frequencies: {e}")
+
+    def flush(self) -> None:
+        """
+        Save the document frequency table if jobs were added since the last save.
+        """
+        # Saves are serialized so an older table never replaces a newer one
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved_jobs:
+                    return
+                frequencies, count = self._document_frequencies.copy(), self._document_count
+                seen = np.fromiter(self._seen_jobs, dtype=np.uint64, count=len(self._seen_jobs))
+                self._unsaved_jobs = 0
+            self._save_document_frequencies(frequencies, count, seen)
+
+    def _job_vector(self, job_description: str) -> np.ndarray:
+        """
+        Return the term frequency vector of a job description. Hashing the tokens costs less than
+        reading a cached vector from disk, so only a short hash of each job is kept: a job that is
+        not among the recently seen ones also updates the document frequency table.
+        """
+        job_hash = int.from_bytes(hashlib.sha256(job_description.encode("utf-8")).digest()[:8], "little")
+        vector = self._term_frequencies(job_description)
+
+        with self._lock:
+            if job_hash in self._seen_jobs:
+                # Move it to the most recent end
+                del self._seen_jobs[job_hash]
+                self._seen_jobs[job_hash] = None
+                return vector
+            self._seen_jobs[job_hash] = None
+            if len(self._seen_jobs) > self.max_seen_jobs:
+                del self._seen_jobs[next(iter(self._seen_jobs))]
+            self._document_frequencies[np.flatnonzero(vector)] += 1
+            self._document_count += 1
+            self._unsaved_jobs += 1
+            save_now = self._unsaved_jobs >= self.save_every
+        # Saved in batches and outside the lock, so concurrent triage workers do not wait on the disk
+        if save_now:
+            self.flush()
+        return vector
+
+    def _idf(self) -> np.ndarray:
+        with self._lock:
+            return np.log((1.0 + self._document_count) / (1.0 + self._document_frequencies)).astype(np.float32) + 1.0
+
+    def set_resume(self, resume: Any) -> None:
+        """
+        Compute the resume vector once; it is reused for every job scored afterwards.
+        """
+        self._resume_vector = self._term_frequencies(self.resume_to_text(resume))
+
+    def similarity(self, job_description: str) -> float:
+        """
+        Cosine similarity between the TF-IDF vectors of the resume and the job description.
+        """
+        if self._resume_vector is None:
+            raise ValueError("Resume not set. Call set_resume before scoring jobs.")
+        job_vector = self._job_vector(job_description or "")
+        idf = self._idf()
+        resume_weighted = self._resume_vector * idf
+        job_weighted = job_vector * idf
+        norm = float(np.linalg.norm(resume_weighted) * np.linalg.norm(job_weighted))
+        if norm == 0.0 or math.isnan(norm):
+            return 0.0
+        return float(np.dot(resume_weighted, job_weighted) / norm)
+
+    def classify(self, job_description: str) -> tuple[str, float]:
+        """
+        Classify a job description as REJECT, ACCEPT or BORDERLINE.
+        Returns:
+            tuple: The decision and the similarity it is based on.
+        """
+        score = self.similarity(job_description)
+        if score < self.reject_threshold:
+            decision = REJECT
+        elif self.accept_threshold is not None and score >= self.accept_threshold:
+            decision = ACCEPT
+        else:
+            decision = BORDERLINE
+        logger.debug(f"Pre-filter similarity {score:.3f} -> {decision}")
+        return decision, score
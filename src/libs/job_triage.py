@@ -0,0 +1,108 @@
+"""
+Concurrent triage of job postings: pre-filter, LLM suitability score and optional summary.
+
+The LLM calls are passed in as callables, so this module does not depend on the prompts of the
+job application bot and GPTAnswerer only provides the scoring and summarizing.
+"""
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import config as cfg
+from src.job import Job
+from src.libs.job_prefilter import ACCEPT, REJECT, JobPrefilter
+from src.logging import logger
+
+
+@dataclass
+class JobTriageResult:
+    job: Job
+    suitable: bool = False
+    score: Optional[int] = None
+    reasoning: str = ""
+    summary: str = ""
+    prefilter_similarity: Optional[float] = None
+    error: Optional[str] = None
+
+
+class JobTriage:
+    def __init__(
+        self,
+        score: Callable[[str], Tuple[Optional[int], str]],
+        summarize: Optional[Callable[[str], str]] = None,
+        job_prefilter: Optional[JobPrefilter] = None,
+        min_score: int = cfg.JOB_SUITABILITY_SCORE,
+    ):
+        """
+        Args:
+            score (Callable): Scores a job description, returning the score (None if unparsable) and the reasoning.
+            summarize (Callable): Summarizes the description of a suitable job.
+            job_prefilter (JobPrefilter): Rejects (or accepts) jobs before the LLM is asked, None to always ask.
+            min_score (int): Lowest score of a suitable job.
+        """
+        self.score = score
+        self.summarize = summarize
+        self.job_prefilter = job_prefilter
+        self.min_score = min_score
+
+    def triage_job(self, job: Job, summarize: bool = True) -> JobTriageResult:
+        """
+        Score (and optionally summarize) a single job. Errors are recorded in the result instead of raised.
+        """
+        result = JobTriageResult(job=job)
+        try:
+            if self.job_prefilter is not None:
+                decision, result.prefilter_similarity = self.job_prefilter.classify(job.description)
+                if decision == REJECT:
+                    result.reasoning = "Rejected by pre-filter"
+                    return result
+                if decision == ACCEPT:
+                    result.suitable = True
+                    result.reasoning = "Accepted by pre-filter"
+
+            if not result.suitable:
+                result.score, result.reasoning = self.score(job.description)
+                # An unparsable score is treated like is_job_suitable does: keep the job.
+                result.suitable = result.score is None or result.score >= self.min_score
+
+            if summarize and result.suitable and self.summarize is not None:
+                result.summary = self.summarize(job.description)
+        except Exception as e:
+            logger.error(f"Triage failed for job {job.role} at {job.company}: {e}")
+            result.suitable = False
+            result.error = str(e)
+        return result
+
+    def triage_jobs(
+        self,
+        jobs: Iterable[Job],
+        max_in_flight: int = cfg.JOB_TRIAGE_MAX_IN_FLIGHT,
+        summarize: bool = True,
+    ) -> Iterator[JobTriageResult]:
+        """
+        Score and summarize many jobs concurrently, yielding results as they complete.
+
+        At most `max_in_flight` jobs are being processed at any time, and new jobs are only
+        pulled from `jobs` when a slot frees up, so a slow consumer or a lazy job source
+        naturally applies back-pressure. Results are yielded in completion order.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        jobs_iterator = iter(jobs)
+        executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        in_flight = set()
+        try:
+            for job in itertools.islice(jobs_iterator, max_in_flight):
+                in_flight.add(executor.submit(self.triage_job, job, summarize))
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    next_job = next(jobs_iterator, None)
+                    if next_job is not None:
+                        in_flight.add(executor.submit(self.triage_job, next_job, summarize))
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self.job_prefilter is not None:
+                self.job_prefilter.flush()
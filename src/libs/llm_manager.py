@@ -2,13 +2,11 @@ import json
 import os
 import re
 import textwrap
-import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-import httpx
 from dotenv import load_dotenv
 from langchain_core.messages import BaseMessage
 from langchain_core.messages.ai import AIMessage
@@ -71,6 +69,11 @@ from src.utils.constants import (
     WORK_PREFERENCES,
 )
 from src.job import Job
+from src.libs.job_prefilter import ACCEPT, REJECT, JobPrefilter
+from src.libs.job_triage import JobTriage, JobTriageResult
+from src.libs.ollama_model import OllamaModel
+from src.libs.retry_policy import RetryPolicy
+from src.libs.single_flight import SingleFlight, deserialize_message, llm_call_key, serialize_message
 from src.logging import logger
 import config as cfg
 
@@ -83,6 +86,10 @@ class AIModel(ABC):
         pass
 
 
+# Lives in its own module so it can be loaded without the job application prompts
+AIModel.register(OllamaModel)
+
+
 class OpenAIModel(AIModel):
     def __init__(self, api_key: str, llm_model: str):
         from langchain_openai import ChatOpenAI
@@ -109,20 +116,6 @@ class ClaudeModel(AIModel):
         return response
 
 
-class OllamaModel(AIModel):
-    def __init__(self, llm_model: str, llm_api_url: str):
-        from langchain_ollama import ChatOllama
-
-        if len(llm_api_url) > 0:
-            logger.debug(f"Using Ollama with API URL: {llm_api_url}")
-            self.model = ChatOllama(model=llm_model, base_url=llm_api_url)
-        else:
-            self.model = ChatOllama(model=llm_model)
-
-    def invoke(self, prompt: str) -> BaseMessage:
-        response = self.model.invoke(prompt)
-        return response
-
 class PerplexityModel(AIModel):
     def __init__(self, api_key: str, llm_model: str):
         from langchain_community.chat_models import ChatPerplexity
@@ -325,64 +318,39 @@ class LLMLogger:
 
 
 class LoggerChatModel:
-    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
+    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel], retry_policy: Optional[RetryPolicy] = None):
         self.llm = llm
+        self.retry_policy = retry_policy or RetryPolicy.default()
+        self.single_flight = SingleFlight.default() if cfg.LLM_SINGLE_FLIGHT else None
         logger.debug(f"LoggerChatModel successfully initialized with LLM: {llm}")
 
     def __call__(self, messages: List[Dict[str, str]]) -> str:
         logger.debug(f"Entering __call__ method with messages: {messages}")
-        while True:
-            try:
-                logger.debug("Attempting to call the LLM with messages")
-
-                reply = self.llm.invoke(messages)
-                logger.debug(f"LLM response received: {reply}")
-
-                parsed_reply = self.parse_llmresult(reply)
-                logger.debug(f"Parsed LLM reply: {parsed_reply}")
-
-                LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply)
-                logger.debug("Request successfully logged")
-
-                return reply
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTPStatusError encountered: {str(e)}")
-                if e.response.status_code == 429:
-                    retry_after = e.response.headers.get("retry-after")
-                    retry_after_ms = e.response.headers.get("retry-after-ms")
-
-                    if retry_after:
-                        wait_time = int(retry_after)
-                        logger.warning(
-                            f"Rate limit exceeded. Waiting for {wait_time} seconds before retrying (extracted from 'retry-after' header)..."
-                        )
-                        time.sleep(wait_time)
-                    elif retry_after_ms:
-                        wait_time = int(retry_after_ms) / 1000.0
-                        logger.warning(
-                            f"Rate limit exceeded. Waiting for {wait_time} seconds before retrying (extracted from 'retry-after-ms' header)..."
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        wait_time = 30
-                        logger.warning(
-                            f"'retry-after' header not found. Waiting for {wait_time} seconds before retrying (default)..."
-                        )
-                        time.sleep(wait_time)
-                else:
-                    logger.error(
-                        f"HTTP error occurred with status code: {e.response.status_code}, waiting 30 seconds before retrying"
-                    )
-                    time.sleep(30)
+        if self.single_flight is None:
+            return self._invoke(messages)
+        reply, shared = self.single_flight.do(
+            llm_call_key(self.llm, messages),
+            lambda: self._invoke(messages),
+            serialize=serialize_message,
+            deserialize=deserialize_message,
+        )
+        if shared:
+            logger.debug("Reply shared with an identical in-flight request")
+        return reply
 
-            except Exception as e:
-                logger.error(f"Unexpected error occurred: {str(e)}")
-                logger.info(
-                    "Waiting for 30 seconds before retrying due to an unexpected error."
-                )
-                time.sleep(30)
-                continue
+    def _invoke(self, messages: List[Dict[str, str]]) -> str:
+        logger.debug("Attempting to call the LLM with messages")
+
+        reply = self.retry_policy.call(self.llm.invoke, messages)
+        logger.debug(f"LLM response received: {reply}")
+
+        parsed_reply = self.parse_llmresult(reply)
+        logger.debug(f"Parsed LLM reply: {parsed_reply}")
+
+        LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply)
+        logger.debug("Request successfully logged")
+
+        return reply
 
     def parse_llmresult(self, llmresult: AIMessage) -> Dict[str, Dict]:
         logger.debug(f"Parsing LLM result: {llmresult}")
@@ -462,6 +430,15 @@ class GPTAnswerer:
     def __init__(self, config, llm_api_key):
         self.ai_adapter = AIAdapter(config, llm_api_key)
         self.llm_cheap = LoggerChatModel(self.ai_adapter)
+        self.job_prefilter = (
+            JobPrefilter(
+                reject_threshold=cfg.JOB_PREFILTER_REJECT_THRESHOLD,
+                accept_threshold=cfg.JOB_PREFILTER_ACCEPT_THRESHOLD,
+                cache_dir=cfg.JOB_PREFILTER_CACHE_DIR,
+            )
+            if cfg.JOB_PREFILTER_ENABLED
+            else None
+        )
 
     @property
     def job_description(self):
@@ -491,6 +468,8 @@ class GPTAnswerer:
     def set_resume(self, resume):
         logger.debug(f"Setting resume: {resume}")
         self.resume = resume
+        if self.job_prefilter is not None:
+            self.job_prefilter.set_resume(resume)
 
     def set_job(self, job: Job):
         logger.debug(f"Setting job: {job}")
@@ -683,14 +662,17 @@ class GPTAnswerer:
         else:
             return "resume"
 
-    def is_job_suitable(self):
-        logger.info("Checking if job is suitable")
+    def _score_job_description(self, job_description: str) -> Tuple[Optional[int], str]:
+        """
+        Ask the LLM to score how well the resume fits a job description.
+        Returns the score (None if it could not be parsed) and the reasoning.
+        """
         prompt = ChatPromptTemplate.from_template(prompts.is_relavant_position_template)
         chain = prompt | self.llm_cheap | StrOutputParser()
         raw_output = chain.invoke(
             {
                 RESUME: self.resume,
-                JOB_DESCRIPTION: self.job_description,
+                JOB_DESCRIPTION: job_description,
             }
         )
         output = self._clean_llm_output(raw_output)
@@ -700,10 +682,39 @@ class GPTAnswerer:
             score = re.search(r"Score:\s*(\d+)", output, re.IGNORECASE).group(1)
             reasoning = re.search(r"Reasoning:\s*(.+)", output, re.IGNORECASE | re.DOTALL).group(1)
         except AttributeError:
+            return None, output
+        return int(score), reasoning
+
+    def is_job_suitable(self):
+        logger.info("Checking if job is suitable")
+        if self.job_prefilter is not None:
+            decision, similarity = self.job_prefilter.classify(self.job_description)
+            if decision == REJECT:
+                logger.info(f"Job rejected by pre-filter (similarity {similarity:.3f}), skipping LLM check")
+                return False
+            if decision == ACCEPT:
+                logger.info(f"Job accepted by pre-filter (similarity {similarity:.3f}), skipping LLM check")
+                return True
+
+        score, reasoning = self._score_job_description(self.job_description)
+        if score is None:
             logger.warning("Failed to extract score or reasoning from LLM. Proceeding with application, but job may or may not be suitable.")
             return True
 
         logger.info(f"Job suitability score: {score}")
-        if int(score) < JOB_SUITABILITY_SCORE:
+        if score < JOB_SUITABILITY_SCORE:
             logger.debug(f"Job is not suitable: {reasoning}")
-        return int(score) >= JOB_SUITABILITY_SCORE
+        return score >= JOB_SUITABILITY_SCORE
+
+    def triage_jobs(
+        self,
+        jobs: Iterable[Job],
+        max_in_flight: int = cfg.JOB_TRIAGE_MAX_IN_FLIGHT,
+        summarize: bool = True,
+    ) -> Iterator[JobTriageResult]:
+        """
+        Score and summarize many jobs concurrently, yielding results as they complete.
+        See JobTriage.triage_jobs; only the resume is shared between workers, self.job is never read or written.
+        """
+        job_triage = JobTriage(self._score_job_description, self.summarize_job_description, self.job_prefilter)
+        return job_triage.triage_jobs(jobs, max_in_flight=max_in_flight, summarize=summarize)
@@ -0,0 +1,116 @@
+"""
+Ollama chat model with the server-side tuning a local model needs.
+
+The model is kept loaded between requests (keep_alive) and optionally loaded in the background at
+startup. Concurrent requests are limited per server to the number it serves in parallel, and the
+context window is sized from the prompt, rounded up to a power of two so the server rarely reloads it.
+"""
+import os
+import threading
+import time
+from typing import Dict
+
+import httpx
+from langchain_core.messages import BaseMessage
+
+import config as cfg
+from src.logging import logger
+
+
+class OllamaModel:
+    DEFAULT_API_URL = "http://127.0.0.1:11434"
+    # One semaphore per Ollama server, shared by every OllamaModel in the process
+    _server_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _server_semaphores_lock = threading.Lock()
+
+    def __init__(self, llm_model: str, llm_api_url: str):
+        self.llm_model = llm_model
+        self.llm_api_url = llm_api_url
+        self.base_url = (
+            llm_api_url or os.environ.get("OLLAMA_HOST") or self.DEFAULT_API_URL
+        ).rstrip("/")
+        if not self.base_url.startswith("http"):
+            self.base_url = f"http://{self.base_url}"
+        self.keep_alive = cfg.LLM_OLLAMA_KEEP_ALIVE
+        self._models_by_num_ctx = {}
+        self._models_lock = threading.Lock()
+
+        if len(llm_api_url) > 0:
+            logger.debug(f"Using Ollama with API URL: {llm_api_url}")
+        self.model = self._get_model(cfg.LLM_OLLAMA_MIN_NUM_CTX)
+        self.semaphore = self._get_server_semaphore(self.base_url)
+
+        if cfg.LLM_OLLAMA_WARM_UP:
+            threading.Thread(target=self.warm_up, name="ollama-warm-up", daemon=True).start()
+
+    @classmethod
+    def _get_server_semaphore(cls, base_url: str) -> threading.BoundedSemaphore:
+        """
+        Limit concurrent requests per server to the number of requests it serves in parallel,
+        so extra threads wait on our side instead of queueing (and timing out) on the server.
+        """
+        with cls._server_semaphores_lock:
+            if base_url not in cls._server_semaphores:
+                num_parallel = cfg.LLM_OLLAMA_NUM_PARALLEL or int(os.environ.get("OLLAMA_NUM_PARALLEL", 1))
+                logger.debug(f"Allowing {num_parallel} concurrent requests to Ollama at {base_url}")
+                cls._server_semaphores[base_url] = threading.BoundedSemaphore(max(1, num_parallel))
+            return cls._server_semaphores[base_url]
+
+    def _get_model(self, num_ctx: int):
+        from langchain_ollama import ChatOllama
+
+        with self._models_lock:
+            if num_ctx not in self._models_by_num_ctx:
+                params = {"model": self.llm_model, "keep_alive": self.keep_alive, "num_ctx": num_ctx}
+                if len(self.llm_api_url) > 0:
+                    params["base_url"] = self.llm_api_url
+                self._models_by_num_ctx[num_ctx] = ChatOllama(**params)
+            return self._models_by_num_ctx[num_ctx]
+
+    @staticmethod
+    def _prompt_length(prompt) -> int:
+        if isinstance(prompt, str):
+            return len(prompt)
+        if hasattr(prompt, "to_string"):
+            return len(prompt.to_string())
+        if isinstance(prompt, (list, tuple)):
+            return sum(len(str(getattr(message, "content", message))) for message in prompt)
+        return len(str(prompt))
+
+    def _num_ctx_for(self, prompt) -> int:
+        """
+        Size the context window from the prompt length plus room for the reply.
+        Sizes are rounded up to a power of two because Ollama reloads the model every time
+        num_ctx changes, so only a handful of distinct values should ever be sent.
+        """
+        estimated_tokens = self._prompt_length(prompt) // 3 + cfg.LLM_OLLAMA_REPLY_TOKENS
+        num_ctx = cfg.LLM_OLLAMA_MIN_NUM_CTX
+        while num_ctx < estimated_tokens and num_ctx < cfg.LLM_OLLAMA_MAX_NUM_CTX:
+            num_ctx *= 2
+        return min(num_ctx, cfg.LLM_OLLAMA_MAX_NUM_CTX)
+
+    def warm_up(self) -> None:
+        """
+        Ask the server to load the model into memory ahead of the first real request.
+        """
+        start = time.time()
+        try:
+            response = httpx.post(
+                f"{self.base_url}/api/generate",
+                json={
+                    "model": self.llm_model,
+                    "keep_alive": self.keep_alive,
+                    "options": {"num_ctx": cfg.LLM_OLLAMA_MIN_NUM_CTX},
+                },
+                timeout=cfg.LLM_OLLAMA_WARM_UP_TIMEOUT,
+            )
+            response.raise_for_status()
+            logger.debug(f"Ollama model {self.llm_model} loaded in {time.time() - start:.1f} seconds")
+        except Exception as e:
+            logger.warning(f"Ollama warm-up request failed: {e}")
+
+    def invoke(self, prompt: str) -> BaseMessage:
+        model = self._get_model(self._num_ctx_for(prompt))
+        with self.semaphore:
+            response = model.invoke(prompt)
+        return response
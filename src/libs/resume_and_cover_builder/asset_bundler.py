@@ -0,0 +1,277 @@
+"""
+This module makes the resume HTML self-contained before it is rendered: remote stylesheets (Google Fonts,
+Font Awesome) and the fonts they reference are downloaded once into a local cache and inlined, so rendering
+never waits on a CDN and gives the same result offline.
+"""
+# app/libs/resume_and_cover_builder/asset_bundler.py
+import base64
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Set
+from urllib.parse import urljoin
+
+import httpx
+from loguru import logger
+
+from src.libs.resume_and_cover_builder.html_cleaner import html_to_text
+
+# Google Fonts picks the font format from the user agent; a current Chrome gets woff2
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
+LINK_REGEX = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+HREF_REGEX = re.compile(r"""href\s*=\s*(['"])(.*?)\1""", re.IGNORECASE)
+IMPORT_REGEX = re.compile(r"""@import\s+(?:url\(\s*(['"]?)(.+?)\1\s*\)|(['"])(.+?)\3)\s*;""", re.IGNORECASE)
+URL_REGEX = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+FONT_FACE_REGEX = re.compile(r"@font-face\s*\{[^}]*\}", re.IGNORECASE)
+FONT_SOURCE_REGEX = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)\s*(?:format\(\s*['"]?([\w-]+)['"]?\s*\))?""")
+UNICODE_RANGE_REGEX = re.compile(r"unicode-range\s*:\s*([^;}]+)", re.IGNORECASE)
+ICON_RULE_REGEX = re.compile(r"""([^{}]+)\{\s*content\s*:\s*["']\\([0-9a-fA-F]+)["']\s*;?\s*\}""")
+CONTENT_STRING_REGEX = re.compile(r"""content\s*:\s*(["'])(.*?)\1""")
+CLASS_ATTRIBUTE_REGEX = re.compile(r"""class\s*=\s*(['"])(.*?)\1""", re.IGNORECASE)
+FONT_FORMAT_PREFERENCE = ("woff2", "woff", "truetype", "opentype")
+FONT_MIME_TYPES = {"woff2": "font/woff2", "woff": "font/woff", "truetype": "font/ttf", "opentype": "font/otf"}
+_warned_no_fonttools = False
+
+
+def _parse_unicode_range(value: str) -> Set[range]:
+    ranges = set()
+    for part in value.split(","):
+        part = part.strip().upper().removeprefix("U+")
+        if not part:
+            continue
+        if "?" in part:
+            start, end = part.replace("?", "0"), part.replace("?", "F")
+        elif "-" in part:
+            start, end = part.split("-", 1)
+        else:
+            start = end = part
+        ranges.add(range(int(start, 16), int(end, 16) + 1))
+    return ranges
+
+
+@lru_cache(maxsize=64)
+def _subset_font(font_data: bytes, codepoints: frozenset) -> Optional[bytes]:
+    """
+    Subset a font to the given code points with fontTools (in requirements.txt, with brotli for woff2).
+    Returns:
+        bytes: The subset font as woff2 (or woff without brotli), or None if fontTools is missing.
+    """
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        global _warned_no_fonttools
+        if not _warned_no_fonttools:
+            _warned_no_fonttools = True
+            logger.warning("fontTools is not installed, fonts are inlined whole (install requirements.txt to subset them)")
+        return None
+    try:
+        import brotli  # noqa: F401  woff2 needs brotli
+        flavor = "woff2"
+    except ImportError:
+        flavor = "woff"
+    logging.getLogger("fontTools").setLevel(logging.WARNING)
+    font = TTFont(io.BytesIO(font_data))
+    options = subset.Options()
+    options.flavor = flavor
+    options.layout_features = ["*"]
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    output = io.BytesIO()
+    subset.save_font(font, output, options)
+    return output.getvalue()
+
+
+class AssetBundler:
+    """
+    Inlines the remote stylesheets of an HTML document, with their fonts as data: URIs.
+    Every remote file is fetched once and kept in cache_dir; later renders, including offline ones,
+    read it from there. Font faces whose unicode-range does not cover any character of the document
+    are dropped, and the remaining fonts are subset to the characters used.
+    """
+    _lock = threading.Lock()
+    # URLs that could not be downloaded, so an offline process only waits on each of them once
+    _unavailable: Set[str] = set()
+
+    def __init__(self, cache_dir: Path, timeout: float = 15, subset_fonts: bool = True):
+        """
+        Args:
+            cache_dir (Path): Directory of the downloaded stylesheets and fonts.
+            timeout (float): Timeout in seconds for downloading an asset.
+            subset_fonts (bool): Subset fonts to the characters of the document; False inlines them whole.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.subset_fonts = subset_fonts
+
+    def _cache_path(self, url: str) -> Path:
+        suffix = Path(url.split("?")[0]).suffix[:8] or ".bin"
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}{suffix}"
+
+    def cache_state(self) -> str:
+        """
+        Fingerprint of the assets in the cache, which together with the settings decides what bundle()
+        produces for a document. Only the directory is listed, so it is cheap to compute before bundling.
+        Returns:
+            str: A hash of the names and sizes of the cached files.
+        """
+        digest = hashlib.sha256()
+        try:
+            entries = sorted((entry.name, entry.stat().st_size) for entry in os.scandir(self.cache_dir)
+                             if entry.is_file() and not entry.name.endswith(".tmp"))
+        except OSError:
+            entries = []
+        for name, size in entries:
+            digest.update(f"{name}:{size}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def fetch(self, url: str) -> Optional[bytes]:
+        """
+        Return the content of a remote asset, downloading it into the cache the first time.
+        Returns:
+            bytes: The content, or None if it is not cached and cannot be downloaded.
+        """
+        path = self._cache_path(url)
+        if path.exists():
+            return path.read_bytes()
+        if url in self._unavailable:
+            return None
+        try:
+            response = httpx.get(url, headers={"User-Agent": USER_AGENT}, timeout=self.timeout, follow_redirects=True)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not download asset {url}: {e}")
+            self._unavailable.add(url)
+            return None
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(path.suffix + ".tmp")
+            temp_path.write_bytes(response.content)
+            temp_path.replace(path)
+        logger.debug(f"Cached asset {url}")
+        return response.content
+
+    @staticmethod
+    def _data_uri(data: bytes, mime_type: str) -> str:
+        return f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+    @staticmethod
+    def used_codepoints(html: str, css: str) -> frozenset:
+        """
+        Characters the fonts must keep: the document text, strings inserted with CSS content,
+        and icon-font glyphs whose class is used in the document.
+        """
+        codepoints = {ord(c) for c in html_to_text(html)}
+        codepoints.update(range(0x20, 0x7F))  # Printable ASCII keeps placeholders and punctuation safe
+        for _, text in CONTENT_STRING_REGEX.findall(css):
+            codepoints.update(ord(c) for c in text if c != "\\")
+        classes = {c for _, value in CLASS_ATTRIBUTE_REGEX.findall(html) for c in value.split()}
+        for selectors, codepoint in ICON_RULE_REGEX.findall(css):
+            if any(re.search(rf"\.{re.escape(c)}(?![\w-])", selectors) for c in classes):
+                codepoints.add(int(codepoint, 16))
+        return frozenset(codepoints)
+
+    def _inline_font_face(self, block: str, base_url: str, codepoints: Optional[frozenset]) -> str:
+        unicode_range = UNICODE_RANGE_REGEX.search(block)
+        if codepoints is not None and unicode_range:
+            ranges = _parse_unicode_range(unicode_range.group(1))
+            if not any(codepoint in r for r in ranges for codepoint in codepoints):
+                return ""
+
+        sources = [(urljoin(base_url, url), (fmt or "").lower()) for _, url, fmt in FONT_SOURCE_REGEX.findall(block)]
+        sources = [(url, fmt or ("woff2" if ".woff2" in url else "woff" if ".woff" in url else "truetype"))
+                   for url, fmt in sources if not url.startswith("data:") and not url.split("?")[0].endswith((".eot", ".svg"))]
+        sources.sort(key=lambda s: FONT_FORMAT_PREFERENCE.index(s[1]) if s[1] in FONT_FORMAT_PREFERENCE else len(FONT_FORMAT_PREFERENCE))
+        for url, fmt in sources:
+            data = self.fetch(url)
+            if data is None:
+                continue
+            if self.subset_fonts and codepoints is not None:
+                try:
+                    subset_data = _subset_font(data, codepoints)
+                except Exception as e:
+                    logger.debug(f"Could not subset font {url}: {e}")
+                    subset_data = None
+                if subset_data is not None:
+                    data, fmt = subset_data, "woff2" if subset_data[:4] == b"wOF2" else "woff"  # save_font applies the flavor
+            declarations = re.sub(r"\bsrc\s*:[^;}]*;?", "", block[block.index("{") + 1:-1]).strip().rstrip(";")
+            source = f"url({self._data_uri(data, FONT_MIME_TYPES.get(fmt, 'application/octet-stream'))}) format('{fmt}')"
+            return f"@font-face{{{declarations};src:{source}}}"
+        return block
+
+    def _inline_css(self, css: str, base_url: str, codepoints: Optional[frozenset], seen: Set[str]) -> str:
+        css = IMPORT_REGEX.sub(lambda m: self._inline_stylesheet(m.group(2) or m.group(4), base_url, codepoints, seen, m.group(0)), css)
+        css = FONT_FACE_REGEX.sub(lambda m: self._inline_font_face(m.group(0), base_url, codepoints), css)
+
+        def inline_url(match):
+            url = match.group(2)
+            if url.startswith(("data:", "#")) or ("://" not in url and not base_url.startswith("http")):
+                return match.group(0)
+            data = self.fetch(urljoin(base_url, url))
+            if data is None:
+                return match.group(0)
+            return f"url({self._data_uri(data, 'application/octet-stream')})"
+
+        return URL_REGEX.sub(inline_url, css)
+
+    def _inline_stylesheet(self, url: str, base_url: str, codepoints, seen: Set[str], original: str) -> str:
+        url = urljoin(base_url, url)
+        if url in seen:
+            return ""  # Duplicate of a stylesheet already inlined
+        data = self.fetch(url)
+        if data is None:
+            return original
+        seen.add(url)
+        return self._inline_css(data.decode("utf-8", errors="replace"), url, codepoints, seen)
+
+    def _stylesheets(self, html: str) -> Iterable[str]:
+        for link in LINK_REGEX.findall(html):
+            href = HREF_REGEX.search(link)
+            if "stylesheet" in link.lower() and href and href.group(2).startswith(("http://", "https://", "//")):
+                yield href.group(2)
+        for style in re.findall(r"<style\b[^>]*>(.*?)</style>", html, re.IGNORECASE | re.DOTALL):
+            for match in IMPORT_REGEX.finditer(style):
+                yield match.group(2) or match.group(4)
+
+    def bundle(self, html: str) -> str:
+        """
+        Return the HTML with its remote stylesheets and fonts inlined. Assets that are neither cached nor
+        downloadable are left as remote references.
+        Args:
+            html (str): The full HTML document.
+        Returns:
+            str: The self-contained HTML document.
+        """
+        codepoints = None
+        if self.subset_fonts:
+            # Icon glyphs are found from the stylesheets, so collect them before inlining
+            stylesheets = "".join((self.fetch(url) or b"").decode("utf-8", errors="replace")
+                                  for url in self._stylesheets(html) if url.startswith("http"))
+            codepoints = self.used_codepoints(html, stylesheets)
+
+        seen: Set[str] = set()
+
+        def inline_link(match):
+            link = match.group(0)
+            href = HREF_REGEX.search(link)
+            if "stylesheet" not in link.lower() or not href or not href.group(2).startswith(("http://", "https://")):
+                return link
+            css = self._inline_stylesheet(href.group(2), href.group(2), codepoints, seen, link)
+            return css if css in ("", link) else f"<style>{css}</style>"
+
+        html = re.sub(
+            r"(<style\b[^>]*>)(.*?)(</style>)",
+            lambda m: m.group(1) + self._inline_css(m.group(2), "", codepoints, seen) + m.group(3),
+            html,
+            flags=re.IGNORECASE | re.DOTALL,
+        )
+        return LINK_REGEX.sub(inline_link, html)
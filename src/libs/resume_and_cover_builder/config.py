@@ -13,6 +13,18 @@ class GlobalConfig:
         self.STYLES_DIRECTORY: Path = None
         self.LOG_OUTPUT_FILE_PATH: Path = None
         self.API_KEY: str = None
+        self.RETRIEVAL_BACKEND: str = "bm25"  # "bm25" (local) or "embeddings" (OpenAI embeddings)
+        self.CACHE_DIRECTORY: Path = Path("data_folder/output/cache")
+        self.EMBEDDING_CACHE_MAX_ENTRIES: int = 200_000  # 0 disables the embedding cache
+        self.PAGE_FETCH_TIMEOUT: float = 15  # Seconds before the HTTP fetch of a job page gives up
+        self.PAGE_FETCH_MIN_TEXT_LENGTH: int = 500  # Readable characters an HTTP response needs to skip the browser
+        self.PAGE_READY_BUDGET: float = 10  # Maximum seconds spent waiting for a page loaded in the browser to be ready
+        self.JOB_SNAPSHOT_TTL: float = 3 * 24 * 3600  # Seconds a fetched and parsed job posting is reused
+        self.BUNDLE_ASSETS: bool = True  # Inline remote stylesheets and fonts from the local asset cache before rendering
+        self.SUBSET_FONTS: bool = True  # Subset inlined fonts to the characters used, False inlines whole fonts
+        self.PDF_RENDER_CACHE_MAX_MB: float = 200  # Disk space for rendered PDFs reused when a document is unchanged, 0 disables
+        self.PDF_RENDERER: str = "chrome"  # "chrome" (exact CSS rendering) or "reportlab" (no browser, approximate styling)
+        self.REPORTLAB_FONT_DIRECTORY: Path = None  # DejaVu TTF fonts for text outside WinAnsi with ReportLab, searched before the system font directories
         self.html_template = """
                             <!DOCTYPE html>
                             <html lang="en">
@@ -21,7 +33,6 @@ class GlobalConfig:
                                 <meta name="viewport" content="width=device-width, initial-scale=1.0">
                                 <title>Resume</title>
                                 <link href="https://fonts.googleapis.com/css2?family=Barlow:wght@400;600&display=swap" rel="stylesheet" />
-                                <link href="https://fonts.googleapis.com/css2?family=Barlow:wght@400;600&display=swap" rel="stylesheet" /> 
                                 <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.3/css/all.min.css" /> 
                                     <style>
                                         $style_css
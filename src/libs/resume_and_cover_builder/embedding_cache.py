@@ -0,0 +1,129 @@
+"""
+Persistent embedding cache, so chunks that were already embedded (the same posting seen again,
+boilerplate shared across a company's postings) never go back to the embeddings API.
+"""
+# app/libs/resume_and_cover_builder/embedding_cache.py
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+# SQLite limits the number of host parameters per statement
+_SQL_BATCH_SIZE = 500
+# Share of max_entries evicted beyond the limit, so a full cache is not trimmed on every store
+_EVICTION_SLACK = 0.1
+
+
+class SQLiteEmbeddingCache(Embeddings):
+    """
+    Embeddings wrapper that stores vectors in SQLite as float32 blobs, keyed on
+    (embedding model, SHA-256 of the text), and evicts the least recently used entries
+    once the cache holds more than max_entries vectors. The number of entries is counted
+    once on open and then kept up to date as vectors are inserted.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache_path: Path, model_name: str, max_entries: int = 200_000):
+        """
+        Args:
+            embeddings (Embeddings): The embeddings model used on cache misses.
+            cache_path (Path): Path of the SQLite database file.
+            model_name (str): Name of the embedding model, part of the cache key.
+            max_entries (int): Maximum number of vectors kept in the cache.
+        """
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_entries = max_entries
+        cache_path = Path(cache_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )
+                """
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._count = self._count_entries()
+
+    def _count_entries(self) -> int:
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return count
+
+    @staticmethod
+    def _hash(text: str, kind: str) -> str:
+        # Queries and documents are kept apart because some models embed them differently
+        return hashlib.sha256(f"{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        now = time.time()
+        with self._lock, self._connection:
+            for start in range(0, len(hashes), _SQL_BATCH_SIZE):
+                batch = hashes[start:start + _SQL_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [self.model_name, *batch],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+                self._connection.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash IN ({placeholders})",
+                    [now, self.model_name, *batch],
+                )
+        return found
+
+    def _store(self, entries: Dict[str, List[float]]) -> None:
+        now = time.time()
+        rows = [
+            (self.model_name, text_hash, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text_hash, vector in entries.items()
+        ]
+        with self._lock, self._connection:
+            # Rows another process stored meanwhile are ignored, so rowcount is the number of new entries
+            inserted = self._connection.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._count += inserted.rowcount
+            if self._count <= self.max_entries:
+                return
+            # Other processes sharing the file change the count too; recount before evicting
+            self._count = self._count_entries()
+            if self._count > self.max_entries:
+                excess = self._count - int(self.max_entries * (1 - _EVICTION_SLACK))
+                self._connection.execute(
+                    "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._count -= excess
+                logger.debug(f"Embedding cache evicted {excess} entries.")
+
+    def _embed(self, texts: List[str], kind: str, embed_missing) -> List[List[float]]:
+        hashes = [self._hash(text, kind) for text in texts]
+        found = self._lookup(list(dict.fromkeys(hashes)))
+        missing = {text_hash: text for text_hash, text in zip(hashes, texts) if text_hash not in found}
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses.")
+        if missing:
+            vectors = embed_missing(list(missing.values()))
+            new_entries = dict(zip(missing.keys(), vectors))
+            self._store(new_entries)
+            found.update(new_entries)
+        return [list(found[text_hash]) for text_hash in hashes]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "document", self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query", lambda texts: [self.embeddings.embed_query(texts[0])])[0]
@@ -0,0 +1,121 @@
+"""
+This module turns a job page HTML into clean text before it is chunked and sent to the LLM.
+"""
+# app/libs/resume_and_cover_builder/html_cleaner.py
+import re
+from html.parser import HTMLParser
+
+# Elements whose whole content is never readable text, including form controls. Forms themselves are
+# kept: some sites (e.g. ASP.NET WebForms) wrap the whole page in one
+NON_CONTENT_TAGS = frozenset({
+    "script", "style", "noscript", "svg", "math", "template", "iframe", "canvas", "object",
+    "head", "button", "select", "textarea",
+})
+# Elements whose whole content is dropped as boilerplate
+SKIPPED_TAGS = NON_CONTENT_TAGS | {"nav", "footer", "dialog"}
+# Elements that start a new line of text
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "header", "hr", "li", "main", "ol", "p", "pre",
+    "section", "summary", "table", "tbody", "td", "th", "thead", "tr", "ul",
+})
+HEADING_TAGS = {f"h{level}": level for level in range(1, 7)}
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+})
+BOILERPLATE_MARKERS = re.compile(r"cookie|consent|gdpr|newsletter|share-?buttons|social-?links", re.IGNORECASE)
+# Below this share of the page text, the boilerplate filters most likely removed the content itself
+MIN_CONTENT_RATIO = 0.2
+
+
+class _MainContentParser(HTMLParser):
+    def __init__(self, keep_boilerplate: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.keep_boilerplate = keep_boilerplate
+        self.parts = []
+        self.skip_tag = None
+        self.skip_depth = 0
+
+    def _is_boilerplate(self, tag, attributes) -> bool:
+        if self.keep_boilerplate:
+            return tag in NON_CONTENT_TAGS
+        if tag in SKIPPED_TAGS:
+            return True
+        if "hidden" in attributes or attributes.get("aria-hidden") == "true":
+            return True
+        if attributes.get("role") in ("navigation", "banner", "contentinfo", "dialog"):
+            return True
+        marker = f"{attributes.get('id') or ''} {attributes.get('class') or ''}"
+        return bool(BOILERPLATE_MARKERS.search(marker))
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_tag is not None:
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+            return
+        attributes = dict(attrs)
+        if tag not in VOID_TAGS and self._is_boilerplate(tag, attributes):
+            self.skip_tag = tag
+            self.skip_depth = 1
+            return
+        if tag in HEADING_TAGS:
+            self.parts.append("\n\n" + "#" * HEADING_TAGS[tag] + " ")
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag == "a":
+            href = attributes.get("href") or ""
+            if href.lower().startswith("mailto:"):
+                # Keep the address even when the link text is something like "Email us"
+                self.parts.append(f" {href[7:].split('?')[0]} ")
+
+    def handle_startendtag(self, tag, attrs):
+        if self.skip_tag is None and tag in ("br", "hr"):
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if self.skip_tag is not None:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+                if self.skip_depth == 0:
+                    self.skip_tag = None
+            return
+        if tag in HEADING_TAGS or tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self.skip_tag is None:
+            self.parts.append(data)
+
+
+def html_to_text(html: str, keep_boilerplate: bool = False) -> str:
+    """
+    Extract the readable content of an HTML page as plain text.
+    Scripts, styles, form controls, navigation, footers, hidden elements and cookie banners are dropped,
+    headings are kept as markdown-style "#" lines, list items as "- " lines, and whitespace is collapsed.
+    Args:
+        html (str): The HTML to clean.
+        keep_boilerplate (bool): Only drop markup that is never text (scripts, styles, form controls...).
+    Returns:
+        str: The extracted text.
+    """
+    parser = _MainContentParser(keep_boilerplate)
+    parser.feed(html)
+    parser.close()
+    lines = (re.sub(r"[ \t\r\f\v\xa0]+", " ", line).strip() for line in "".join(parser.parts).split("\n"))
+    text = "\n".join(line for line in lines if line and line != "-")
+    # Blank line before headings keeps sections visually separated for the LLM
+    return re.sub(r"\n(#+ )", r"\n\n\1", text).strip()
+
+
+def readable_text(html: str) -> str:
+    """
+    The readable text of a job page: html_to_text, unless the boilerplate filters left suspiciously
+    little of the page's text, in which case the text with only non-content markup dropped is used.
+    """
+    text = html_to_text(html)
+    full_text = html_to_text(html, keep_boilerplate=True)
+    if len(text) < len(full_text) * MIN_CONTENT_RATIO:
+        return full_text
+    return text
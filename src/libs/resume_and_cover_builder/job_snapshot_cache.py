@@ -0,0 +1,147 @@
+"""
+This module stores a snapshot of the job fields extracted from each job posting, so that generating
+a resume and then a cover letter for the same posting fetches and parses the page only once.
+"""
+# app/libs/resume_and_cover_builder/job_snapshot_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import zstandard
+from loguru import logger
+
+# Query parameters that only track where the click came from and never change the posting
+TRACKING_PARAMETERS = frozenset({
+    "eBP", "fbclid", "gclid", "gh_src", "lipi", "mc_cid", "mc_eid", "ref", "refId", "referer",
+    "source", "src", "trackingId", "trk", "trkInfo",
+})
+INDEX_FILE = "index.json"
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a job URL so the same posting always maps to the same snapshot: lowercase scheme and host,
+    no fragment, no tracking parameters, sorted query and no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMETERS and not key.startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+CODEC = "zstd"
+
+
+def _compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=10).compress(data)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec != CODEC:
+        raise ValueError(f"Unsupported snapshot codec {codec}")
+    try:
+        return zstandard.ZstdDecompressor().decompress(data)
+    except zstandard.ZstdError as e:
+        raise ValueError(f"Corrupt zstd snapshot: {e}") from e
+
+
+class JobSnapshotCache:
+    """
+    Compressed snapshots of job postings keyed by normalized URL, with an index file holding
+    the URL, fetch time and blob name of every snapshot. Snapshots older than the TTL are ignored
+    and removed.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, directory: Path, ttl: float):
+        """
+        Args:
+            directory (Path): Directory of the index file and blobs.
+            ttl (float): Seconds a snapshot stays valid.
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.index_path = self.directory / INDEX_FILE
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def _read_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: Dict[str, dict]) -> None:
+        temp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(temp_path, self.index_path)
+
+    def _remove(self, index: Dict[str, dict], key: str) -> None:
+        entry = index.pop(key, None)
+        if entry is not None:
+            try:
+                os.remove(self.directory / entry["file"])
+            except OSError:
+                pass
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        Return the snapshot of a posting if it is younger than the TTL.
+        Returns:
+            dict: {"url", "fetched_at", "job_fields"}, or None.
+        """
+        key = self.key(url)
+        with self._lock:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry["fetched_at"] > self.ttl:
+                logger.debug(f"Job snapshot for {entry['url']} expired")
+                self._remove(index, key)
+                self._write_index(index)
+                return None
+            try:
+                with open(self.directory / entry["file"], "rb") as f:
+                    return json.loads(_decompress(entry["codec"], f.read()))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable job snapshot for {entry['url']}: {e}")
+                self._remove(index, key)
+                self._write_index(index)
+                return None
+
+    def put(self, url: str, job_fields: Dict[str, str]) -> None:
+        """
+        Store the snapshot of a posting, replacing any previous one, and drop expired snapshots.
+        """
+        key = self.key(url)
+        fetched_at = time.time()
+        snapshot = {"url": normalize_url(url), "fetched_at": fetched_at, "job_fields": job_fields}
+        file_name = f"{key}.{CODEC}"
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                index = self._read_index()
+                for expired in [k for k, e in index.items() if fetched_at - e["fetched_at"] > self.ttl]:
+                    self._remove(index, expired)
+                self._remove(index, key)
+                temp_path = self.directory / f"{file_name}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(_compress(json.dumps(snapshot, ensure_ascii=False).encode("utf-8")))
+                os.replace(temp_path, self.directory / file_name)
+                index[key] = {"url": snapshot["url"], "fetched_at": fetched_at, "file": file_name, "codec": CODEC}
+                self._write_index(index)
+        except OSError as e:
+            logger.warning(f"Could not store job snapshot for {url}: {e}")
@@ -1,8 +1,10 @@
 import os
-import tempfile
 import textwrap
 import time
 import re  # For email validation
+import json
+from typing import Dict, List, Optional
+from jsonschema import Draft7Validator
 from src.libs.resume_and_cover_builder.utils import LoggerChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
@@ -15,9 +17,10 @@ from langchain_core.prompt_values import StringPromptValue
 from langchain_core.runnables import RunnablePassthrough
 from langchain_text_splitters import TokenTextSplitter
 from langchain_community.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
-from lib_resume_builder_AIHawk.config import global_config
-from langchain_community.document_loaders import TextLoader
+from src.libs.resume_and_cover_builder.config import global_config
+from src.libs.resume_and_cover_builder.embedding_cache import SQLiteEmbeddingCache
+from src.libs.resume_and_cover_builder.html_cleaner import readable_text
+from src.libs.resume_and_cover_builder.retrieval import create_retrieval_backend
 from requests.exceptions import HTTPError as HTTPStatusError  # HTTP error handling
 import openai
 
@@ -33,14 +36,33 @@ logger.add(log_path / "gpt_resume.log", rotation="1 day", compression="zip", ret
 
 
 class LLMParser:
-    def __init__(self, openai_api_key):
+    # field -> (question asked to the LLM, retrieval query)
+    EXTRACTION_FIELDS = {
+        "role": ("What is the role or title sought in this job description?", "Job title"),
+        "company": ("What is the company's name?", "Company name"),
+        "location": ("What is the location mentioned in this job description?", "Location"),
+        "description": ("What is the job description of the company?", "Job description"),
+        "recruiter_email": ("What is the recruiter's email address in this job description?", "Recruiter email"),
+    }
+    EMAIL_REGEX = r'[\w\.-]+@[\w\.-]+\.\w+'
+    _text_splitter = None
+
+    def __init__(self, openai_api_key, retrieval_backend: str = None):
+        """
+        Args:
+            openai_api_key (str): The OpenAI API key.
+            retrieval_backend (str): "bm25" (local, default) or "embeddings" (OpenAI embeddings). Defaults to global_config.RETRIEVAL_BACKEND.
+        """
         self.llm = LoggerChatModel(
             ChatOpenAI(
                 model_name="gpt-4o-mini", openai_api_key=openai_api_key, temperature=0.4
             )
         )
-        self.llm_embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)  # Initialize embeddings
-        self.vectorstore = None  # Will be initialized after document loading
+        self.retriever = create_retrieval_backend(
+            retrieval_backend or global_config.RETRIEVAL_BACKEND,
+            embeddings_factory=lambda: self._create_embeddings(openai_api_key),
+        )
+        self.indexed = False  # Will be set after document loading
 
     @staticmethod
     def _preprocess_template_string(template: str) -> str:
@@ -53,39 +75,55 @@ class LLMParser:
         """
         return textwrap.dedent(template)
     
+    @staticmethod
+    def _create_embeddings(openai_api_key):
+        """
+        OpenAI embeddings behind the persistent cache, unless the cache is disabled.
+        """
+        embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)
+        if global_config.EMBEDDING_CACHE_MAX_ENTRIES <= 0:
+            return embeddings
+        return SQLiteEmbeddingCache(
+            embeddings,
+            cache_path=Path(global_config.CACHE_DIRECTORY) / "embeddings.sqlite",
+            model_name=embeddings.model,
+            max_entries=global_config.EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+
+    @classmethod
+    def _get_text_splitter(cls) -> TokenTextSplitter:
+        """
+        The splitter loads its tokenizer on creation, so one instance is shared by all parsers.
+        """
+        if cls._text_splitter is None:
+            cls._text_splitter = TokenTextSplitter(chunk_size=500, chunk_overlap=50)
+        return cls._text_splitter
+
     def set_body_html(self, body_html):
         """
-        Retrieves the job description from HTML, processes it, and initializes the vectorstore.
+        Extracts the readable text from the job page HTML, splits it, and builds the retrieval index.
         Args:
             body_html (str): The HTML content to process.
         """
 
-        # Save the HTML content to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as temp_file:
-            temp_file.write(body_html)
-            temp_file_path = temp_file.name 
-        try:
-            loader = TextLoader(temp_file_path, encoding="utf-8", autodetect_encoding=True)
-            document = loader.load()
-            logger.debug("Document successfully loaded.")
-        except Exception as e:
-            logger.error(f"Error during document loading: {e}")
-            raise
-        finally:
-            os.remove(temp_file_path)
-            logger.debug(f"Temporary file removed: {temp_file_path}")
-        
-        # Split the text into chunks
-        text_splitter = TokenTextSplitter(chunk_size=500, chunk_overlap=50)
-        all_splits = text_splitter.split_documents(document)
+        # Drop scripts, styles, navigation and other markup so only the readable content is chunked
+        page_text = readable_text(body_html)
+        logger.debug(f"HTML cleaned from {len(body_html)} to {len(page_text)} characters.")
+        if not page_text:
+            logger.warning("No readable text found in the page, falling back to the raw HTML.")
+            page_text = body_html
+
+        # Build the chunks straight from the in-memory text
+        all_splits = self._get_text_splitter().create_documents([page_text], metadatas=[{"source": "job_page"}])
         logger.debug(f"Text split into {len(all_splits)} fragments.")
         
-        # Create the vectorstore using FAISS
+        # Index the chunks with the configured retrieval backend
         try:
-            self.vectorstore = FAISS.from_documents(documents=all_splits, embedding=self.llm_embeddings)
-            logger.debug("Vectorstore successfully initialized.")
+            self.retriever.index(all_splits)
+            self.indexed = True
+            logger.debug(f"Retrieval index built with {type(self.retriever).__name__}.")
         except Exception as e:
-            logger.error(f"Error during vectorstore creation: {e}")
+            logger.error(f"Error during retrieval index creation: {e}")
             raise
 
     def _retrieve_context(self, query: str, top_k: int = 3) -> str:
@@ -97,11 +135,10 @@ class LLMParser:
         Returns:
             str: Concatenated text fragments.
         """
-        if not self.vectorstore:
-            raise ValueError("Vectorstore not initialized. Run extract_job_description first.")
+        if not self.indexed:
+            raise ValueError("Retrieval index not initialized. Run set_body_html first.")
         
-        retriever = self.vectorstore.as_retriever()
-        retrieved_docs = retriever.get_relevant_documents(query)[:top_k]
+        retrieved_docs = self.retriever.retrieve(query, top_k)
         context = "\n\n".join(doc.page_content for doc in retrieved_docs)
         logger.debug(f"Context retrieved for query '{query}': {context[:200]}...")  # Log the first 200 characters
         return context
@@ -148,8 +185,7 @@ class LLMParser:
         Returns:
             str: The extracted job description.
         """
-        question = "What is the job description of the company?"
-        retrieval_query = "Job description"
+        question, retrieval_query = self.EXTRACTION_FIELDS["description"]
         logger.debug("Starting job description extraction.")
         return self._extract_information(question, retrieval_query)
     
@@ -159,8 +195,7 @@ class LLMParser:
         Returns:
             str: The extracted company name.
         """
-        question = "What is the company's name?"
-        retrieval_query = "Company name"
+        question, retrieval_query = self.EXTRACTION_FIELDS["company"]
         logger.debug("Starting company name extraction.")
         return self._extract_information(question, retrieval_query)
     
@@ -170,8 +205,7 @@ class LLMParser:
         Returns:
             str: The extracted role/title.
         """
-        question = "What is the role or title sought in this job description?"
-        retrieval_query = "Job title"
+        question, retrieval_query = self.EXTRACTION_FIELDS["role"]
         logger.debug("Starting role/title extraction.")
         return self._extract_information(question, retrieval_query)
     
@@ -181,8 +215,7 @@ class LLMParser:
         Returns:
             str: The extracted location.
         """
-        question = "What is the location mentioned in this job description?"
-        retrieval_query = "Location"
+        question, retrieval_query = self.EXTRACTION_FIELDS["location"]
         logger.debug("Starting location extraction.")
         return self._extract_information(question, retrieval_query)
     
@@ -192,17 +225,117 @@ class LLMParser:
         Returns:
             str: The extracted recruiter's email.
         """
-        question = "What is the recruiter's email address in this job description?"
-        retrieval_query = "Recruiter email"
+        question, retrieval_query = self.EXTRACTION_FIELDS["recruiter_email"]
         logger.debug("Starting recruiter email extraction.")
         email = self._extract_information(question, retrieval_query)
         
         # Validate the extracted email using regex
-        email_regex = r'[\w\.-]+@[\w\.-]+\.\w+'
-        if re.match(email_regex, email):
+        if re.match(self.EMAIL_REGEX, email):
             logger.debug("Valid recruiter's email.")
             return email
         else:
             logger.warning("Invalid or not found recruiter's email.")
             return ""
- 
+
+    def _extraction_methods(self) -> Dict[str, callable]:
+        return {
+            "role": self.extract_role,
+            "company": self.extract_company_name,
+            "location": self.extract_location,
+            "description": self.extract_job_description,
+            "recruiter_email": self.extract_recruiter_email,
+        }
+
+    @staticmethod
+    def _parse_json_object(output: str) -> Optional[dict]:
+        """
+        Parse the JSON object in an LLM reply, tolerating code fences and surrounding text.
+        """
+        match = re.search(r"\{.*\}", output, re.DOTALL)
+        if not match:
+            return None
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+
+    def extract_all(self, fields: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Extracts several fields with a single retrieval pass and a single LLM call.
+        The chunks relevant to every requested field are retrieved once, deduplicated and sent
+        together with a request for one JSON object. Fields that are missing from the reply or
+        fail schema validation fall back to their individual extract_* method.
+        Args:
+            fields (list[str]): Names from EXTRACTION_FIELDS; all of them if None.
+        Returns:
+            dict: The extracted value of each requested field.
+        """
+        fields = list(fields or self.EXTRACTION_FIELDS)
+        unknown = [field for field in fields if field not in self.EXTRACTION_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown extraction fields: {unknown}")
+        if not self.indexed:
+            raise ValueError("Retrieval index not initialized. Run set_body_html first.")
+
+        # All retrieval queries are answered in one batch
+        retrieved = self.retriever.retrieve_many([self.EXTRACTION_FIELDS[field][1] for field in fields], 3)
+        chunks = []
+        for docs in retrieved.values():
+            for doc in docs:
+                if doc.page_content not in chunks:
+                    chunks.append(doc.page_content)
+        context = "\n\n".join(chunks)
+        logger.debug(f"Retrieved {len(chunks)} distinct chunks for fields {fields}.")
+
+        questions = "\n".join(f'- "{field}": {self.EXTRACTION_FIELDS[field][0]}' for field in fields)
+        prompt = ChatPromptTemplate.from_template(
+            template="""
+            You are an expert in extracting specific information from job descriptions.
+            Carefully read the job description context below and answer every question.
+
+            Context: {context}
+
+            Questions:
+            {questions}
+
+            Reply with only a JSON object whose keys are the quoted field names above and whose values are
+            strings with clear and concise answers. Use an empty string when the information is not present.
+            """
+        )
+
+        parsed = None
+        try:
+            chain = prompt | self.llm | StrOutputParser()
+            output = chain.invoke({"context": context, "questions": questions})
+            logger.debug(f"Structured extraction output: {output}")
+            parsed = self._parse_json_object(output)
+        except Exception as e:
+            logger.error(f"Error during structured information extraction: {e}")
+        if parsed is None:
+            logger.warning("Structured extraction returned no valid JSON object, extracting fields one by one.")
+            parsed = {}
+
+        schema = {
+            "type": "object",
+            "properties": {field: {"type": "string"} for field in fields},
+            "required": fields,
+        }
+        invalid = {field for field in fields if field not in parsed}
+        for error in Draft7Validator(schema).iter_errors(parsed):
+            if error.path:
+                invalid.add(error.path[0])
+
+        results = {}
+        extraction_methods = self._extraction_methods()
+        for field in fields:
+            value = parsed.get(field, "")
+            if field in invalid:
+                logger.debug(f"Field '{field}' missing or invalid in structured reply, using fallback extraction.")
+                value = extraction_methods[field]()
+            elif field == "recruiter_email" and value and not re.match(self.EMAIL_REGEX, value):
+                logger.warning("Invalid or not found recruiter's email.")
+                value = ""
+            results[field] = value.strip()
+        logger.debug(f"Extracted fields: {results}")
+        return results
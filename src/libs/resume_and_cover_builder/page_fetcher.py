@@ -0,0 +1,171 @@
+"""
+This module fetches job pages, using a plain HTTP request when the page is served as static HTML
+and falling back to the Selenium driver for pages that are rendered with JavaScript.
+"""
+# app/libs/resume_and_cover_builder/page_fetcher.py
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+from src.libs.resume_and_cover_builder.html_cleaner import readable_text
+from src.utils.page_readiness import PageReadiness
+
+HTTP = "http"
+BROWSER = "browser"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
+# Signs that the HTML is an application shell waiting for JavaScript to render the content
+JS_SHELL_MARKERS = re.compile(
+    r"enable javascript|javascript is (?:required|disabled)|<div id=\"(?:root|app|__next)\">\s*</div>",
+    re.IGNORECASE,
+)
+
+
+class PageFetcher:
+    """
+    Fetches a page over HTTP first and checks the response holds the posting; otherwise loads it in Chrome.
+    The strategy that worked is remembered per domain in a JSON file, so JS-rendered sites go straight
+    to the browser and static sites never start one.
+    """
+    _client = None
+    _client_lock = threading.Lock()
+
+    def __init__(
+        self,
+        strategy_path: Path,
+        timeout: float = 15,
+        min_text_length: int = 500,
+        strategy_ttl: float = 7 * 24 * 3600,
+        ready_budget: float = 10,
+    ):
+        """
+        Args:
+            strategy_path (Path): JSON file holding the strategy learned for each domain.
+            timeout (float): Timeout in seconds of the HTTP request.
+            min_text_length (int): Minimum amount of readable text for an HTTP response to count as the page.
+            strategy_ttl (float): Seconds after which a domain that needed the browser is tried over HTTP again.
+            ready_budget (float): Maximum seconds spent waiting for a page loaded in the browser to be ready.
+        """
+        self.ready_budget = ready_budget
+        self.strategy_path = Path(strategy_path)
+        self.timeout = timeout
+        self.min_text_length = min_text_length
+        self.strategy_ttl = strategy_ttl
+        self._strategies_lock = threading.Lock()
+        self.strategies = self._load_strategies()
+
+    @classmethod
+    def _get_client(cls) -> httpx.Client:
+        # One pooled client per process keeps connections alive across postings
+        with cls._client_lock:
+            if cls._client is None:
+                cls._client = httpx.Client(
+                    follow_redirects=True,
+                    headers={
+                        "User-Agent": USER_AGENT,
+                        "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                        "Accept-Encoding": "gzip, deflate",
+                        "Accept-Language": "en-US,en;q=0.9",
+                    },
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+            return cls._client
+
+    def _load_strategies(self) -> Dict[str, dict]:
+        try:
+            with open(self.strategy_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_strategy(self, domain: str, strategy: str) -> None:
+        with self._strategies_lock:
+            self.strategies[domain] = {"strategy": strategy, "updated": time.time()}
+            try:
+                self.strategy_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.strategy_path.with_suffix(f".{os.getpid()}.tmp")
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.strategies, f, indent=2)
+                os.replace(temp_path, self.strategy_path)
+            except OSError as e:
+                logger.warning(f"Could not save page fetch strategies: {e}")
+
+    def _strategy_for(self, domain: str) -> Optional[str]:
+        entry = self.strategies.get(domain)
+        if entry is None:
+            return None
+        if entry["strategy"] == BROWSER and time.time() - entry["updated"] > self.strategy_ttl:
+            return None
+        return entry["strategy"]
+
+    def is_meaningful(self, html: str) -> bool:
+        """
+        Whether an HTML document already contains the posting rather than a JavaScript shell.
+        """
+        text_length = len(readable_text(html))
+        if JS_SHELL_MARKERS.search(html):
+            # Shells often carry a short teaser; demand clearly more text before trusting them
+            return text_length >= self.min_text_length * 2
+        return text_length >= self.min_text_length
+
+    def fetch_http(self, url: str) -> Optional[str]:
+        """
+        Fetch a page with a plain GET request.
+        Returns:
+            str: The page HTML, or None if the request failed or the page needs JavaScript.
+        """
+        try:
+            response = self._get_client().get(url, timeout=self.timeout)
+        except httpx.HTTPError as e:
+            logger.debug(f"HTTP fetch of {url} failed: {e}")
+            return None
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", ""):
+            logger.debug(f"HTTP fetch of {url} returned {response.status_code} {response.headers.get('content-type')}")
+            return None
+        if not self.is_meaningful(response.text):
+            logger.debug(f"HTTP response for {url} has no meaningful content")
+            return None
+        return response.text
+
+    def fetch_browser(self, url: str, driver) -> str:
+        readiness = PageReadiness(budget=self.ready_budget)
+        readiness.before_navigation(driver)
+        driver.get(url)
+        readiness.wait(driver, url)
+        return driver.page_source
+
+    def fetch(self, url: str, get_driver: Callable) -> str:
+        """
+        Fetch a job page with the strategy known to work for its domain.
+        Args:
+            url (str): The job URL.
+            get_driver (Callable): Returns the Selenium WebDriver used when the page needs JavaScript;
+                only called in that case, so no browser is started for static pages.
+        Returns:
+            str: The page HTML.
+        """
+        domain = urlparse(url).netloc.lower()
+        strategy = self._strategy_for(domain)
+        start = time.monotonic()
+        if strategy != BROWSER:
+            html = self.fetch_http(url)
+            if html is not None:
+                if strategy is None:
+                    self._save_strategy(domain, HTTP)
+                logger.info(f"Fetched {url} over HTTP in {time.monotonic() - start:.2f}s")
+                return html
+            self._save_strategy(domain, BROWSER)
+
+        html = self.fetch_browser(url, get_driver())
+        logger.info(f"Fetched {url} with the browser in {time.monotonic() - start:.2f}s")
+        return html
@@ -0,0 +1,113 @@
+"""
+This module keeps rendered PDFs on disk keyed by a hash of the exact document and print options, so that
+re-exporting a resume or re-running after a partial failure does not render identical documents again.
+"""
+# app/libs/resume_and_cover_builder/pdf_render_cache.py
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from loguru import logger
+
+from src.utils.chrome_utils import PDF_PRINT_OPTIONS
+
+
+class PdfRenderCache:
+    """
+    Rendered PDFs stored as <key>.pdf, evicted least recently used first once the directory exceeds max_bytes.
+    The modification time of a file is its last use: hits touch it, so no separate index is needed.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, directory: Path, max_bytes: int):
+        """
+        Args:
+            directory (Path): Directory of the cached PDFs.
+            max_bytes (int): Total size of the cached PDFs above which the least recently used are removed.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(html: str, renderer: str, preprocessing: str = "") -> str:
+        """
+        Hash of everything that determines the PDF: the renderer, the print options and the full HTML.
+        Args:
+            html (str): The document as it is before any preprocessing such as asset bundling.
+            renderer (str): The PDF renderer.
+            preprocessing (str): Settings and state of the steps that change the HTML before it is rendered.
+        """
+        digest = hashlib.sha256()
+        digest.update(renderer.encode("utf-8"))
+        digest.update(json.dumps(PDF_PRINT_OPTIONS, sort_keys=True).encode("utf-8"))
+        digest.update(preprocessing.encode("utf-8"))
+        digest.update(html.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Return the path of the cached PDF, marking it as recently used.
+        Returns:
+            Path: The cached PDF, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def copy(self, cached: Path, output_file: Path) -> Path:
+        """
+        Copy a cached PDF to output_file through a temporary file, like a render would write it.
+        """
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+        shutil.copyfile(cached, temp_path)
+        os.replace(temp_path, output_file)
+        return output_file
+
+    def put(self, key: str, pdf: Union[bytes, Path]) -> None:
+        """
+        Store a rendered PDF, given as bytes or as the path of the written file, then evict old entries.
+        """
+        path = self._path(key)
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                if isinstance(pdf, bytes):
+                    temp_path.write_bytes(pdf)
+                else:
+                    shutil.copyfile(pdf, temp_path)
+                os.replace(temp_path, path)
+                self._evict()
+        except OSError as e:
+            logger.warning(f"Could not store rendered PDF in the cache: {e}")
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                logger.debug(f"Evicted {path.name} from the PDF render cache")
+            except OSError:
+                pass
@@ -0,0 +1,553 @@
+"""
+This module renders resumes and cover letters to PDF with ReportLab, without a browser.
+The fixed markup of template_base.py (header, sections, entries, compact lists, two-column skills,
+cover letter) is mapped onto ReportLab flowables, styled by a profile read from the resume_style CSS.
+"""
+# app/libs/resume_and_cover_builder/reportlab_renderer.py
+import io
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+from loguru import logger
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.fonts import addMapping
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+from reportlab.platypus import (
+    HRFlowable, KeepTogether, ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle,
+)
+
+from src.utils.chrome_utils import PDF_PRINT_OPTIONS
+
+VOID_TAGS = frozenset({"br", "hr", "img", "meta", "link", "input", "col", "wbr"})
+BASE_FONTS = {
+    "Helvetica": ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique"),
+    "Times-Roman": ("Times-Roman", "Times-Bold", "Times-Italic", "Times-BoldItalic"),
+    "Courier": ("Courier", "Courier-Bold", "Courier-Oblique", "Courier-BoldOblique"),
+}
+# The base fonts only encode WinAnsi; other text is drawn with the DejaVu family closest to the base font
+UNICODE_FONT_FILES = {
+    "Helvetica": ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf", "DejaVuSans-Oblique.ttf", "DejaVuSans-BoldOblique.ttf"),
+    "Times-Roman": ("DejaVuSerif.ttf", "DejaVuSerif-Bold.ttf", "DejaVuSerif-Italic.ttf", "DejaVuSerif-BoldItalic.ttf"),
+    "Courier": ("DejaVuSansMono.ttf", "DejaVuSansMono-Bold.ttf", "DejaVuSansMono-Oblique.ttf", "DejaVuSansMono-BoldOblique.ttf"),
+}
+FONT_DIRECTORIES = (
+    Path("/usr/share/fonts/truetype/dejavu"),
+    Path("/usr/share/fonts/dejavu"),
+    Path("/usr/share/fonts/TTF"),
+    Path("/usr/local/share/fonts"),
+    Path.home() / ".fonts",
+    Path.home() / "Library/Fonts",
+    Path("/Library/Fonts"),
+    Path(os.environ.get("WINDIR", "C:/Windows")) / "Fonts",
+)
+ROOT_FONT_SIZE = 12.0  # 16px in points
+IMPORT_REGEX = re.compile(r"""@import\s+(?:url\([^)]*\)|"[^"]*"|'[^']*')[^;]*;""")
+
+
+def _needs_unicode_font(characters: FrozenSet[str]) -> bool:
+    return any(character.encode("cp1252", "ignore") == b"" for character in characters if not character.isspace())
+
+
+@lru_cache(maxsize=None)
+def _unicode_fonts(base_font: str, font_directory: Optional[Path] = None) -> Optional[Tuple[Tuple[str, str, str, str], FrozenSet[str]]]:
+    """
+    Register the DejaVu family matching a base font, looking in font_directory first, then in the system font directories.
+    Variants that are not installed fall back to the regular or bold face.
+    Returns:
+        tuple: The registered regular, bold, italic and bold italic font names and the characters they cover,
+        or None if the regular face is not installed.
+    """
+    directories = ([Path(font_directory)] if font_directory else []) + list(FONT_DIRECTORIES)
+    names: List[Optional[str]] = []
+    covered: FrozenSet[str] = frozenset()
+    for file_name in UNICODE_FONT_FILES[base_font]:
+        path = next((directory / file_name for directory in directories if (directory / file_name).is_file()), None)
+        name = Path(file_name).stem
+        try:
+            if path is not None and name not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(TTFont(name, str(path)))
+        except TTFError as e:
+            logger.warning(f"Could not load font {path}: {e}")
+            path = None
+        if path is None and not names:
+            return None
+        if not names:
+            covered = frozenset(map(chr, pdfmetrics.getFont(name).face.charToGlyph))
+        names.append(name if path is not None else None)
+    regular, bold, italic, bold_italic = names
+    bold = bold or regular
+    fonts = (regular, bold, italic or regular, bold_italic or bold)
+    # Lets <b> and <i> in paragraph markup pick the variants
+    for index, font in enumerate(fonts):
+        addMapping(regular, index & 1, index >> 1, font)
+    return fonts, covered
+
+
+class _Node:
+    def __init__(self, tag: str, attrs: Dict[str, str]):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List[Union["_Node", str]] = []
+
+    @property
+    def classes(self) -> List[str]:
+        return (self.attrs.get("class") or "").split()
+
+    def elements(self) -> List["_Node"]:
+        return [child for child in self.children if isinstance(child, _Node)]
+
+    def text(self) -> str:
+        return " ".join("".join(c if isinstance(c, str) else c.text() for c in self.children).split())
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("root", {})
+        self.stack = [self.root]
+        self.styles: List[str] = []
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "style":
+            self._in_style = True
+            return
+        node = _Node(tag, {k: v or "" for k, v in attrs})
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        if tag == "style":
+            self._in_style = False
+            return
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                break
+
+    def handle_data(self, data):
+        if self._in_style:
+            self.styles.append(data)
+        elif data.strip() or (self.stack[-1].children and data):
+            self.stack[-1].children.append(data)
+
+
+def _parse_css_blocks(css: str, rules: Dict[str, Dict[str, str]], print_rules: Dict[str, Dict[str, str]]) -> None:
+    position = 0
+    while True:
+        start = css.find("{", position)
+        if start == -1:
+            return
+        prelude = css[position:start].strip()
+        depth, end = 1, start + 1
+        while depth and end < len(css):
+            depth += {"{": 1, "}": -1}.get(css[end], 0)
+            end += 1
+        content = css[start + 1:end - 1]
+        position = end
+        if prelude.startswith("@media"):
+            if "print" in prelude:
+                _parse_css_blocks(content, print_rules, print_rules)
+            continue
+        if prelude.startswith("@"):
+            continue
+        declarations = {}
+        for declaration in content.split(";"):
+            name, _, value = declaration.partition(":")
+            name = name.strip()
+            if value.strip():
+                # Custom properties are case-sensitive
+                declarations[name if name.startswith("--") else name.lower()] = value.strip()
+        for selector in prelude.split(","):
+            rules.setdefault(" ".join(selector.split()), {}).update(declarations)
+
+
+def _parse_color(value: Optional[str]) -> Optional[colors.Color]:
+    if not value:
+        return None
+    value = value.strip().lower()
+    match = re.match(r"rgba?\(([^)]+)\)", value)
+    try:
+        if match:
+            parts = [float(p.strip().rstrip("%")) for p in match.group(1).replace("/", ",").split(",")]
+            alpha = parts[3] if len(parts) > 3 else 1.0
+            return colors.Color(parts[0] / 255, parts[1] / 255, parts[2] / 255, alpha)
+        if re.fullmatch(r"#[0-9a-f]{3,4}", value):
+            value = "#" + "".join(c * 2 for c in value[1:])
+        if re.fullmatch(r"#[0-9a-f]{8}", value):
+            return colors.Color(*(int(value[i:i + 2], 16) / 255 for i in (1, 3, 5, 7)))
+        color = colors.toColor(value.split()[0])
+        return None if value in ("transparent", "none") else color
+    except (ValueError, IndexError):
+        return None
+
+
+def _parse_length(value: Optional[str], font_size: float) -> Optional[float]:
+    """
+    Convert a CSS length to points.
+    """
+    if not value:
+        return None
+    match = re.match(r"(-?[\d.]+)\s*(pt|px|rem|em|%|cm|mm|in)?", value.strip())
+    if not match:
+        return None
+    number, unit = float(match.group(1)), match.group(2) or "px"
+    factors = {"pt": 1, "px": 0.75, "rem": ROOT_FONT_SIZE, "em": font_size, "%": font_size / 100,
+               "cm": 72 / 2.54, "mm": 72 / 25.4, "in": 72}
+    return number * factors[unit]
+
+
+def _base_font(family: Optional[str]) -> str:
+    family = (family or "").lower()
+    generic = family.split(",")[-1].strip().strip("'\"")
+    if "mono" in generic or "courier" in family:
+        return "Courier"
+    if generic == "serif" or (("times" in family or "georgia" in family) and "sans" not in family):
+        return "Times-Roman"
+    return "Helvetica"
+
+
+@dataclass
+class StyleProfile:
+    """
+    The parts of a resume stylesheet ReportLab can reproduce. Web fonts map to the closest
+    PDF base font (Helvetica, Times or Courier); the renderer swaps in DejaVu for text outside WinAnsi.
+    """
+    font: str = "Helvetica"
+    font_size: float = 10.0
+    leading: float = 14.0
+    text_color: colors.Color = colors.black
+    link_color: colors.Color = colors.HexColor("#0645ad")
+    h1_size: float = 22.0
+    h1_color: colors.Color = colors.black
+    header_background: Optional[colors.Color] = None
+    header_alignment: int = TA_CENTER
+    contact_color: colors.Color = colors.black
+    contact_size: float = 9.0
+    h2_size: float = 14.0
+    h2_color: colors.Color = colors.black
+    h2_uppercase: bool = False
+    h2_rule_color: Optional[colors.Color] = None
+    h2_rule_width: float = 0.0
+    entry_header_color: colors.Color = colors.black
+    entry_header_bold: bool = True
+    details_color: colors.Color = colors.black
+    details_size: float = 9.0
+    details_italic: bool = True
+    variables: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_css(cls, css: str) -> "StyleProfile":
+        """
+        Build the profile from a stylesheet, applying its @media print rules as Chrome does when printing.
+        """
+        css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+        css = IMPORT_REGEX.sub("", css)
+        rules, print_rules = {}, {}
+        _parse_css_blocks(css, rules, print_rules)
+        for selector, declarations in print_rules.items():
+            rules.setdefault(selector, {}).update(declarations)
+
+        variables = {name: value for name, value in rules.get(":root", {}).items() if name.startswith("--")}
+
+        def resolve(value: Optional[str]) -> Optional[str]:
+            for _ in range(5):
+                if not value or "var(" not in value:
+                    break
+                value = re.sub(
+                    r"var\(\s*(--[\w-]+)\s*(?:,\s*([^)]*))?\)",
+                    lambda m: variables.get(m.group(1), m.group(2) or ""),
+                    value,
+                )
+            return value
+
+        def get(name: str, *selectors: str) -> Optional[str]:
+            value = None
+            for selector in ("*",) + selectors:
+                value = rules.get(selector, {}).get(name, value)
+            return resolve(value)
+
+        profile = cls(variables=variables)
+        profile.font = _base_font(get("font-family", "body"))
+        profile.font_size = _parse_length(get("font-size", "body"), ROOT_FONT_SIZE) or profile.font_size
+        line_height = get("line-height", "body")
+        if line_height and re.fullmatch(r"[\d.]+", line_height):
+            profile.leading = float(line_height) * profile.font_size
+        else:
+            profile.leading = _parse_length(line_height, profile.font_size) or profile.font_size * 1.4
+        profile.text_color = _parse_color(get("color", "body")) or profile.text_color
+        profile.link_color = _parse_color(get("color", "body", "a")) or profile.link_color
+
+        profile.h1_size = _parse_length(get("font-size", "h1", "header h1"), profile.font_size) or profile.h1_size
+        profile.h1_color = _parse_color(get("color", "body", "h1", "header h1")) or profile.text_color
+        profile.header_background = _parse_color(get("background-color", "header") or get("background", "header"))
+        profile.header_alignment = {"center": TA_CENTER, "right": TA_RIGHT}.get(get("text-align", "header") or "", TA_LEFT)
+        if profile.header_alignment == TA_LEFT and (get("justify-content", ".contact-info") or "") == "center":
+            profile.header_alignment = TA_CENTER
+        profile.contact_color = _parse_color(get("color", "body", "header", ".contact-info")) or profile.text_color
+        profile.contact_size = _parse_length(get("font-size", ".contact-info"), profile.font_size) or profile.font_size
+
+        profile.h2_size = _parse_length(get("font-size", "h2"), profile.font_size) or profile.h2_size
+        profile.h2_color = _parse_color(get("color", "body", "h2")) or profile.text_color
+        profile.h2_uppercase = (get("text-transform", "h2") or "") == "uppercase"
+        border = get("border-bottom", "h2")
+        if border and "none" not in border:
+            profile.h2_rule_width = _parse_length(border.split()[0], profile.font_size) or 1.0
+            profile.h2_rule_color = _parse_color(border.split()[-1]) or profile.h2_color
+
+        profile.entry_header_color = _parse_color(get("color", "body", ".entry-header")) or profile.text_color
+        profile.entry_header_bold = (get("font-weight", ".entry-header") or "bold") not in ("normal", "400", "300")
+        profile.details_color = _parse_color(get("color", "body", ".entry-details")) or profile.text_color
+        profile.details_size = _parse_length(get("font-size", ".entry-details"), profile.font_size) or profile.font_size
+        profile.details_italic = (get("font-style", ".entry-details") or "") == "italic"
+        return profile
+
+class ReportLabRenderer:
+    """
+    Renders the HTML produced from template_base.py with ReportLab, using the page geometry of the Chrome path.
+    """
+
+    def __init__(self, profile: StyleProfile, fonts: Optional[Tuple[str, str, str, str]] = None):
+        """
+        Args:
+            profile (StyleProfile): The styling read from the resume stylesheet.
+            fonts (tuple): Regular, bold, italic and bold italic font names replacing the base font of the profile.
+        """
+        self.profile = profile
+        self.fonts = fonts or BASE_FONTS[profile.font]
+        self.page_width = PDF_PRINT_OPTIONS["paperWidth"] * inch
+        self.page_height = PDF_PRINT_OPTIONS["paperHeight"] * inch
+        self.frame_width = self.page_width - (PDF_PRINT_OPTIONS["marginLeft"] + PDF_PRINT_OPTIONS["marginRight"]) * inch
+        p = profile
+        self.styles = {
+            "body": ParagraphStyle("body", fontName=self.fonts[0], fontSize=p.font_size, leading=p.leading, textColor=p.text_color),
+            "h1": ParagraphStyle("h1", fontName=self.font_variant(bold=True), fontSize=p.h1_size, leading=p.h1_size * 1.2,
+                                 textColor=p.h1_color, alignment=p.header_alignment, spaceAfter=p.h1_size * 0.3),
+            "contact": ParagraphStyle("contact", fontName=self.fonts[0], fontSize=p.contact_size, leading=p.contact_size * 1.4,
+                                      textColor=p.contact_color, alignment=p.header_alignment),
+            "h2": ParagraphStyle("h2", fontName=self.font_variant(bold=True), fontSize=p.h2_size, leading=p.h2_size * 1.2,
+                                 textColor=p.h2_color, spaceBefore=p.h2_size * 0.8, spaceAfter=p.h2_size * 0.2),
+            "entry_header": ParagraphStyle("entry_header", fontName=self.font_variant(bold=p.entry_header_bold),
+                                           fontSize=p.font_size, leading=p.leading, textColor=p.entry_header_color),
+            "details": ParagraphStyle("details", fontName=self.font_variant(italic=p.details_italic), fontSize=p.details_size,
+                                      leading=p.details_size * 1.4, textColor=p.details_color),
+            "list": ParagraphStyle("list", fontName=self.fonts[0], fontSize=p.font_size, leading=p.leading, textColor=p.text_color),
+        }
+
+    @classmethod
+    def from_css(cls, css: str, fonts: Optional[Tuple[str, str, str, str]] = None) -> "ReportLabRenderer":
+        return cls(StyleProfile.from_css(css), fonts)
+
+    def font_variant(self, bold: bool = False, italic: bool = False) -> str:
+        return self.fonts[bold + 2 * italic]
+
+    def _inline(self, node: Union[_Node, str]) -> str:
+        """
+        Convert inline HTML to ReportLab paragraph markup.
+        """
+        if isinstance(node, str):
+            return escape(node)
+        content = "".join(self._inline(child) for child in node.children)
+        if node.tag in ("strong", "b"):
+            return f"<b>{content}</b>"
+        if node.tag in ("em", "i"):
+            return "" if any(c.startswith("fa") for c in node.classes) else f"<i>{content}</i>"
+        if node.tag == "a":
+            href = escape(node.attrs.get("href", ""), {'"': "&quot;"})
+            return f'<a href="{href}" color="#{self.profile.link_color.hexval()[2:]}">{content}</a>'
+        if node.tag == "br":
+            return "<br/>"
+        return content
+
+    def _paragraph(self, node: _Node, style: str, uppercase: bool = False) -> Optional[Paragraph]:
+        markup = " ".join(self._inline(node).split())
+        if not markup:
+            return None
+        return Paragraph(markup.upper() if uppercase else markup, self.styles[style])
+
+    def _split_row(self, node: _Node, style: str) -> Table:
+        """
+        A flex row such as entry-header: first child on the left, the others aligned right.
+        """
+        cells = node.elements() or [node]
+        left = self._paragraph(cells[0], style) or ""
+        right_style = ParagraphStyle(f"{style}_right", parent=self.styles[style], alignment=TA_RIGHT)
+        right_markup = " ".join(" ".join(self._inline(cell).split()) for cell in cells[1:])
+        right = Paragraph(right_markup, right_style) if right_markup else ""
+        table = Table([[left, right]], colWidths=[self.frame_width * 0.62, self.frame_width * 0.38])
+        table.setStyle(TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 0),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+            ("TOPPADDING", (0, 0), (-1, -1), 0),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+        ]))
+        return table
+
+    def _list(self, node: _Node) -> ListFlowable:
+        items = [ListItem(p, leftIndent=12) for p in (self._paragraph(li, "list") for li in node.elements() if li.tag == "li") if p]
+        return ListFlowable(items, bulletType="bullet", start="•", leftIndent=12, bulletFontSize=self.profile.font_size * 0.8)
+
+    def _columns(self, columns: List[_Node]) -> Table:
+        width = self.frame_width / len(columns)
+        table = Table([[self._blocks(column) or "" for column in columns]], colWidths=[width] * len(columns))
+        table.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP"), ("LEFTPADDING", (0, 0), (-1, -1), 0)]))
+        return table
+
+    def _header(self, node: _Node) -> List:
+        flowables = []
+        for child in node.elements():
+            if child.tag == "h1":
+                flowables.append(self._paragraph(child, "h1"))
+            elif "contact-info" in child.classes:
+                items = [" ".join(self._inline(item).split()) for item in child.elements()]
+                flowables.append(Paragraph(" &nbsp;|&nbsp; ".join(i for i in items if i), self.styles["contact"]))
+            else:
+                flowables.extend(self._blocks(child))
+        flowables = [f for f in flowables if f]
+        if self.profile.header_background is None:
+            return flowables + [Spacer(1, self.profile.font_size)]
+        # Header with a background: draw it as a single-cell table
+        table = Table([[flowables]], colWidths=[self.frame_width])
+        table.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, -1), self.profile.header_background),
+            ("TOPPADDING", (0, 0), (-1, -1), 10),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+        ]))
+        return [table, Spacer(1, self.profile.font_size)]
+
+    def _blocks(self, node: _Node) -> List:
+        flowables = []
+        for child in node.children:
+            if isinstance(child, str):
+                if child.strip():
+                    flowables.append(Paragraph(escape(child.strip()), self.styles["body"]))
+                continue
+            classes = child.classes
+            if child.tag == "header":
+                flowables.extend(self._header(child))
+            elif child.tag == "h1":
+                flowables.append(self._paragraph(child, "h1"))
+            elif child.tag in ("h2", "h3"):
+                flowables.append(self._paragraph(child, "h2", uppercase=self.profile.h2_uppercase))
+                if self.profile.h2_rule_color is not None:
+                    flowables.append(HRFlowable(width="100%", thickness=self.profile.h2_rule_width,
+                                                color=self.profile.h2_rule_color, spaceBefore=1, spaceAfter=4))
+            elif "entry" in classes:
+                flowables.append(KeepTogether(self._blocks(child) + [Spacer(1, self.profile.font_size * 0.6)]))
+            elif "entry-header" in classes:
+                flowables.append(self._split_row(child, "entry_header"))
+            elif "entry-details" in classes:
+                flowables.append(self._split_row(child, "details"))
+            elif child.tag in ("ul", "ol"):
+                flowables.append(self._list(child))
+            elif "two-column" in classes or "display: flex" in child.attrs.get("style", "").replace("display:flex", "display: flex"):
+                flowables.append(self._columns(child.elements()))
+            elif child.tag == "p":
+                flowables.append(self._paragraph(child, "body"))
+                flowables.append(Spacer(1, self.profile.font_size * 0.4))
+            elif child.tag in ("span", "a", "strong", "b", "em"):
+                flowables.append(self._paragraph(child, "body"))
+            elif child.tag not in ("script", "head", "title", "meta", "link"):
+                flowables.extend(self._blocks(child))
+        return [f for f in flowables if f]
+
+    def render(self, html: str) -> bytes:
+        """
+        Render an HTML document or body fragment to PDF.
+        Args:
+            html (str): The HTML to render.
+        Returns:
+            bytes: The PDF content.
+        """
+        builder = _TreeBuilder()
+        builder.feed(html)
+        builder.close()
+        buffer = io.BytesIO()
+        document = SimpleDocTemplate(
+            buffer,
+            pagesize=(self.page_width, self.page_height),
+            leftMargin=PDF_PRINT_OPTIONS["marginLeft"] * inch,
+            rightMargin=PDF_PRINT_OPTIONS["marginRight"] * inch,
+            topMargin=PDF_PRINT_OPTIONS["marginTop"] * inch,
+            bottomMargin=PDF_PRINT_OPTIONS["marginBottom"] * inch,
+        )
+        document.build(self._blocks(builder.root) or [Spacer(1, 1)])
+        return buffer.getvalue()
+
+
+def split_document(html: str) -> Tuple[str, str]:
+    """
+    Split a full HTML document into its inline CSS and the rest of the markup.
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return "\n".join(builder.styles), html
+
+
+def _document_characters(html: str) -> FrozenSet[str]:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return frozenset(builder.root.text())
+
+
+def can_render_reportlab(html: str, font_directory: Optional[Path] = None) -> bool:
+    """
+    Whether ReportLab has a font for every character of the document: the base fonts cover WinAnsi
+    (Western European text), an installed DejaVu family most other alphabets, but not e.g. CJK.
+    Args:
+        html (str): The full HTML document.
+        font_directory (Path): Directory with the DejaVu TTF files, searched before the system font directories.
+    """
+    characters = _document_characters(html)
+    if not _needs_unicode_font(characters):
+        return True
+    css, _ = split_document(html)
+    unicode_fonts = _unicode_fonts(StyleProfile.from_css(css).font, font_directory)
+    return unicode_fonts is not None and all(c in unicode_fonts[1] or c.isspace() for c in characters)
+
+
+def HTML_to_PDF_reportlab(html_content: str, output_path: Path = None, font_directory: Path = None) -> Union[bytes, Path]:
+    """
+    Render a document built from global_config.html_template to PDF with ReportLab, styled by its inline CSS.
+    Text outside WinAnsi is drawn with DejaVu; check can_render_reportlab first to avoid missing glyphs.
+    Args:
+        html_content (str): The full HTML document.
+        output_path (Path): Where to write the PDF. If None, the PDF is returned as bytes.
+        font_directory (Path): Directory with the DejaVu TTF files, searched before the system font directories.
+    Returns:
+        The PDF content as bytes, or the path of the written file.
+    """
+    if not isinstance(html_content, str) or not html_content.strip():
+        raise ValueError("HTML content must be a non-empty string.")
+    css, html = split_document(html_content)
+    profile = StyleProfile.from_css(css)
+    fonts = None
+    if _needs_unicode_font(_document_characters(html)):
+        unicode_fonts = _unicode_fonts(profile.font, font_directory)
+        if unicode_fonts is None:
+            logger.warning("No DejaVu font found, characters outside WinAnsi will be missing from the PDF")
+        else:
+            fonts = unicode_fonts[0]
+    pdf = ReportLabRenderer(profile, fonts).render(html)
+    if output_path is None:
+        return pdf
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    temp_path.write_bytes(pdf)
+    os.replace(temp_path, output_path)
+    return output_path
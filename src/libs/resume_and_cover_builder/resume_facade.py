@@ -3,16 +3,28 @@ This module contains the FacadeManager class, which is responsible for managing
 """
 # app/libs/resume_and_cover_builder/manager_facade.py
 import hashlib
+import time
 import inquirer
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict
 
 from loguru import logger
 
+from src.libs.resume_and_cover_builder.asset_bundler import AssetBundler
+from src.libs.resume_and_cover_builder.job_snapshot_cache import JobSnapshotCache
 from src.libs.resume_and_cover_builder.llm.llm_job_parser import LLMParser
+from src.libs.resume_and_cover_builder.page_fetcher import PageFetcher
+from src.libs.resume_and_cover_builder.pdf_render_cache import PdfRenderCache
+from src.libs.resume_and_cover_builder.reportlab_renderer import HTML_to_PDF_reportlab, can_render_reportlab
+from src.libs.resume_and_cover_builder.structured_data import extract_job_posting
 from src.job import Job
-from src.utils.chrome_utils import HTML_to_PDF
+from src.utils.chrome_utils import HTML_to_PDF_bytes, HTML_to_PDF_file, capture_page_thumbnail, chrome_scraping_options, init_browser
+from src.utils.render_pool import RenderPool
 from .config import global_config
 
+JOB_FIELDS = ("role", "company", "description", "location")
+
 class ResumeFacade:
     def __init__(self, api_key, style_manager, resume_generator, resume_object, output_path):
         """
@@ -31,14 +43,33 @@ class ResumeFacade:
         global_config.STRINGS_MODULE_NAME = "strings_feder_cr"
         global_config.STYLES_DIRECTORY = lib_directory / "resume_style"
         global_config.LOG_OUTPUT_FILE_PATH = output_path
+        global_config.CACHE_DIRECTORY = Path(output_path) / "cache"
         global_config.API_KEY = api_key
         self.style_manager = style_manager
         self.resume_generator = resume_generator
         self.resume_generator.set_resume_object(resume_object)
         self.selected_style = None  # Property to store the selected style
+        self.driver = None
+        self._owns_driver = False
     
     def set_driver(self, driver):
-         self.driver = driver
+        """
+        Use the given browser to load job pages that need JavaScript. It is not closed by the facade.
+        """
+        self.driver = driver
+
+    def _get_driver(self):
+        # Chrome is only started for job pages that cannot be fetched over HTTP
+        if self.driver is None:
+            self.driver = init_browser(chrome_scraping_options())
+            self._owns_driver = True
+        return self.driver
+
+    def _close_driver(self) -> None:
+        if self._owns_driver and self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+            self._owns_driver = False
 
     def prompt_user(self, choices: list[str], message: str) -> str:
         """
@@ -68,31 +99,112 @@ class ResumeFacade:
         return inquirer.prompt(questions)['text']
 
         
-    def link_to_job(self, job_url):
-        self.driver.get(job_url)
-        self.driver.implicitly_wait(10)
-        body_element = self.driver.find_element("tag name", "body")
-        body_element = body_element.get_attribute("outerHTML")
-        self.llm_job_parser = LLMParser(openai_api_key=global_config.API_KEY)
-        self.llm_job_parser.set_body_html(body_element)
-
-        self.job = Job()
-        self.job.role = self.llm_job_parser.extract_role()
-        self.job.company = self.llm_job_parser.extract_company_name()
-        self.job.description = self.llm_job_parser.extract_job_description()
-        self.job.location = self.llm_job_parser.extract_location()
+    def link_to_job(self, job_url, refresh: bool = False):
+        """
+        Fetch the job posting at the given URL and extract its details into self.job.
+        Args:
+            job_url (str): The job URL.
+            refresh (bool): Ignore the stored snapshot of the posting and fetch it again.
+        """
+        snapshot_cache = JobSnapshotCache(global_config.CACHE_DIRECTORY / "job_snapshots", global_config.JOB_SNAPSHOT_TTL)
+        snapshot = None if refresh else snapshot_cache.get(job_url)
+        if snapshot is not None:
+            logger.info(f"Using job details fetched at {time.ctime(snapshot['fetched_at'])} for URL: {job_url}")
+            self.job = Job(**snapshot["job_fields"])
+            self.job.link = job_url
+            return
+
+        page_fetcher = PageFetcher(
+            global_config.CACHE_DIRECTORY / "page_fetch_strategies.json",
+            timeout=global_config.PAGE_FETCH_TIMEOUT,
+            min_text_length=global_config.PAGE_FETCH_MIN_TEXT_LENGTH,
+            ready_budget=global_config.PAGE_READY_BUDGET,
+        )
+        try:
+            page_html = page_fetcher.fetch(job_url, self._get_driver)
+        finally:
+            self._close_driver()
+
+        # Structured data (JSON-LD, microdata) usually lives in the head, so read the whole page
+        job_fields = extract_job_posting(page_html)
+        missing_fields = [field for field in JOB_FIELDS if field not in job_fields]
+        if missing_fields:
+            logger.info(f"Extracting {', '.join(missing_fields)} with the LLM")
+            self.llm_job_parser = LLMParser(openai_api_key=global_config.API_KEY)
+            self.llm_job_parser.set_body_html(page_html)
+            job_fields.update(self.llm_job_parser.extract_all(missing_fields))
+        if job_fields.get("role") and job_fields.get("description"):
+            snapshot_cache.put(job_url, job_fields)
+        else:
+            # The LLM returns empty fields when extraction fails; such a snapshot would be reused for days
+            logger.warning(f"Not storing a snapshot of {job_url}: role or description could not be extracted")
+        self.job = Job(**job_fields)
         self.job.link = job_url
         logger.info(f"Extracting job details from URL: {job_url}")
 
 
-    def create_resume_pdf_job_tailored(self) -> tuple[bytes, str]:
+    def suggested_name(self) -> str:
+        """
+        Unique name for the output folder of the linked job, from the job URL hash.
+        """
+        return hashlib.md5(self.job.link.encode()).hexdigest()[:10]
+
+    @staticmethod
+    def _render_pdf(html: str, output_file: Path = None, thumbnail_file: Path = None):
+        renderer = global_config.PDF_RENDERER
+        if renderer == "reportlab" and not can_render_reportlab(html, global_config.REPORTLAB_FONT_DIRECTORY):
+            logger.info("ReportLab has no font for some characters of the document, rendering it with Chrome")
+            renderer = "chrome"
+        asset_bundler = None
+        # ReportLab only uses the base PDF fonts, so there is nothing to bundle
+        if renderer != "reportlab" and global_config.BUNDLE_ASSETS:
+            asset_bundler = AssetBundler(global_config.CACHE_DIRECTORY / "assets", subset_fonts=global_config.SUBSET_FONTS)
+
+        def preprocessing() -> str:
+            # Bundling depends on the document, its settings and the assets cached so far
+            return "" if asset_bundler is None else f"bundle:{asset_bundler.subset_fonts}:{asset_bundler.cache_state()}"
+
+        render_cache = None
+        if global_config.PDF_RENDER_CACHE_MAX_MB:
+            render_cache = PdfRenderCache(global_config.CACHE_DIRECTORY / "pdf", int(global_config.PDF_RENDER_CACHE_MAX_MB * 2**20))
+            # Looked up before bundling, so a hit in a new process does not read and subset the fonts again
+            key = render_cache.key(html, renderer, preprocessing())
+            # A missing thumbnail still needs the document loaded in a browser
+            needs_browser = thumbnail_file is not None and renderer != "reportlab" and not Path(thumbnail_file).exists()
+            cached = None if needs_browser else render_cache.get(key)
+            if cached is not None:
+                logger.debug(f"Reusing the PDF rendered for an identical document ({key[:12]})")
+                return cached.read_bytes() if output_file is None else render_cache.copy(cached, output_file)
+
+        source_html = html
+        if asset_bundler is not None:
+            html = asset_bundler.bundle(html)
+
+        if renderer == "reportlab":
+            if thumbnail_file is not None:
+                logger.debug("Thumbnails need the Chrome renderer, skipping them")
+            result = HTML_to_PDF_reportlab(html, output_file, global_config.REPORTLAB_FONT_DIRECTORY)
+        else:
+            with RenderPool.default().lease() as driver:
+                if output_file is None:
+                    result = HTML_to_PDF_bytes(html, driver)
+                else:
+                    result = HTML_to_PDF_file(html, driver, output_file)
+                if thumbnail_file is not None:
+                    # The document is still loaded in the tab after printing
+                    capture_page_thumbnail(driver, thumbnail_file)
+        if render_cache is not None:
+            # Bundling may have downloaded assets, which the next lookup will see in the cache state
+            render_cache.put(render_cache.key(source_html, renderer, preprocessing()), result)
+        return result
+
+    def create_resume_pdf_job_tailored(self, output_file: Path = None) -> tuple[bytes | Path, str]:
         """
-        Create a resume PDF using the selected style and the given job description text.
+        Create a resume PDF using the selected style and the description of the linked job.
         Args:
-            job_url (str): The job URL to generate the hash for.
-            job_description_text (str): The job description text to include in the resume.
+            output_file (Path): Where to write the PDF. If None, the PDF is returned as bytes.
         Returns:
-            tuple: A tuple containing the PDF content as bytes and the unique filename.
+            tuple: The PDF content as bytes (or the path of the written file) and the unique filename.
         """
         style_path = self.style_manager.get_style_path()
         if style_path is None:
@@ -100,42 +212,65 @@ class ResumeFacade:
 
 
         html_resume = self.resume_generator.create_resume_job_description_text(style_path, self.job.description)
-
-        # Generate a unique name using the job URL hash
-        suggested_name = hashlib.md5(self.job.link.encode()).hexdigest()[:10]
-        
-        result = HTML_to_PDF(html_resume, self.driver)
-        self.driver.quit()
-        return result, suggested_name
+        return self._render_pdf(html_resume, output_file), self.suggested_name()
     
     
     
-    def create_resume_pdf(self) -> tuple[bytes, str]:
+    def create_resume_pdf(self, output_file: Path = None) -> bytes | Path:
         """
-        Create a resume PDF using the selected style and the given job description text.
+        Create a resume PDF using the selected style.
         Args:
-            job_url (str): The job URL to generate the hash for.
-            job_description_text (str): The job description text to include in the resume.
+            output_file (Path): Where to write the PDF. If None, the PDF is returned as bytes.
         Returns:
-            tuple: A tuple containing the PDF content as bytes and the unique filename.
+            The PDF content as bytes, or the path of the written file.
         """
         style_path = self.style_manager.get_style_path()
         if style_path is None:
             raise ValueError("You must choose a style before generating the PDF.")
         
         html_resume = self.resume_generator.create_resume(style_path)
-        result = HTML_to_PDF(html_resume, self.driver)
-        self.driver.quit()
-        return result
+        return self._render_pdf(html_resume, output_file)
+
+    def create_resume_pdf_all_styles(self, output_dir: Path, thumbnails: bool = True) -> Dict[str, Path]:
+        """
+        Generate the resume body once and render it in every available style, in parallel on the render pool.
+        Args:
+            output_dir (Path): Directory of the PDFs, named after the style files.
+            thumbnails (bool): Also save a PNG of the first page next to each PDF.
+        Returns:
+            dict: The path of the PDF of each style that rendered successfully.
+        """
+        styles = self.style_manager.get_styles()
+        if not styles:
+            raise ValueError("No styles available.")
+        output_dir = Path(output_dir)
+        body_html = self.resume_generator.create_resume_body()
+
+        def render(file_name: str) -> Path:
+            html_resume = self.resume_generator.apply_style(body_html, self.style_manager.styles_directory / file_name)
+            stem = Path(file_name).stem
+            thumbnail_file = output_dir / f"{stem}.png" if thumbnails else None
+            return self._render_pdf(html_resume, output_dir / f"{stem}.pdf", thumbnail_file)
 
-    def create_cover_letter(self) -> tuple[bytes, str]:
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=RenderPool.default().size) as executor:
+            futures = {style_name: executor.submit(render, file_name) for style_name, (file_name, _) in styles.items()}
+        pdf_paths = {}
+        for style_name, future in futures.items():
+            try:
+                pdf_paths[style_name] = future.result()
+            except Exception as e:
+                logger.error(f"Could not render the resume in style {style_name}: {e}")
+        logger.info(f"Rendered {len(pdf_paths)} of {len(styles)} styles in {time.monotonic() - start:.1f}s")
+        return pdf_paths
+
+    def create_cover_letter(self, output_file: Path = None) -> tuple[bytes | Path, str]:
         """
-        Create a cover letter based on the given job description text and job URL.
+        Create a cover letter based on the description of the linked job.
         Args:
-            job_url (str): The job URL to generate the hash for.
-            job_description_text (str): The job description text to include in the cover letter.
+            output_file (Path): Where to write the PDF. If None, the PDF is returned as bytes.
         Returns:
-            tuple: A tuple containing the PDF content as bytes and the unique filename.
+            tuple: The PDF content as bytes (or the path of the written file) and the unique filename.
         """
         style_path = self.style_manager.get_style_path()
         if style_path is None:
@@ -143,11 +278,4 @@ class ResumeFacade:
         
         
         cover_letter_html = self.resume_generator.create_cover_letter_job_description(style_path, self.job.description)
-
-        # Generate a unique name using the job URL hash
-        suggested_name = hashlib.md5(self.job.link.encode()).hexdigest()[:10]
-
-        
-        result = HTML_to_PDF(cover_letter_html, self.driver)
-        self.driver.quit()
-        return result, suggested_name
\ No newline at end of file
+        return self._render_pdf(cover_letter_html, output_file), self.suggested_name()
@@ -18,10 +18,10 @@ class ResumeGenerator:
          self.resume_object = resume_object
          
 
-    def _create_resume(self, gpt_answerer: Any, style_path):
-        # Imposta il resume nell'oggetto gpt_answerer
-        gpt_answerer.set_resume(self.resume_object)
-        
+    def apply_style(self, body_html: str, style_path) -> str:
+        """
+        Build the full HTML document from a generated body and a style sheet.
+        """
         # Leggi il template HTML
         template = Template(global_config.html_template)
         
@@ -33,12 +33,26 @@ class ResumeGenerator:
         except Exception as e:
             raise RuntimeError(f"Errore durante la lettura del file CSS: {e}")
         
-        # Genera l'HTML del resume
-        body_html = gpt_answerer.generate_html_resume()
-        
         # Applica i contenuti al template
         return template.substitute(body=body_html, style_css=style_css)
 
+    def _create_resume(self, gpt_answerer: Any, style_path):
+        # Imposta il resume nell'oggetto gpt_answerer
+        gpt_answerer.set_resume(self.resume_object)
+        
+        # Genera l'HTML del resume
+        body_html = gpt_answerer.generate_html_resume()
+        return self.apply_style(body_html, style_path)
+
+    def create_resume_body(self) -> str:
+        """
+        Generate the body HTML of the resume once, so it can be styled with any style sheet through apply_style.
+        """
+        strings = load_module(global_config.STRINGS_MODULE_RESUME_PATH, global_config.STRINGS_MODULE_NAME)
+        gpt_answerer = LLMResumer(global_config.API_KEY, strings)
+        gpt_answerer.set_resume(self.resume_object)
+        return gpt_answerer.generate_html_resume()
+
     def create_resume(self, style_path):
         strings = load_module(global_config.STRINGS_MODULE_RESUME_PATH, global_config.STRINGS_MODULE_NAME)
         gpt_answerer = LLMResumer(global_config.API_KEY, strings)
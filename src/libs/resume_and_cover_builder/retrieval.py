@@ -0,0 +1,178 @@
+"""
+Retrieval backends used by LLMParser to pick the job page chunks relevant to each extraction question.
+"""
+# app/libs/resume_and_cover_builder/retrieval.py
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Callable, Dict, List
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+TOKEN_REGEX = re.compile(r"\w+", re.UNICODE)
+
+
+class RetrievalBackend(ABC):
+    @abstractmethod
+    def index(self, documents: List[Document]) -> None:
+        """
+        Build the index over the chunks of one job page, replacing any previous index.
+        """
+        pass
+
+    @abstractmethod
+    def retrieve(self, query: str, top_k: int = 3) -> List[Document]:
+        """
+        Return the top_k chunks most relevant to the query, best first.
+        """
+        pass
+
+    def retrieve_many(self, queries: List[str], top_k: int = 3) -> Dict[str, List[Document]]:
+        """
+        Return the top_k chunks for each query. Backends override this when they can batch the work.
+        """
+        return {query: self.retrieve(query, top_k) for query in queries}
+
+
+class BM25RetrievalBackend(RetrievalBackend):
+    """
+    Okapi BM25 over the chunks of a page. Runs locally with NumPy: no network and no embedding cost.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        return TOKEN_REGEX.findall(text.lower())
+
+    def index(self, documents: List[Document]) -> None:
+        self.documents = list(documents)
+        term_counts = [Counter(self._tokenize(doc.page_content)) for doc in self.documents]
+        self.vocabulary = {term: i for i, term in enumerate(sorted({t for counts in term_counts for t in counts}))}
+        self.term_frequencies = np.zeros((len(self.documents), len(self.vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(term_counts):
+            for term, count in counts.items():
+                self.term_frequencies[row, self.vocabulary[term]] = count
+
+        document_count = len(self.documents)
+        document_frequencies = (self.term_frequencies > 0).sum(axis=0)
+        self.idf = np.log(1.0 + (document_count - document_frequencies + 0.5) / (document_frequencies + 0.5))
+        lengths = self.term_frequencies.sum(axis=1)
+        average_length = lengths.mean() if document_count else 0.0
+        self.length_norm = self.k1 * (1.0 - self.b + self.b * lengths / (average_length or 1.0))
+        logger.debug(f"BM25 index built over {document_count} chunks and {len(self.vocabulary)} terms.")
+
+    def scores(self, query: str) -> np.ndarray:
+        columns = [self.vocabulary[t] for t in set(self._tokenize(query)) if t in self.vocabulary]
+        if not columns:
+            return np.zeros(len(self.documents), dtype=np.float32)
+        tf = self.term_frequencies[:, columns]
+        weights = tf * (self.k1 + 1.0) / (tf + self.length_norm[:, None])
+        return (weights * self.idf[columns]).sum(axis=1)
+
+    def retrieve(self, query: str, top_k: int = 3) -> List[Document]:
+        if not self.documents:
+            return []
+        scores = self.scores(query)
+        if not scores.any():
+            # No query term on the page: the top of the page usually holds title, company and location
+            return self.documents[:top_k]
+        ranking = np.argsort(-scores, kind="stable")[:top_k]
+        return [self.documents[i] for i in ranking]
+
+
+class EmbeddingRetrievalBackend(RetrievalBackend):
+    """
+    Dense retrieval: chunks are embedded into a normalized NumPy matrix and all queries are
+    scored with a single matrix multiplication. Query vectors are kept for the life of the
+    process because the extraction queries are the same for every job.
+    """
+    _query_vectors: Dict[tuple, np.ndarray] = {}
+    _query_vectors_lock = threading.Lock()
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+        self.documents: List[Document] = []
+        self.matrix = None
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def _model_key(self) -> str:
+        embeddings = getattr(self.embeddings, "embeddings", self.embeddings)
+        return f"{type(embeddings).__name__}:{getattr(embeddings, 'model', '')}"
+
+    def index(self, documents: List[Document]) -> None:
+        self.documents = list(documents)
+        if not self.documents:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+            return
+        self.matrix = self._normalize(self.embeddings.embed_documents([doc.page_content for doc in self.documents]))
+        logger.debug(f"Embedding index built over {len(self.documents)} chunks.")
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        model_key = self._model_key()
+        with self._query_vectors_lock:
+            missing = [query for query in dict.fromkeys(queries) if (model_key, query) not in self._query_vectors]
+        if missing:
+            # One request for every new query; OpenAI embeds queries and documents the same way
+            vectors = self._normalize(self.embeddings.embed_documents(missing))
+            with self._query_vectors_lock:
+                for query, vector in zip(missing, vectors):
+                    self._query_vectors[(model_key, query)] = vector
+        with self._query_vectors_lock:
+            return np.stack([self._query_vectors[(model_key, query)] for query in queries])
+
+    def retrieve_many(self, queries: List[str], top_k: int = 3) -> Dict[str, List[Document]]:
+        if self.matrix is None:
+            raise ValueError("Embedding index not initialized. Call index first.")
+        if not self.documents:
+            return {query: [] for query in queries}
+        scores = self._embed_queries(queries) @ self.matrix.T
+        top_k = min(top_k, len(self.documents))
+        # argpartition finds the top_k of each row without a full sort; only those are then ordered
+        candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        results = {}
+        for row, query in enumerate(queries):
+            ranking = candidates[row][np.argsort(-scores[row, candidates[row]])]
+            results[query] = [self.documents[i] for i in ranking]
+        return results
+
+    def retrieve(self, query: str, top_k: int = 3) -> List[Document]:
+        return self.retrieve_many([query], top_k)[query]
+
+
+BM25 = "bm25"
+EMBEDDINGS = "embeddings"
+RETRIEVAL_BACKENDS = (BM25, EMBEDDINGS)
+
+
+def create_retrieval_backend(name: str, embeddings_factory: Callable[[], Embeddings]) -> RetrievalBackend:
+    """
+    Create the retrieval backend with the given name.
+    Args:
+        name (str): One of RETRIEVAL_BACKENDS.
+        embeddings_factory (Callable): Builds the embeddings model; only called for embedding backends.
+    Returns:
+        RetrievalBackend: The retrieval backend.
+    """
+    if name == BM25:
+        return BM25RetrievalBackend()
+    if name == EMBEDDINGS:
+        return EmbeddingRetrievalBackend(embeddings_factory())
+    if name == "faiss":
+        raise ValueError(
+            'There is no "faiss" retrieval backend. Use "embeddings", which ranks chunks by exact '
+            'cosine similarity with NumPy, or "bm25".'
+        )
+    raise ValueError(f"Unsupported retrieval backend: {name}. Choose one of {RETRIEVAL_BACKENDS}.")
@@ -0,0 +1,186 @@
+"""
+This module reads the job fields that job boards publish as structured data (schema.org JobPosting
+in JSON-LD or microdata), so most postings can be extracted without the LLM.
+"""
+# app/libs/resume_and_cover_builder/structured_data.py
+import json
+from html import unescape
+from html.parser import HTMLParser
+from typing import Dict, List
+
+from loguru import logger
+
+from src.libs.resume_and_cover_builder.html_cleaner import html_to_text
+
+JOB_POSTING_TYPE = "JobPosting"
+MICRODATA_TEXT_ATTRIBUTES = {"meta": "content", "a": "href", "link": "href", "time": "datetime"}
+
+
+class _StructuredDataParser(HTMLParser):
+    """
+    Collects JSON-LD scripts and schema.org microdata items in one pass.
+    Microdata items are turned into JSON-LD-like dictionaries so both share the same mapping.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld: List[str] = []
+        self.microdata: List[dict] = []
+        self._script = None
+        # Stack of (tag, item, property) for the open elements that start an item or a property
+        self._stack = []
+        self._items = []
+        self._text_property = None
+        self._text_parts = []
+        # Elements with the same tag as the open text property, nested inside it
+        self._text_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if tag == "script" and (attributes.get("type") or "").lower() == "application/ld+json":
+            self._script = []
+            return
+        if self._text_property is not None and tag == self._stack[-1][0]:
+            self._text_depth += 1
+
+        item_property = attributes.get("itemprop")
+        if "itemscope" in attributes:
+            item = {"@type": (attributes.get("itemtype") or "").rstrip("/").rsplit("/", 1)[-1]}
+            if item_property and self._items:
+                self._items[-1].setdefault(item_property, item)
+            elif not self._items:
+                self.microdata.append(item)
+            self._items.append(item)
+            self._stack.append((tag, True, None))
+        elif item_property and self._items:
+            value = attributes.get(MICRODATA_TEXT_ATTRIBUTES.get(tag, ""))
+            if value is not None or tag in ("meta", "link"):
+                self._items[-1].setdefault(item_property, value or "")
+            elif self._text_property is None:
+                self._text_property = (self._items[-1], item_property)
+                self._text_parts = []
+                self._text_depth = 0
+                self._stack.append((tag, False, item_property))
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._script is not None:
+            self.json_ld.append("".join(self._script))
+            self._script = None
+            return
+        if not self._stack or self._stack[-1][0] != tag:
+            return
+        if self._text_property is not None and self._text_depth:
+            self._text_depth -= 1
+            return
+        _, is_item, item_property = self._stack.pop()
+        if is_item:
+            self._items.pop()
+        elif self._text_property is not None:
+            item, name = self._text_property
+            item.setdefault(name, " ".join("".join(self._text_parts).split()))
+            self._text_property = None
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+        elif self._text_property is not None:
+            self._text_parts.append(data)
+
+
+def _iter_nodes(node):
+    """
+    Walk a JSON-LD document, following @graph containers and lists.
+    """
+    if isinstance(node, list):
+        for child in node:
+            yield from _iter_nodes(child)
+    elif isinstance(node, dict):
+        yield node
+        if "@graph" in node:
+            yield from _iter_nodes(node["@graph"])
+
+
+def _is_job_posting(node: dict) -> bool:
+    node_type = node.get("@type")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return JOB_POSTING_TYPE in types
+
+
+def _text(value) -> str:
+    if isinstance(value, list):
+        return ", ".join(filter(None, (_text(v) for v in value)))
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("@value") or "")
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def _location(posting: dict) -> str:
+    locations = posting.get("jobLocation") or []
+    if not isinstance(locations, list):
+        locations = [locations]
+    formatted = []
+    for place in locations:
+        address = place.get("address", place) if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [_text(address.get(key)) for key in ("addressLocality", "addressRegion", "addressCountry")]
+            text = ", ".join(dict.fromkeys(part for part in parts if part))
+        else:
+            text = _text(address)
+        if text and text not in formatted:
+            formatted.append(text)
+    if str(posting.get("jobLocationType", "")).upper() == "TELECOMMUTE":
+        formatted.append("Remote")
+    return "; ".join(formatted)
+
+
+def _job_fields(posting: dict) -> Dict[str, str]:
+    description = _text(posting.get("description"))
+    if "&lt;" in description:
+        # Some boards HTML-escape the description twice
+        description = unescape(description)
+    fields = {
+        "role": _text(posting.get("title")),
+        "company": _text(posting.get("hiringOrganization")),
+        "location": _location(posting),
+        # JSON-LD descriptions are usually HTML
+        "description": html_to_text(description) if "<" in description else description,
+    }
+    return {field: value for field, value in fields.items() if value}
+
+
+def extract_job_posting(html: str) -> Dict[str, str]:
+    """
+    Extract the job fields published as structured data on a job page.
+    JSON-LD takes precedence over microdata. OpenGraph tags are not used: og:title is the page title
+    (role, company, location and site name together), not the role.
+    Args:
+        html (str): The page HTML, including the head where JSON-LD usually lives.
+    Returns:
+        Dict[str, str]: The fields found among role, company, location and description.
+    """
+    parser = _StructuredDataParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:
+        logger.warning(f"Could not parse structured data: {e}")
+        return {}
+
+    fields: Dict[str, str] = {}
+    postings = []
+    for script in parser.json_ld:
+        try:
+            document = json.loads(script.strip())
+        except ValueError:
+            logger.debug("Skipping invalid JSON-LD block")
+            continue
+        postings.extend(node for node in _iter_nodes(document) if _is_job_posting(node))
+    postings.extend(item for item in parser.microdata if _is_job_posting(item))
+
+    for posting in postings:
+        for field, value in _job_fields(posting).items():
+            fields.setdefault(field, value)
+
+    if fields:
+        logger.debug(f"Structured data provided job fields: {sorted(fields)}")
+    return fields
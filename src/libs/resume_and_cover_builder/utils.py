@@ -4,16 +4,15 @@ This module contains utility functions for the Resume and Cover Letter Builder s
 
 # app/libs/resume_and_cover_builder/utils.py
 import json
-import openai
-import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from langchain_core.messages.ai import AIMessage
 from langchain_core.prompt_values import StringPromptValue
 from langchain_openai import ChatOpenAI
 from .config import global_config
-from loguru import logger
-from requests.exceptions import HTTPError as HTTPStatusError
+import config as cfg
+from src.libs.retry_policy import RetryPolicy
+from src.libs.single_flight import SingleFlight, deserialize_message, llm_call_key, serialize_message
 
 
 class LLMLogger:
@@ -76,35 +75,28 @@ class LLMLogger:
 
 class LoggerChatModel:
 
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: ChatOpenAI, retry_policy: Optional[RetryPolicy] = None):
         self.llm = llm
+        self.retry_policy = retry_policy or RetryPolicy.default()
+        self.single_flight = SingleFlight.default() if cfg.LLM_SINGLE_FLIGHT else None
 
     def __call__(self, messages: List[Dict[str, str]]) -> str:
-        max_retries = 15
-        retry_delay = 10
-
-        for attempt in range(max_retries):
-            try:
-                reply = self.llm.invoke(messages)
-                parsed_reply = self.parse_llmresult(reply)
-                LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply)
-                return reply
-            except (openai.RateLimitError, HTTPStatusError) as err:
-                if isinstance(err, HTTPStatusError) and err.response.status_code == 429:
-                    logger.warning(f"HTTP 429 Too Many Requests: Waiting for {retry_delay} seconds before retrying (Attempt {attempt + 1}/{max_retries})...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    wait_time = self.parse_wait_time_from_error_message(str(err))
-                    logger.warning(f"Rate limit exceeded or API error. Waiting for {wait_time} seconds before retrying (Attempt {attempt + 1}/{max_retries})...")
-                    time.sleep(wait_time)
-            except Exception as e:
-                logger.error(f"Unexpected error occurred: {str(e)}, retrying in {retry_delay} seconds... (Attempt {attempt + 1}/{max_retries})")
-                time.sleep(retry_delay)
-                retry_delay *= 2
-
-        logger.critical("Failed to get a response from the model after multiple attempts.")
-        raise Exception("Failed to get a response from the model after multiple attempts.")
+        if self.single_flight is None:
+            return self._invoke(messages)
+        # Identical prompts in flight at the same time (e.g. resume and cover letter for one job) share a call
+        reply, _ = self.single_flight.do(
+            llm_call_key(self.llm, messages),
+            lambda: self._invoke(messages),
+            serialize=serialize_message,
+            deserialize=deserialize_message,
+        )
+        return reply
+
+    def _invoke(self, messages: List[Dict[str, str]]) -> str:
+        reply = self.retry_policy.call(self.llm.invoke, messages)
+        parsed_reply = self.parse_llmresult(reply)
+        LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply)
+        return reply
 
     def parse_llmresult(self, llmresult: AIMessage) -> Dict[str, Dict]:
         # Parse the LLM result into a structured format.
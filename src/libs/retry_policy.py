@@ -0,0 +1,205 @@
+"""
+Retry policy shared by the LLM wrappers.
+
+Failed calls are retried with full-jitter exponential backoff inside a per-call deadline.
+Errors are classified as retryable (rate limits, timeouts, 5xx, connection problems) or
+fatal (bad requests, authentication, exhausted quota, programming errors). Optionally a
+duplicate request is fired when a call runs past the observed p95 latency, and whichever
+reply arrives first is used.
+"""
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+import config as cfg
+from src.logging import logger
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+FATAL_EXCEPTION_TYPES = (AttributeError, KeyError, NotImplementedError, TypeError, ValueError)
+FATAL_MESSAGE_MARKERS = ("insufficient_quota", "invalid_api_key", "context_length_exceeded")
+WAIT_TIME_REGEX = re.compile(r"(?:try again|retry) in\s*(\d+(?:\.\d+)?)\s*(ms|s|sec|seconds?)\b", re.IGNORECASE)
+
+
+class RetryError(Exception):
+    """Raised when a call keeps failing until the attempt or deadline budget is spent."""
+    pass
+
+
+class RetryPolicy:
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_attempts: int = cfg.LLM_RETRY_MAX_ATTEMPTS,
+        base_delay: float = cfg.LLM_RETRY_BASE_DELAY,
+        max_delay: float = cfg.LLM_RETRY_MAX_DELAY,
+        deadline: Optional[float] = cfg.LLM_RETRY_DEADLINE,
+        hedge: bool = cfg.LLM_HEDGE_REQUESTS,
+        hedge_percentile: float = cfg.LLM_HEDGE_PERCENTILE,
+        hedge_min_samples: int = cfg.LLM_HEDGE_MIN_SAMPLES,
+    ):
+        """
+        Initialize the retry policy.
+        Args:
+            max_attempts (int): Maximum number of attempts per call.
+            base_delay (float): Backoff ceiling in seconds for the first retry; doubled on every retry.
+            max_delay (float): Upper bound of the backoff ceiling in seconds.
+            deadline (float): Total time budget in seconds for one call including retries, None for no limit.
+            hedge (bool): Whether to fire a duplicate request when a call is slower than usual.
+            hedge_percentile (float): Latency percentile after which the duplicate request is fired.
+            hedge_min_samples (int): Number of observed latencies needed before hedging starts.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=256)
+        self._latencies_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(thread_name_prefix="llm-hedge") if hedge else None
+
+    @classmethod
+    def default(cls) -> "RetryPolicy":
+        """
+        Process-wide policy built from config.py, so latency statistics are shared by all LLM wrappers.
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def _status_code(error: Exception) -> Optional[int]:
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            response = getattr(error, "response", None)
+            status_code = getattr(response, "status_code", None)
+        return status_code if isinstance(status_code, int) else None
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Decide whether an error is worth retrying.
+        """
+        message = str(error)
+        if any(marker in message for marker in FATAL_MESSAGE_MARKERS):
+            return False
+        status_code = self._status_code(error)
+        if status_code is not None:
+            return status_code in RETRYABLE_STATUS_CODES
+        if isinstance(error, FATAL_EXCEPTION_TYPES):
+            return False
+        # Timeouts, dropped connections and unknown provider errors
+        return True
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """
+        Server-provided wait time in seconds, from the Retry-After headers or the error message.
+        """
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000.0
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except (TypeError, ValueError):
+            pass
+        match = WAIT_TIME_REGEX.search(str(error))
+        if match:
+            value = float(match.group(1))
+            return value / 1000.0 if match.group(2).lower() == "ms" else value
+        return None
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff: a random delay between 0 and the capped exponential ceiling.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _record_latency(self, latency: float) -> None:
+        with self._latencies_lock:
+            self._latencies.append(latency)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Latency percentile after which a duplicate request is fired, or None if hedging is off
+        or not enough calls have been observed yet.
+        """
+        if not self.hedge:
+            return None
+        with self._latencies_lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[int(self.hedge_percentile * (len(latencies) - 1))]
+
+    def _call_once(self, fn: Callable, remaining: Optional[float], *args, **kwargs) -> Any:
+        start = time.monotonic()
+        hedge_delay = self.hedge_delay()
+        if hedge_delay is None:
+            result = fn(*args, **kwargs)
+            self._record_latency(time.monotonic() - start)
+            return result
+
+        pending = {self._executor.submit(fn, *args, **kwargs)}
+        done, pending = wait(pending, timeout=hedge_delay)
+        if not done and (remaining is None or remaining > hedge_delay):
+            logger.debug(f"Call slower than p{int(self.hedge_percentile * 100)} ({hedge_delay:.1f}s), sending a hedged request")
+            pending.add(self._executor.submit(fn, *args, **kwargs))
+
+        error = None
+        while pending or done:
+            for future in done:
+                if future.exception() is None:
+                    self._record_latency(time.monotonic() - start)
+                    return future.result()
+                error = future.exception()
+            if not pending:
+                break
+            timeout = None if remaining is None else max(0.0, remaining - (time.monotonic() - start))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"No reply within the {self.deadline} seconds deadline")
+        raise error
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Call fn(*args, **kwargs), retrying according to the policy.
+        Raises:
+            Exception: The original error if it is fatal.
+            RetryError: If the attempt or deadline budget is exhausted.
+        """
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            remaining = None if self.deadline is None else self.deadline - (time.monotonic() - start)
+            try:
+                return self._call_once(fn, remaining, *args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                if not self.is_retryable(e):
+                    logger.error(f"Non-retryable error: {e}")
+                    raise
+                if attempt >= self.max_attempts:
+                    logger.critical(f"Giving up after {attempt} attempts: {e}")
+                    raise RetryError(f"Failed to get a response after {attempt} attempts: {e}") from e
+
+                wait_time = self.retry_after(e)
+                if wait_time is None:
+                    wait_time = self.backoff(attempt - 1)
+                elapsed = time.monotonic() - start
+                if self.deadline is not None and elapsed + wait_time >= self.deadline:
+                    logger.critical(f"Deadline of {self.deadline} seconds exhausted after {attempt} attempts: {e}")
+                    raise RetryError(f"Deadline of {self.deadline} seconds exhausted after {attempt} attempts: {e}") from e
+
+                logger.warning(
+                    f"Retryable error: {e}. Waiting {wait_time:.1f} seconds before retrying (Attempt {attempt}/{self.max_attempts})..."
+                )
+                time.sleep(wait_time)
@@ -0,0 +1,296 @@
+"""
+Single-flight deduplication of identical concurrent calls.
+
+Concurrent callers that ask for the same key share one in-flight call and its result.
+Inside a process this is done with futures; across processes (e.g. several workers of a
+process pool) the leader holds a lock file, and the other processes register a wait marker
+and wait for the result instead of repeating the call. The leader only publishes its result
+to disk when a marker exists, and the last waiter to read it removes it.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+import config as cfg
+from src.logging import logger
+
+
+def _model_name(llm: Any) -> str:
+    """
+    Find the model name of a chat model, unwrapping adapters such as AIAdapter -> AIModel -> ChatX.
+    """
+    current = llm
+    for _ in range(3):
+        for attribute in ("model_name", "model"):
+            value = getattr(current, attribute, None)
+            if isinstance(value, str):
+                return value
+        current = getattr(current, "model", None)
+        if current is None:
+            break
+    return type(llm).__name__
+
+
+def _chat_model(llm: Any) -> Any:
+    """
+    Unwrap adapters such as AIAdapter -> AIModel -> ChatX down to the LangChain model, or None if there is none.
+    """
+    current = llm
+    for _ in range(4):
+        if hasattr(current, "_default_params") or hasattr(current, "_identifying_params"):
+            return current
+        current = getattr(current, "chatmodel", None) or getattr(current, "model", None)
+        if current is None or isinstance(current, str):
+            break
+    return None
+
+
+def _invocation_params(llm: Any) -> str:
+    """
+    Parameters sent with every request of the model (temperature, max tokens, context size, ...), as sorted JSON.
+    """
+    model = _chat_model(llm)
+    if model is None:
+        return ""
+    params = {}
+    for attribute in ("_identifying_params", "_default_params"):
+        try:
+            params.update(getattr(model, attribute, None) or {})
+        except Exception as e:
+            logger.debug(f"Could not read {attribute} of {type(model).__name__}: {e}")
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _prompt_text(messages: Any) -> str:
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    if isinstance(messages, (list, tuple)):
+        return "\n".join(f"{getattr(m, 'type', '')}: {getattr(m, 'content', m)}" for m in messages)
+    return str(messages)
+
+
+def llm_call_key(llm: Any, messages: Any) -> str:
+    """
+    Hash identifying an LLM request by model, invocation parameters and prompt, so calls that differ
+    only in e.g. temperature do not share a reply.
+    """
+    return SingleFlight.key(_model_name(llm), _invocation_params(llm), _prompt_text(messages))
+
+
+def serialize_message(message: BaseMessage) -> dict:
+    return message_to_dict(message)
+
+
+def deserialize_message(data: dict) -> BaseMessage:
+    return messages_from_dict([data])[0]
+
+
+class SingleFlight:
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        lock_dir: Optional[str] = cfg.LLM_SINGLE_FLIGHT_DIR,
+        result_ttl: float = cfg.LLM_SINGLE_FLIGHT_RESULT_TTL,
+        lock_timeout: float = cfg.LLM_SINGLE_FLIGHT_LOCK_TIMEOUT,
+        poll_interval: float = 0.2,
+    ):
+        """
+        Initialize the single-flight group.
+        Args:
+            lock_dir (str): Directory for lock and result files shared between processes, None for in-process only.
+            result_ttl (float): Seconds after which a published result nobody removed (e.g. its waiter crashed) is deleted.
+            lock_timeout (float): Seconds after which a lock file is considered abandoned.
+            poll_interval (float): Seconds between checks while waiting on another process.
+        """
+        self.lock_dir = Path(lock_dir) if lock_dir else None
+        if self.lock_dir is not None:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.result_ttl = result_ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._calls: dict[str, Future] = {}
+        self._calls_lock = threading.Lock()
+        if self.lock_dir is not None:
+            self._sweep()
+
+    @classmethod
+    def default(cls) -> "SingleFlight":
+        """
+        Process-wide group built from config.py, shared by all LLM wrappers.
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        serialize: Callable[[Any], Any] = lambda value: value,
+        deserialize: Callable[[Any], Any] = lambda value: value,
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn() unless an identical call is already in flight, in which case wait for its result.
+        Args:
+            key (str): Identity of the call, usually SingleFlight.key(model, prompt).
+            fn (Callable): The call to make.
+            serialize (Callable): Turns the result into JSON-serializable data for other processes.
+            deserialize (Callable): Inverse of serialize.
+        Returns:
+            tuple: The result and whether it was shared from another caller.
+        """
+        with self._calls_lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            logger.debug(f"Joining in-flight call {key[:12]}")
+            return future.result(), True
+
+        try:
+            result, shared = self._do_across_processes(key, fn, serialize, deserialize)
+            future.set_result(result)
+            return result, shared
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._calls_lock:
+                self._calls.pop(key, None)
+
+    def _do_across_processes(self, key, fn, serialize, deserialize) -> Tuple[Any, bool]:
+        if self.lock_dir is None:
+            return fn(), False
+
+        lock_path = self.lock_dir / f"{key}.lock"
+        result_path = self.lock_dir / f"{key}.json"
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                # Only a result published after the lock we waited on was taken belongs to that call
+                try:
+                    locked_at = lock_path.stat().st_mtime
+                except OSError:
+                    continue
+                # The marker tells the holder someone needs the result on disk
+                wait_path = self.lock_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.wait"
+                shared = None
+                try:
+                    wait_path.touch()
+                    if self._wait_for_lock(lock_path):
+                        shared = self._read_result(result_path, deserialize, locked_at)
+                except OSError as e:
+                    logger.debug(f"Could not wait on single-flight call {key[:12]}: {e}")
+                finally:
+                    self._stop_waiting(key, wait_path, result_path)
+                if shared is not None:
+                    logger.debug(f"Using result of call {key[:12]} made by another process")
+                    return shared, True
+                continue
+            except OSError as e:
+                logger.warning(f"Single-flight lock unavailable, calling directly: {e}")
+                return fn(), False
+
+            try:
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                result = fn()
+                if self._has_waiters(key):
+                    self._write_result(result_path, serialize(result))
+                return result, False
+            finally:
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+
+    def _wait_for_lock(self, lock_path: Path) -> bool:
+        """
+        Wait until another process releases the lock, breaking it if it looks abandoned.
+        Returns:
+            bool: Whether the lock was released by its holder, rather than broken as abandoned.
+        """
+        while lock_path.exists():
+            try:
+                if time.time() - lock_path.stat().st_mtime > self.lock_timeout:
+                    logger.warning(f"Removing stale single-flight lock {lock_path.name}")
+                    os.remove(lock_path)
+                    return False
+            except OSError:
+                break
+            time.sleep(self.poll_interval)
+        return True
+
+    def _has_waiters(self, key: str) -> bool:
+        return any(self.lock_dir.glob(f"{key}.*.wait"))
+
+    def _stop_waiting(self, key: str, wait_path: Path, result_path: Path) -> None:
+        """
+        Remove the wait marker; the last waiter also removes the result, so replies do not stay on disk.
+        """
+        try:
+            os.remove(wait_path)
+        except OSError:
+            pass
+        if not self._has_waiters(key):
+            try:
+                os.remove(result_path)
+            except OSError:
+                pass
+
+    def _read_result(self, result_path: Path, deserialize, published_after: float) -> Any:
+        try:
+            if result_path.stat().st_mtime < published_after:
+                return None
+            with open(result_path, "r", encoding="utf-8") as f:
+                return deserialize(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, result_path: Path, data: Any) -> None:
+        """
+        Publish a result for the processes waiting on the call.
+        """
+        temp_path = result_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, result_path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not publish single-flight result: {e}")
+        self._sweep()
+
+    def _sweep(self) -> None:
+        """
+        Remove the results and wait markers left behind by processes that died while waiting.
+        """
+        now = time.time()
+        for pattern, max_age in (("*.json", self.result_ttl), ("*.wait", self.lock_timeout)):
+            for path in self.lock_dir.glob(pattern):
+                try:
+                    if now - path.stat().st_mtime > max_age:
+                        os.remove(path)
+                except OSError:
+                    pass
@@ -1,13 +1,22 @@
+import base64
+import io
 import os
 import time
+from pathlib import Path
+from typing import Callable
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager  # Import webdriver_manager
 import urllib
+import config as cfg
 from src.logging import logger
+from src.utils.chromedriver_cache import resolve_chromedriver
 
 def chrome_browser_options():
+    """
+    General profile of a visible, incognito browser window.
+    """
     logger.debug("Setting Chrome browser options")
     options = Options()
     options.add_argument("--start-maximized")
@@ -35,12 +44,64 @@ def chrome_browser_options():
     
     return options
 
-def init_browser() -> webdriver.Chrome:
+def chrome_scraping_options():
+    """
+    Profile of the browser that loads job pages to read their text. driver.get returns once the
+    DOM is parsed and the page readiness checks decide when the content is there, so the CDP
+    Network events they watch are kept in the performance log. Images are not needed for the text.
+    """
+    options = chrome_browser_options()
+    options.page_load_strategy = "eager"
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    # CDP Network events in the performance log, used to detect when a page's network is idle
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+def chrome_render_options(slot: int = 0):
+    """
+    Minimal profile of the headless browsers that only render our own HTML to PDF.
+    Printing needs no window, GPU compositing, extensions or background services, and the page
+    size comes from the print options, so the viewport is kept small. Not incognito, so that
+    fonts and stylesheets the document still loads remotely come from a disk cache. Chrome
+    instances cannot share a disk cache, so each render pool slot has its own.
+    Args:
+        slot (int): Index of the render pool slot the browser runs in.
+    """
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-component-extensions-with-background-pages")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--disable-breakpad")
+    options.add_argument("--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication")
+    options.add_argument("--metrics-recording-only")
+    options.add_argument("--no-first-run")
+    options.add_argument("--no-default-browser-check")
+    options.add_argument("--mute-audio")
+    options.add_argument("--hide-scrollbars")
+    options.add_argument(f"--window-size={cfg.RENDER_WINDOW_SIZE}")
+    options.add_argument(f"--disk-cache-dir={(Path(cfg.RENDER_DISK_CACHE_DIR) / f'slot-{slot}').resolve()}")
+    options.add_argument("--allow-file-access-from-files")  # Consente l'accesso ai file locali
+    return options
+
+def init_browser(options=None) -> webdriver.Chrome:
     try:
-        options = chrome_browser_options()
-        # Use webdriver_manager to handle ChromeDriver
-        driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
-        logger.debug("Chrome browser initialized successfully.")
+        options = options or chrome_browser_options()
+        start = time.perf_counter()
+        # ChromeDriver path from the resolution cache, webdriver_manager is only called on a miss
+        driver_path = resolve_chromedriver()
+        resolved = time.perf_counter()
+        driver = webdriver.Chrome(service=ChromeService(driver_path), options=options)
+        logger.debug(
+            f"Chrome browser initialized successfully: driver resolved in {(resolved - start) * 1000:.0f} ms, "
+            f"launched in {(time.perf_counter() - resolved) * 1000:.0f} ms"
+        )
         return driver
     except Exception as e:
         logger.error(f"Failed to initialize browser: {str(e)}")
@@ -48,46 +109,183 @@ def init_browser() -> webdriver.Chrome:
 
 
 
-def HTML_to_PDF(html_content, driver):
+def load_html_data_url(driver, html_content: str) -> None:
     """
-    Converte una stringa HTML in un PDF e restituisce il PDF come stringa base64.
+    Load an HTML document as a percent-encoded data: URL.
+    """
+    driver.get(f"data:text/html;charset=utf-8,{urllib.parse.quote(html_content)}")
 
-    :param html_content: Stringa contenente il codice HTML da convertire.
-    :param driver: Istanza del WebDriver di Selenium.
-    :return: Stringa base64 del PDF generato.
-    :raises ValueError: Se l'input HTML non è una stringa valida.
-    :raises RuntimeError: Se si verifica un'eccezione nel WebDriver.
+def load_html(driver, html_content: str) -> None:
+    """
+    Replace the document of the current tab with the given HTML through CDP Page.setDocumentContent,
+    which avoids percent-encoding the whole document into a data: URL (1.5x the size for mostly
+    ASCII markup, up to 3x for non-ASCII text) and the URL length limits that come with it.
+    Falls back to the data: URL when the command is not available.
+    """
+    try:
+        frame_id = driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+        driver.execute_cdp_cmd("Page.setDocumentContent", {"frameId": frame_id, "html": html_content})
+    except (WebDriverException, KeyError) as e:
+        logger.debug(f"Page.setDocumentContent unavailable, loading a data URL instead: {e}")
+        load_html_data_url(driver, html_content)
+
+# Resolves once the load event fired, web fonts are loaded and every image is decoded
+RENDER_COMPLETE_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const loaded = document.readyState === "complete"
+    ? Promise.resolve()
+    : new Promise(resolve => window.addEventListener("load", resolve, {once: true}));
+loaded
+    .then(() => Promise.all([
+        document.fonts ? document.fonts.ready : null,
+        ...Array.from(document.images, img => img.decode ? img.decode().catch(() => null) : null),
+    ]))
+    .then(() => done(performance.now() - start), () => done(performance.now() - start));
+"""
+
+def wait_for_render_complete(driver, max_wait: float = cfg.RENDER_MAX_WAIT) -> bool:
+    """
+    Wait until the loaded document is ready to print: load event, fonts and image decoding.
+    Gives up after max_wait seconds and lets the caller print what is there.
+    Returns:
+        bool: Whether the document completed within max_wait.
+    """
+    driver.set_script_timeout(max_wait)
+    try:
+        waited_ms = driver.execute_async_script(RENDER_COMPLETE_SCRIPT)
+        logger.debug(f"Document ready to print after {waited_ms:.0f} ms")
+        return True
+    except TimeoutException:
+        logger.warning(f"Document not ready after {max_wait}s, printing it as it is")
+        return False
+
+# Opzioni di stampa CDP Page.printToPDF
+PDF_PRINT_OPTIONS = {
+    "printBackground": True,          # Includi lo sfondo nella stampa
+    "landscape": False,               # Stampa in verticale (False per ritratto)
+    "paperWidth": 8.27,               # Larghezza del foglio in pollici (A4)
+    "paperHeight": 11.69,             # Altezza del foglio in pollici (A4)
+    "marginTop": 0.8,                  # Margine superiore in pollici (circa 2 cm)
+    "marginBottom": 0.8,               # Margine inferiore in pollici (circa 2 cm)
+    "marginLeft": 0.5,                 # Margine sinistro in pollici (circa 1.27 cm)
+    "marginRight": 0.5,                # Margine destro in pollici (circa 1.27 cm)
+    "displayHeaderFooter": False,      # Non visualizzare intestazioni e piè di pagina
+    "preferCSSPageSize": True,         # Preferire le dimensioni della pagina CSS
+    "generateDocumentOutline": False,  # Non generare un sommario del documento
+    "generateTaggedPDF": False,        # Non generare PDF taggato
+}
+PDF_STREAM_CHUNK_SIZE = 1024 * 1024
+
+def _render_pdf(html_content, driver, write: Callable[[bytes], object], max_wait: float) -> int:
+    """
+    Render the HTML and stream the PDF to write() in chunks, using printToPDF with ReturnAsStream
+    and CDP IO.read, so the whole document never sits in memory as one base64 string.
+    Returns:
+        int: The size of the PDF in bytes.
     """
     # Validazione del contenuto HTML
     if not isinstance(html_content, str) or not html_content.strip():
         raise ValueError("Il contenuto HTML deve essere una stringa non vuota.")
 
-    # Codifica l'HTML in un URL di tipo data
-    encoded_html = urllib.parse.quote(html_content)
-    data_url = f"data:text/html;charset=utf-8,{encoded_html}"
-
     try:
-        driver.get(data_url)
-        # Attendi che la pagina si carichi completamente
-        time.sleep(2)  # Potrebbe essere necessario aumentare questo tempo per HTML complessi
+        start = time.monotonic()
+        load_html(driver, html_content)
+        loaded = time.monotonic()
+        wait_for_render_complete(driver, max_wait)
+        ready = time.monotonic()
 
         # Esegue il comando CDP per stampare la pagina in PDF
-        pdf_base64 = driver.execute_cdp_cmd("Page.printToPDF", {
-            "printBackground": True,          # Includi lo sfondo nella stampa
-            "landscape": False,               # Stampa in verticale (False per ritratto)
-            "paperWidth": 8.27,               # Larghezza del foglio in pollici (A4)
-            "paperHeight": 11.69,             # Altezza del foglio in pollici (A4)
-            "marginTop": 0.8,                  # Margine superiore in pollici (circa 2 cm)
-            "marginBottom": 0.8,               # Margine inferiore in pollici (circa 2 cm)
-            "marginLeft": 0.5,                 # Margine sinistro in pollici (circa 1.27 cm)
-            "marginRight": 0.5,                # Margine destro in pollici (circa 1.27 cm)
-            "displayHeaderFooter": False,      # Non visualizzare intestazioni e piè di pagina
-            "preferCSSPageSize": True,         # Preferire le dimensioni della pagina CSS
-            "generateDocumentOutline": False,  # Non generare un sommario del documento
-            "generateTaggedPDF": False,        # Non generare PDF taggato
-            "transferMode": "ReturnAsBase64"   # Restituire il PDF come stringa base64
-        })
-        return pdf_base64['data']
+        stream = driver.execute_cdp_cmd("Page.printToPDF", {**PDF_PRINT_OPTIONS, "transferMode": "ReturnAsStream"})["stream"]
+        size = 0
+        try:
+            while True:
+                chunk = driver.execute_cdp_cmd("IO.read", {"handle": stream, "size": PDF_STREAM_CHUNK_SIZE})
+                data = base64.b64decode(chunk["data"]) if chunk.get("base64Encoded") else chunk["data"].encode("latin-1")
+                write(data)
+                size += len(data)
+                if chunk.get("eof"):
+                    break
+        finally:
+            driver.execute_cdp_cmd("IO.close", {"handle": stream})
+        done = time.monotonic()
+        logger.debug(
+            f"Rendered {len(html_content)} characters to a {size} bytes PDF in {done - start:.2f}s "
+            f"(load {loaded - start:.2f}s, ready {ready - loaded:.2f}s, print {done - ready:.2f}s)"
+        )
+        return size
     except Exception as e:
         logger.error(f"Si è verificata un'eccezione WebDriver: {e}")
         raise RuntimeError(f"Si è verificata un'eccezione WebDriver: {e}")
+
+def HTML_to_PDF_file(html_content, driver, output_path, max_wait: float = cfg.RENDER_MAX_WAIT) -> Path:
+    """
+    Render the HTML to a PDF file. The PDF is streamed to a temporary file next to output_path,
+    which is renamed over output_path once complete, so a failed render never leaves a truncated file.
+
+    :param html_content: The HTML to render.
+    :param driver: Selenium WebDriver.
+    :param output_path: Destination of the PDF.
+    :param max_wait: Maximum seconds to wait for fonts and images before printing.
+    :return: The path of the PDF.
+    :raises ValueError: If the HTML is not a non-empty string.
+    :raises RuntimeError: If the WebDriver fails.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            _render_pdf(html_content, driver, f.write, max_wait)
+        os.replace(temp_path, output_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return output_path
+
+def HTML_to_PDF_bytes(html_content, driver, max_wait: float = cfg.RENDER_MAX_WAIT) -> bytes:
+    """
+    Render the HTML to a PDF held in memory.
+
+    :return: The PDF content.
+    """
+    buffer = io.BytesIO()
+    _render_pdf(html_content, driver, buffer.write, max_wait)
+    return buffer.getvalue()
+
+def capture_page_thumbnail(driver, output_path, scale: float = cfg.RENDER_THUMBNAIL_SCALE) -> Path:
+    """
+    Save a PNG of the first page of the document currently loaded, e.g. right after rendering it to PDF.
+    Uses CDP Page.captureScreenshot clipped to one page of the print paper size, beyond the small viewport.
+
+    :param driver: Selenium WebDriver with the document loaded.
+    :param output_path: Destination of the PNG.
+    :param scale: Scale of the thumbnail relative to the page at 96 DPI.
+    :return: The path of the PNG.
+    """
+    clip = {
+        "x": 0,
+        "y": 0,
+        "width": PDF_PRINT_OPTIONS["paperWidth"] * 96,
+        "height": PDF_PRINT_OPTIONS["paperHeight"] * 96,
+        "scale": scale,
+    }
+    screenshot = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png", "clip": clip, "captureBeyondViewport": True})
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(base64.b64decode(screenshot["data"]))
+    return output_path
+
+def HTML_to_PDF(html_content, driver, max_wait: float = cfg.RENDER_MAX_WAIT):
+    """
+    Converte una stringa HTML in un PDF e restituisce il PDF come stringa base64.
+    Prefer HTML_to_PDF_file or HTML_to_PDF_bytes, which avoid the base64 copy.
+
+    :param html_content: Stringa contenente il codice HTML da convertire.
+    :param driver: Istanza del WebDriver di Selenium.
+    :param max_wait: Maximum seconds to wait for fonts and images before printing.
+    :return: Stringa base64 del PDF generato.
+    :raises ValueError: Se l'input HTML non è una stringa valida.
+    :raises RuntimeError: Se si verifica un'eccezione nel WebDriver.
+    """
+    return base64.b64encode(HTML_to_PDF_bytes(html_content, driver, max_wait)).decode("ascii")
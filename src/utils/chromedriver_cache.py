@@ -0,0 +1,111 @@
+"""
+Cache of the resolved ChromeDriver binary.
+
+ChromeDriverManager().install() probes the browser version and may query the driver registry
+before every launch, and fails when offline. The resolved driver path is recorded together with
+the Chrome version it was resolved for, and the driver's SHA-256, size and mtime; later launches only
+probe the installed Chrome version and stat the driver. The driver is hashed again only when its size
+or mtime changed.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+import config as cfg
+from src.logging import logger
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChromeDriverCache:
+    _lock = threading.Lock()
+
+    def __init__(self, cache_file: str = cfg.CHROMEDRIVER_CACHE_FILE):
+        """
+        Args:
+            cache_file (str): JSON file recording the resolved driver.
+        """
+        self.cache_file = Path(cache_file)
+
+    @staticmethod
+    def chrome_version() -> Optional[str]:
+        """
+        Version of the installed Chrome, probed the same way webdriver_manager does it.
+        """
+        try:
+            return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        except Exception as e:
+            logger.debug(f"Could not probe the Chrome version: {e}")
+            return None
+
+    def _load(self) -> Optional[dict]:
+        try:
+            return json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, entry: dict) -> None:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_file.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+        temp_path.replace(self.cache_file)
+
+    @staticmethod
+    def _driver_entry(driver_path: str) -> dict:
+        stat = Path(driver_path).stat()
+        return {"driver_path": driver_path, "sha256": _sha256(Path(driver_path)), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def _driver_intact(self, entry: dict) -> bool:
+        path = Path(entry.get("driver_path", ""))
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if stat.st_size == entry.get("size") and stat.st_mtime == entry.get("mtime"):
+            return True
+        # Touched or replaced since it was recorded: only the checksum can tell
+        if _sha256(path) != entry.get("sha256"):
+            return False
+        self._save({**entry, "size": stat.st_size, "mtime": stat.st_mtime})
+        return True
+
+    def resolve(self) -> str:
+        """
+        Return the path of a ChromeDriver matching the installed Chrome, calling the manager only on a cache miss.
+        If the manager fails (e.g. offline), an intact cached driver is used even if it was resolved for another Chrome version.
+        """
+        with self._lock:
+            entry = self._load()
+            chrome_version = self.chrome_version()
+            if entry and self._driver_intact(entry):
+                if chrome_version is None or chrome_version == entry.get("chrome_version"):
+                    logger.debug(f"Using cached ChromeDriver {entry['driver_path']} for Chrome {entry.get('chrome_version')}")
+                    return entry["driver_path"]
+                logger.debug(f"Chrome changed from {entry.get('chrome_version')} to {chrome_version}, resolving ChromeDriver again")
+            try:
+                driver_path = ChromeDriverManager().install()
+            except Exception as e:
+                if entry and self._driver_intact(entry):
+                    logger.warning(f"ChromeDriver resolution failed ({e}), using the cached driver for Chrome {entry.get('chrome_version')}")
+                    return entry["driver_path"]
+                raise
+            self._save({**self._driver_entry(driver_path), "chrome_version": chrome_version})
+            return driver_path
+
+
+def resolve_chromedriver() -> str:
+    """
+    Path of the ChromeDriver to launch Chrome with, from the driver resolution cache.
+    """
+    return ChromeDriverCache().resolve()
@@ -0,0 +1,265 @@
+"""
+Readiness detection for pages loaded in Selenium.
+
+Instead of a fixed implicit wait, a page is considered ready once a sequence of checks pass:
+document.readyState is "complete", then either a known content selector for the site is present,
+or the network has gone idle and the DOM has stopped changing. Every check has its own timeout
+budget and reports how long it actually waited.
+"""
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from src.logging import logger
+
+# CSS selectors of the job description container on common job boards
+SITE_SELECTORS: Dict[str, str] = {
+    "linkedin.com": ".jobs-description__content, .description__text, .show-more-less-html__markup",
+    "indeed.com": "#jobDescriptionText",
+    "glassdoor.com": "[class*='JobDetails_jobDescription'], #JobDescriptionContainer",
+    "greenhouse.io": "#content, .job__description, #app_body",
+    "lever.co": ".posting-page .section-wrapper, .posting-description",
+    "myworkdayjobs.com": "[data-automation-id='jobPostingDescription']",
+    "smartrecruiters.com": ".job-sections, [itemprop='description']",
+    "ashbyhq.com": "[class*='_descriptionText'], ._description_",
+}
+
+DOM_QUIESCENCE_SCRIPT = """
+const quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+let quietTimer = null, limitTimer = null;
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+function finish(quiet) {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(limitTimer);
+    done(quiet);
+}
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+quietTimer = setTimeout(() => finish(true), quietMs);
+limitTimer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+
+@dataclass
+class ReadinessReport:
+    strategy: str
+    ready: bool
+    waited: float
+
+
+class ReadinessStrategy(ABC):
+    name = "strategy"
+
+    def __init__(self, timeout: float, poll_interval: float = 0.1):
+        """
+        Args:
+            timeout (float): Maximum seconds this check may wait.
+            poll_interval (float): Seconds between polls.
+        """
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def before_navigation(self, driver) -> None:
+        """
+        Hook called before the page is requested, e.g. to start collecting events.
+        """
+        pass
+
+    @abstractmethod
+    def wait(self, driver, url: str, timeout: float) -> bool:
+        """
+        Wait until the check passes or the timeout expires.
+        Returns:
+            bool: Whether the check passed.
+        """
+        pass
+
+    def run(self, driver, url: str, budget: float) -> ReadinessReport:
+        timeout = min(self.timeout, budget)
+        start = time.monotonic()
+        try:
+            ready = self.wait(driver, url, timeout) if timeout > 0 else False
+        except WebDriverException as e:
+            logger.debug(f"Readiness check {self.name} failed: {e}")
+            ready = False
+        return ReadinessReport(self.name, ready, time.monotonic() - start)
+
+
+class DocumentReadyState(ReadinessStrategy):
+    name = "ready_state"
+
+    def wait(self, driver, url, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            if driver.execute_script("return document.readyState") == "complete":
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+
+class SiteSelector(ReadinessStrategy):
+    """
+    Waits for the job description container of known job boards to hold text.
+    """
+    name = "site_selector"
+
+    def __init__(self, timeout: float, selectors: Dict[str, str] = None, poll_interval: float = 0.1):
+        super().__init__(timeout, poll_interval)
+        self.selectors = SITE_SELECTORS if selectors is None else selectors
+
+    def selector_for(self, url: str) -> Optional[str]:
+        host = urlparse(url).netloc.lower()
+        for domain, selector in self.selectors.items():
+            if host == domain or host.endswith("." + domain):
+                return selector
+        return None
+
+    def wait(self, driver, url, timeout):
+        selector = self.selector_for(url)
+        if selector is None:
+            return False
+        deadline = time.monotonic() + timeout
+        while True:
+            if any(element.text.strip() for element in driver.find_elements(By.CSS_SELECTOR, selector)):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+
+class NetworkIdle(ReadinessStrategy):
+    """
+    Waits until at most max_in_flight requests are pending for idle_time seconds; a couple are allowed
+    because long-polling and analytics connections may never finish.
+    Requests are tracked from the CDP Network events in Chrome's performance log, which needs the
+    goog:loggingPrefs capability set by chrome_scraping_options. Without it, the number of entries in
+    the page's resource timing buffer has to stop growing instead.
+    """
+    name = "network_idle"
+
+    def __init__(self, timeout: float, idle_time: float = 0.5, max_in_flight: int = 2, poll_interval: float = 0.1):
+        super().__init__(timeout, poll_interval)
+        self.idle_time = idle_time
+        self.max_in_flight = max_in_flight
+        self._in_flight = set()
+
+    def before_navigation(self, driver):
+        self._in_flight = set()
+        try:
+            driver.get_log("performance")  # Drop the events of the previous page
+        except WebDriverException:
+            pass
+
+    def _update_in_flight(self, driver) -> None:
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method", "")
+            request_id = message.get("params", {}).get("requestId")
+            if method == "Network.requestWillBeSent":
+                self._in_flight.add(request_id)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self._in_flight.discard(request_id)
+
+    def _resource_count(self, driver) -> int:
+        return driver.execute_script("return performance.getEntriesByType('resource').length")
+
+    def wait(self, driver, url, timeout):
+        deadline = time.monotonic() + timeout
+        try:
+            self._update_in_flight(driver)
+            use_log = True
+        except WebDriverException:
+            use_log = False
+
+        idle_since = None
+        last_count = None
+        while True:
+            now = time.monotonic()
+            if use_log:
+                self._update_in_flight(driver)
+                idle = len(self._in_flight) <= self.max_in_flight
+            else:
+                count = self._resource_count(driver)
+                idle = count == last_count
+                last_count = count
+            if not idle:
+                idle_since = None
+            elif idle_since is None:
+                idle_since = now
+            elif now - idle_since >= self.idle_time:
+                return True
+            if now >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+
+class DomQuiescence(ReadinessStrategy):
+    """
+    Waits until no DOM mutation has happened for quiet_time seconds, using a MutationObserver in the page.
+    """
+    name = "dom_quiescence"
+
+    def __init__(self, timeout: float, quiet_time: float = 0.5):
+        super().__init__(timeout)
+        self.quiet_time = quiet_time
+
+    def wait(self, driver, url, timeout):
+        driver.set_script_timeout(timeout + 5)
+        return bool(driver.execute_async_script(DOM_QUIESCENCE_SCRIPT, int(self.quiet_time * 1000), int(timeout * 1000)))
+
+
+class PageReadiness:
+    """
+    Runs the readiness checks for a page within a total time budget.
+    """
+
+    def __init__(self, budget: float = 10, strategies: List[ReadinessStrategy] = None):
+        """
+        Args:
+            budget (float): Maximum seconds spent waiting across all checks.
+            strategies (list): Checks to run; defaults to ready state, site selector, network idle and DOM quiescence.
+        """
+        self.budget = budget
+        self.strategies = strategies if strategies is not None else [
+            DocumentReadyState(timeout=budget),
+            SiteSelector(timeout=budget / 2),
+            NetworkIdle(timeout=budget / 2),
+            DomQuiescence(timeout=budget / 4),
+        ]
+
+    def before_navigation(self, driver) -> None:
+        for strategy in self.strategies:
+            strategy.before_navigation(driver)
+
+    def wait(self, driver, url: str) -> List[ReadinessReport]:
+        """
+        Wait until the page at url is ready.
+        When the site selector matches, the content is known to be there and the remaining checks are skipped.
+        Returns:
+            list: One report per check that ran.
+        """
+        start = time.monotonic()
+        reports = []
+        for strategy in self.strategies:
+            remaining = self.budget - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            if isinstance(strategy, SiteSelector) and strategy.selector_for(url) is None:
+                continue
+            report = strategy.run(driver, url, remaining)
+            reports.append(report)
+            if isinstance(strategy, SiteSelector) and report.ready:
+                break
+        summary = ", ".join(f"{r.strategy}={'ok' if r.ready else 'timeout'} {r.waited:.2f}s" for r in reports)
+        logger.debug(f"Page ready after {time.monotonic() - start:.2f}s ({summary})")
+        return reports
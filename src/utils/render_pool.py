@@ -0,0 +1,166 @@
+"""
+Pool of warm headless Chrome instances used to render HTML to PDF.
+
+Launching Chrome costs more than rendering a resume, so browsers are kept alive and leased
+per render. A browser is retired after a number of renders or when its JS heap has grown
+too much, and replaced on the next lease. One pool is shared by the whole process.
+"""
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+import config as cfg
+from src.logging import logger
+from src.utils.chrome_utils import chrome_render_options, init_browser
+
+
+class _PooledBrowser:
+    def __init__(self, driver: webdriver.Chrome, slot: int):
+        self.driver = driver
+        self.slot = slot
+        self.renders = 0
+        self.baseline_heap = None
+
+
+class RenderPool:
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        size: int = cfg.RENDER_POOL_SIZE,
+        max_renders: int = cfg.RENDER_POOL_MAX_RENDERS,
+        max_heap_growth_mb: float = cfg.RENDER_POOL_MAX_HEAP_GROWTH_MB,
+        driver_factory: Optional[Callable[[int], webdriver.Chrome]] = None,
+    ):
+        """
+        Initialize the pool. Browsers are launched lazily, on the first leases.
+        Args:
+            size (int): Maximum number of browsers alive at once.
+            max_renders (int): Renders after which a browser is replaced.
+            max_heap_growth_mb (float): JS heap growth in MB after which a browser is replaced.
+            driver_factory (Callable): Launches a browser for a slot index, which identifies the browsers
+                alive at the same time (e.g. to give each its own disk cache); defaults to headless Chrome.
+        """
+        self.size = size
+        self.max_renders = max_renders
+        self.max_heap_growth = max_heap_growth_mb * 1024 * 1024
+        self.driver_factory = driver_factory or (lambda slot: init_browser(chrome_render_options(slot)))
+        self._idle: "queue.LifoQueue[_PooledBrowser]" = queue.LifoQueue()
+        # Free slots for browsers that may still be launched
+        self._slots = threading.BoundedSemaphore(size)
+        self._free_slots = list(range(size))
+        self._launched = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def default(cls) -> "RenderPool":
+        """
+        Process-wide pool built from config.py, shared by all facades and shut down when the interpreter exits.
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+                atexit.register(cls._default.shutdown)
+            return cls._default
+
+    @staticmethod
+    def _heap_size(driver: webdriver.Chrome) -> Optional[float]:
+        try:
+            metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except (WebDriverException, KeyError):
+            return None
+        return next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), None)
+
+    def _launch(self, slot: int) -> _PooledBrowser:
+        browser = _PooledBrowser(self.driver_factory(slot), slot)
+        try:
+            browser.driver.execute_cdp_cmd("Performance.enable", {})
+        except WebDriverException:
+            pass
+        browser.baseline_heap = self._heap_size(browser.driver)
+        with self._lock:
+            self._launched += 1
+        logger.debug(f"Render pool launched a browser ({self._launched} so far)")
+        return browser
+
+    def _acquire(self) -> _PooledBrowser:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._slots.acquire(blocking=False):
+                with self._lock:
+                    slot = self._free_slots.pop()
+                try:
+                    return self._launch(slot)
+                except Exception:
+                    self._free_slot(slot)
+                    raise
+            try:
+                # Every slot is taken: wait for a browser to come back
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _retire(self, browser: _PooledBrowser, reason: str) -> None:
+        logger.debug(f"Retiring render browser after {browser.renders} renders: {reason}")
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error while closing render browser: {e}")
+        self._free_slot(browser.slot)
+
+    def _free_slot(self, slot: int) -> None:
+        with self._lock:
+            self._free_slots.append(slot)
+        self._slots.release()
+
+    def _release(self, browser: _PooledBrowser) -> None:
+        browser.renders += 1
+        if self._closed:
+            self._retire(browser, "pool closed")
+            return
+        if browser.renders >= self.max_renders:
+            self._retire(browser, "render limit reached")
+            return
+        heap = self._heap_size(browser.driver)
+        if heap is not None and browser.baseline_heap is not None and heap - browser.baseline_heap > self.max_heap_growth:
+            self._retire(browser, f"heap grew by {(heap - browser.baseline_heap) / 2**20:.0f} MB")
+            return
+        self._idle.put(browser)
+
+    @contextmanager
+    def lease(self) -> Iterator[webdriver.Chrome]:
+        """
+        Borrow a warm browser for one render. Browsers that raised are replaced, since their state is unknown.
+        """
+        if self._closed:
+            raise RuntimeError("The render pool has been shut down.")
+        browser = self._acquire()
+        try:
+            yield browser.driver
+        except Exception:
+            self._retire(browser, "render failed")
+            raise
+        else:
+            self._release(browser)
+
+    def shutdown(self) -> None:
+        """
+        Close every idle browser; browsers still leased are closed when they are returned.
+        """
+        self._closed = True
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(browser, "pool closed")
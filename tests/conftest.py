@@ -0,0 +1,14 @@
+import pytest
+
+from src.libs.resume_and_cover_builder.config import global_config
+
+
+@pytest.fixture
+def isolated_global_config():
+    """
+    Restore the process-wide global_config after a test that constructs a ResumeFacade, which overwrites it.
+    """
+    saved = dict(vars(global_config))
+    yield global_config
+    vars(global_config).clear()
+    vars(global_config).update(saved)
@@ -0,0 +1,60 @@
+import io
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+
+from src.libs.resume_and_cover_builder.asset_bundler import AssetBundler, _subset_font
+
+
+def make_font() -> bytes:
+    characters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    glyph_names = [".notdef"] + list(characters)
+    pen = TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 500))
+    pen.lineTo((500, 500))
+    pen.closePath()
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyph_names)
+    builder.setupCharacterMap({ord(c): c for c in characters})
+    builder.setupGlyf({name: pen.glyph() for name in glyph_names})
+    builder.setupHorizontalMetrics({name: (600, 0) for name in glyph_names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+    output = io.BytesIO()
+    builder.save(output)
+    return output.getvalue()
+
+
+def test_font_is_subset_to_used_characters():
+    subset = _subset_font(make_font(), frozenset(map(ord, "CAB")))
+
+    assert subset[:4] == b"wOF2"
+    font = TTFont(io.BytesIO(subset))
+    assert set(font.getBestCmap()) == set(map(ord, "ABC"))
+
+
+def test_used_codepoints_include_icon_glyphs_of_used_classes():
+    css = '.fa-github:before{content:"\\f09b"}.fa-unused:before{content:"\\f000"}'
+    html = '<p class="fab fa-github">Ł</p>'
+
+    codepoints = AssetBundler.used_codepoints(html, css)
+
+    assert 0xF09B in codepoints
+    assert 0xF000 not in codepoints
+    assert ord("Ł") in codepoints
+
+
+def test_cached_stylesheet_is_inlined_offline(tmp_path):
+    bundler = AssetBundler(tmp_path, subset_fonts=False)
+    url = "https://fonts.example.com/css?family=Test"
+    bundler._cache_path(url).write_bytes(b"body{font-family:Test}")
+    html = f'<html><head><link href="{url}" rel="stylesheet" /><link href="{url}" rel="stylesheet" /></head></html>'
+
+    bundled = bundler.bundle(html)
+
+    assert bundled.count("<style>body{font-family:Test}</style>") == 1
+    assert "<link" not in bundled
@@ -0,0 +1,18 @@
+from src.utils.chrome_utils import chrome_browser_options, chrome_render_options, chrome_scraping_options
+
+
+def test_only_the_scraping_profile_keeps_the_performance_log():
+    scraping = chrome_scraping_options().to_capabilities()
+
+    assert scraping["goog:loggingPrefs"] == {"performance": "ALL"}
+    assert scraping["pageLoadStrategy"] == "eager"
+    assert "goog:loggingPrefs" not in chrome_browser_options().to_capabilities()
+    assert "goog:loggingPrefs" not in chrome_render_options().to_capabilities()
+
+
+def test_scraping_profile_builds_on_the_browser_profile():
+    browser_arguments = set(chrome_browser_options().arguments)
+    scraping_arguments = set(chrome_scraping_options().arguments)
+
+    assert browser_arguments < scraping_arguments
+    assert "--blink-settings=imagesEnabled=false" in scraping_arguments - browser_arguments
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from src.utils import chromedriver_cache
+from src.utils.chromedriver_cache import ChromeDriverCache
+
+
+@pytest.fixture
+def driver_setup(tmp_path, monkeypatch):
+    driver_path = tmp_path / "chromedriver"
+    driver_path.write_bytes(b"driver v120")
+    state = {"installs": 0, "hashes": 0, "chrome_version": "120.0.6099.109", "offline": False}
+
+    class FakeManager:
+        def install(self):
+            if state["offline"]:
+                raise ConnectionError("offline")
+            state["installs"] += 1
+            return str(driver_path)
+
+    real_sha256 = chromedriver_cache._sha256
+
+    def counting_sha256(path):
+        state["hashes"] += 1
+        return real_sha256(path)
+
+    monkeypatch.setattr(chromedriver_cache, "ChromeDriverManager", FakeManager)
+    monkeypatch.setattr(chromedriver_cache, "_sha256", counting_sha256)
+    monkeypatch.setattr(ChromeDriverCache, "chrome_version", staticmethod(lambda: state["chrome_version"]))
+    return ChromeDriverCache(tmp_path / "chromedriver.json"), driver_path, state
+
+
+def test_hit_skips_manager_and_hashing(driver_setup):
+    cache, driver_path, state = driver_setup
+
+    assert cache.resolve() == str(driver_path)
+    assert cache.resolve() == str(driver_path)
+    assert state["installs"] == 1
+    assert state["hashes"] == 1
+
+
+def test_chrome_update_resolves_again(driver_setup):
+    cache, _, state = driver_setup
+    cache.resolve()
+    state["chrome_version"] = "121.0.6167.85"
+
+    cache.resolve()
+
+    assert state["installs"] == 2
+
+
+def test_touched_driver_is_rehashed_once(driver_setup):
+    cache, driver_path, state = driver_setup
+    cache.resolve()
+    os.utime(driver_path, (1_000_000, 1_000_000))
+
+    cache.resolve()
+    cache.resolve()
+
+    assert state["installs"] == 1
+    assert state["hashes"] == 2
+
+
+def test_modified_driver_resolves_again(driver_setup):
+    cache, driver_path, state = driver_setup
+    cache.resolve()
+    driver_path.write_bytes(b"tampered driver")
+
+    cache.resolve()
+
+    assert state["installs"] == 2
+
+
+def test_offline_falls_back_to_cached_driver(driver_setup):
+    cache, driver_path, state = driver_setup
+    cache.resolve()
+    state["chrome_version"] = "121.0.6167.85"
+    state["offline"] = True
+
+    assert cache.resolve() == str(driver_path)
+
+
+def test_offline_without_cache_raises(driver_setup):
+    cache, _, state = driver_setup
+    state["offline"] = True
+
+    with pytest.raises(ConnectionError):
+        cache.resolve()
@@ -0,0 +1,96 @@
+import itertools
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.libs.resume_and_cover_builder import embedding_cache
+from src.libs.resume_and_cover_builder.embedding_cache import SQLiteEmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), -1.0]
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    # A strictly increasing clock keeps the LRU order deterministic
+    ticks = itertools.count(1)
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(ticks)))
+
+
+def make_cache(tmp_path, max_entries=100):
+    embeddings = CountingEmbeddings()
+    cache = SQLiteEmbeddingCache(embeddings, tmp_path / "embeddings.sqlite", "test-model", max_entries=max_entries)
+    return cache, embeddings
+
+
+def cached_texts(cache, texts, kind="document"):
+    hashes = {cache._hash(text, kind): text for text in texts}
+    return sorted(hashes[text_hash] for text_hash in cache._lookup(list(hashes)))
+
+
+def test_miss_then_hit(tmp_path):
+    cache, embeddings = make_cache(tmp_path)
+
+    assert cache.embed_documents(["alpha", "be"]) == [[5.0, 1.0], [2.0, 1.0]]
+    assert cache.embed_documents(["be", "gamma", "be"]) == [[2.0, 1.0], [5.0, 1.0], [2.0, 1.0]]
+
+    assert embeddings.embedded == ["alpha", "be", "gamma"]
+
+
+def test_queries_and_documents_are_cached_apart(tmp_path):
+    cache, embeddings = make_cache(tmp_path)
+
+    assert cache.embed_documents(["alpha"]) == [[5.0, 1.0]]
+    assert cache.embed_query("alpha") == [5.0, -1.0]
+    assert cache.embed_query("alpha") == [5.0, -1.0]
+    assert embeddings.embedded == ["alpha", "alpha"]
+
+
+def test_cache_persists_across_instances(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    cache.embed_documents(["alpha"])
+
+    reopened, embeddings = make_cache(tmp_path)
+
+    assert reopened.embed_documents(["alpha"]) == [[5.0, 1.0]]
+    assert embeddings.embedded == []
+    assert reopened._count == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache, _ = make_cache(tmp_path, max_entries=10)
+    texts = [f"text {i}" for i in range(10)]
+    cache.embed_documents(texts)
+    assert cache._count == 10
+
+    # Reading the oldest entry makes it recently used
+    cache.embed_documents(["text 0"])
+    cache.embed_documents(["text 10"])
+
+    # Evicted down to 90% of the limit, oldest first
+    assert cache._count == cache._count_entries() == 9
+    assert cached_texts(cache, texts + ["text 10"]) == sorted(["text 0", "text 10"] + [f"text {i}" for i in range(3, 10)])
+
+
+def test_count_is_only_read_from_the_database_when_full(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, max_entries=10)
+    recounts = []
+    count_entries = cache._count_entries
+    monkeypatch.setattr(cache, "_count_entries", lambda: recounts.append(1) or count_entries())
+
+    for i in range(10):
+        cache.embed_documents([f"text {i}"])
+    assert recounts == []
+
+    cache.embed_documents(["text 10"])
+    assert recounts == [1]
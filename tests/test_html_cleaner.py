@@ -0,0 +1,51 @@
+from src.libs.resume_and_cover_builder.html_cleaner import html_to_text, readable_text
+
+
+def test_drops_scripts_navigation_and_cookie_banners():
+    html = """
+    <html><head><title>Job</title><style>p{color:red}</style></head><body>
+      <nav><a href="/">Home</a></nav>
+      <div class="cookie-banner">We use cookies</div>
+      <h1>Engineer</h1>
+      <p>We need Python.</p>
+      <script>track()</script>
+      <footer>Copyright</footer>
+    </body></html>
+    """
+
+    assert html_to_text(html) == "# Engineer\nWe need Python."
+
+
+def test_keeps_content_wrapped_in_a_form():
+    html = '<body><nav>Home</nav><form action="/apply"><h1>Engineer</h1><p>We need Python.</p></form></body>'
+
+    assert html_to_text(html) == "# Engineer\nWe need Python."
+
+
+def test_drops_form_controls():
+    html = '<form><p>Apply now</p><select><option>Germany</option></select><textarea>Cover</textarea>' \
+           '<button>Send</button><input value="x"></form>'
+
+    assert html_to_text(html) == "Apply now"
+
+
+def test_lists_headings_and_mailto_links():
+    html = '<h2>Contact</h2><ul><li>Remote</li><li>Full time</li></ul><a href="mailto:jobs@acme.com?subject=x">Email us</a>'
+
+    assert html_to_text(html) == "## Contact\n- Remote\n- Full time\njobs@acme.com Email us"
+
+
+def test_readable_text_falls_back_when_filters_remove_the_content():
+    posting = "<p>" + "We are hiring a data engineer to build pipelines. " * 10 + "</p>"
+    html = f'<body><div class="newsletter-layout">{posting}</div><nav>Home</nav></body>'
+
+    assert html_to_text(html) == ""
+    assert "data engineer" in readable_text(html)
+    assert "Home" in readable_text(html)
+
+
+def test_readable_text_keeps_filtered_text_when_it_is_the_bulk_of_the_page():
+    html = "<body><nav>Home</nav><p>" + "Build pipelines. " * 20 + "</p></body>"
+
+    assert readable_text(html) == html_to_text(html)
+    assert "Home" not in readable_text(html)
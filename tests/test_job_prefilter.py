@@ -0,0 +1,82 @@
+import numpy as np
+
+from src.libs.job_prefilter import ACCEPT, BORDERLINE, REJECT, JobPrefilter
+
+RESUME = "Senior Python engineer. Data pipelines with Spark, Airflow and PostgreSQL on AWS."
+MATCHING_JOB = "We are looking for a senior Python engineer to build data pipelines with Spark and Airflow on AWS."
+UNRELATED_JOB = "Pastry chef wanted for our bakery. Croissants, sourdough and cakes every morning."
+
+
+def make_prefilter(tmp_path, **kwargs):
+    prefilter = JobPrefilter(**{"reject_threshold": 0.05, "accept_threshold": None, "cache_dir": tmp_path, **kwargs})
+    prefilter.set_resume(RESUME)
+    return prefilter
+
+
+def test_unrelated_job_is_rejected(tmp_path):
+    decision, score = make_prefilter(tmp_path).classify(UNRELATED_JOB)
+
+    assert decision == REJECT
+    assert score < 0.05
+
+
+def test_matching_job_goes_to_the_llm_by_default(tmp_path):
+    decision, score = make_prefilter(tmp_path).classify(MATCHING_JOB)
+
+    assert decision == BORDERLINE
+    assert score > 0.3
+
+
+def test_accept_threshold_is_opt_in(tmp_path):
+    decision, _ = make_prefilter(tmp_path, accept_threshold=0.3).classify(MATCHING_JOB)
+
+    assert decision == ACCEPT
+
+
+def test_document_frequencies_are_saved_in_batches(tmp_path):
+    prefilter = make_prefilter(tmp_path, save_every=3)
+    df_path = tmp_path / "document_frequencies.npz"
+
+    prefilter.classify("first job description about python")
+    prefilter.classify("second job description about java")
+    assert not df_path.exists()
+
+    prefilter.classify("third job description about rust")
+    with np.load(df_path) as data:
+        assert int(data["count"]) == 3
+
+    prefilter.classify("fourth job description about go")
+    prefilter.flush()
+    with np.load(df_path) as data:
+        assert int(data["count"]) == 4
+
+
+def test_known_job_does_not_count_twice(tmp_path):
+    prefilter = make_prefilter(tmp_path, save_every=1)
+    prefilter.classify(MATCHING_JOB)
+    prefilter.classify(MATCHING_JOB)
+
+    reloaded = make_prefilter(tmp_path)
+    assert reloaded._document_count == 1
+
+
+def test_only_the_document_frequency_table_is_stored(tmp_path):
+    prefilter = make_prefilter(tmp_path, save_every=1)
+    for index in range(5):
+        prefilter.classify(f"job description number {index} about python")
+
+    assert [path.name for path in tmp_path.iterdir()] == ["document_frequencies.npz"]
+
+
+def test_seen_jobs_are_capped(tmp_path):
+    prefilter = make_prefilter(tmp_path, max_seen_jobs=2)
+    prefilter.classify("first job about python")
+    prefilter.classify("second job about java")
+    prefilter.classify("first job about python")  # Most recent again, so "second" is forgotten first
+    prefilter.classify("third job about rust")
+    assert prefilter._document_count == 3
+
+    prefilter.classify("first job about python")
+    assert prefilter._document_count == 3
+    prefilter.classify("second job about java")
+    assert prefilter._document_count == 4
@@ -0,0 +1,88 @@
+import json
+import time
+
+from src.libs.resume_and_cover_builder import resume_facade
+from src.libs.resume_and_cover_builder.job_snapshot_cache import JobSnapshotCache, normalize_url
+from src.libs.resume_and_cover_builder.resume_facade import ResumeFacade
+
+FIELDS = {"role": "Engineer", "company": "Acme", "description": "Build things.", "location": "Berlin"}
+
+
+def test_normalize_url_drops_tracking_and_fragment():
+    assert normalize_url("HTTPS://Jobs.Example.com/view/123/?utm_source=x&b=2&trk=abc&a=1#apply") == \
+        "https://jobs.example.com/view/123?a=1&b=2"
+
+
+def test_snapshot_round_trip_across_tracking_variants(tmp_path):
+    cache = JobSnapshotCache(tmp_path, ttl=60)
+    cache.put("https://example.com/job/1?utm_source=mail", FIELDS)
+
+    snapshot = cache.get("https://example.com/job/1/")
+
+    assert snapshot["job_fields"] == FIELDS
+    assert "page_text" not in snapshot
+    assert cache.get("https://example.com/job/2") is None
+
+
+def test_expired_snapshot_is_removed(tmp_path):
+    cache = JobSnapshotCache(tmp_path, ttl=0.1)
+    cache.put("https://example.com/job/1", FIELDS)
+    time.sleep(0.2)
+
+    assert cache.get("https://example.com/job/1") is None
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+
+def test_snapshot_of_another_codec_is_discarded(tmp_path):
+    cache = JobSnapshotCache(tmp_path, ttl=60)
+    cache.put("https://example.com/job/1", FIELDS)
+    index = json.loads((tmp_path / "index.json").read_text())
+    for entry in index.values():
+        entry["codec"] = "zlib"
+    (tmp_path / "index.json").write_text(json.dumps(index))
+
+    assert cache.get("https://example.com/job/1") is None
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+
+def test_unreadable_snapshot_is_discarded(tmp_path):
+    cache = JobSnapshotCache(tmp_path, ttl=60)
+    cache.put("https://example.com/job/1", FIELDS)
+    for blob in tmp_path.glob(f"{cache.key('https://example.com/job/1')}.*"):
+        blob.write_bytes(b"not compressed")
+
+    assert cache.get("https://example.com/job/1") is None
+
+
+class _FailingParser:
+    def __init__(self, openai_api_key):
+        pass
+
+    def set_body_html(self, body_html):
+        pass
+
+    def extract_all(self, fields):
+        # LLMParser returns empty strings when the LLM call fails
+        return {field: "" for field in fields}
+
+
+class _ResumeGenerator:
+    def set_resume_object(self, resume_object):
+        pass
+
+
+def test_failed_extraction_is_not_stored(tmp_path, monkeypatch, isolated_global_config):
+    monkeypatch.setattr(resume_facade.PageFetcher, "fetch", lambda self, url, get_driver: "<html><body>Job</body></html>")
+    monkeypatch.setattr(resume_facade, "LLMParser", _FailingParser)
+    facade = ResumeFacade("key", None, _ResumeGenerator(), None, tmp_path)
+
+    facade.link_to_job("https://example.com/job/1")
+
+    cache = JobSnapshotCache(tmp_path / "cache" / "job_snapshots", ttl=60)
+    assert cache.get("https://example.com/job/1") is None
+
+
+def test_facade_changes_to_global_config_are_undone(isolated_global_config):
+    # Runs after the facade test above: its output path must not leak into later tests
+    assert isolated_global_config.CACHE_DIRECTORY == type(isolated_global_config)().CACHE_DIRECTORY
+    assert isolated_global_config.API_KEY is None
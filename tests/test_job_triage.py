@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from src.job import Job
+from src.libs.job_prefilter import JobPrefilter
+from src.libs.job_triage import JobTriage
+
+
+class FakeLLM:
+    """
+    Scores a description after the delay (in seconds) given in its first word, e.g. "0.2 python job".
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.scored = []
+
+    def score(self, description: str):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay, _, text = description.partition(" ")
+            time.sleep(float(delay))
+            if "broken" in text:
+                raise RuntimeError("LLM reply could not be parsed")
+            with self.lock:
+                self.scored.append(description)
+            return (9 if "python" in text else 2), f"scored {text}"
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def summarize(description: str) -> str:
+        return f"summary of {description}"
+
+
+def job(description: str) -> Job:
+    return Job(role="Engineer", company=description.split()[-1], description=description)
+
+
+def test_results_arrive_in_completion_order():
+    llm = FakeLLM()
+    jobs = [job("0.3 python slow"), job("0.0 python fast"), job("0.1 pastry medium")]
+
+    results = list(JobTriage(llm.score, llm.summarize).triage_jobs(jobs, max_in_flight=3))
+
+    assert [result.job.company for result in results] == ["fast", "medium", "slow"]
+    assert [result.suitable for result in results] == [True, False, True]
+    assert results[0].summary == "summary of 0.0 python fast"
+    assert results[1].summary == ""
+
+
+def test_in_flight_jobs_are_bounded_and_pulled_lazily():
+    llm = FakeLLM()
+    pulled = []
+
+    def jobs():
+        for index in range(10):
+            pulled.append(index)
+            yield job(f"0.02 python job{index}")
+
+    results = JobTriage(llm.score).triage_jobs(jobs(), max_in_flight=3)
+    next(results)
+    # One result consumed: the first three jobs plus the one that replaced it
+    assert len(pulled) == 4
+    assert len(list(results)) == 9
+    assert llm.max_in_flight <= 3
+
+
+def test_failing_job_does_not_abort_the_others():
+    llm = FakeLLM()
+    jobs = [job("0.0 python broken"), job("0.05 python ok"), job("0.0 pastry other")]
+
+    results = {result.job.company: result for result in JobTriage(llm.score).triage_jobs(jobs, max_in_flight=2)}
+
+    assert set(results) == {"broken", "ok", "other"}
+    assert not results["broken"].suitable
+    assert "could not be parsed" in results["broken"].error
+    assert results["ok"].suitable and results["ok"].error is None
+
+
+def test_prefilter_rejects_skip_the_llm(tmp_path):
+    llm = FakeLLM()
+    prefilter = JobPrefilter(reject_threshold=0.05, accept_threshold=None, cache_dir=tmp_path)
+    prefilter.set_resume("Senior Python engineer building data pipelines with Spark and Airflow")
+    jobs = [job("0.0 python engineer for data pipelines with spark and airflow"), job("0.0 croissants sourdough bakery")]
+
+    results = list(JobTriage(llm.score, job_prefilter=prefilter).triage_jobs(jobs, max_in_flight=2))
+
+    rejected = next(result for result in results if result.job.company == "bakery")
+    assert rejected.reasoning == "Rejected by pre-filter" and rejected.score is None
+    assert llm.scored == ["0.0 python engineer for data pipelines with spark and airflow"]
+
+
+def test_max_in_flight_must_be_positive():
+    with pytest.raises(ValueError):
+        next(JobTriage(FakeLLM().score).triage_jobs([], max_in_flight=0))
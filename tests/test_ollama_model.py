@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from src.libs import ollama_model
+from src.libs.ollama_model import OllamaModel
+
+
+@pytest.fixture(autouse=True)
+def ollama_config(monkeypatch):
+    monkeypatch.setattr(ollama_model.cfg, "LLM_OLLAMA_WARM_UP", False)
+    monkeypatch.setattr(ollama_model.cfg, "LLM_OLLAMA_NUM_PARALLEL", 2)
+    monkeypatch.setattr(ollama_model.cfg, "LLM_OLLAMA_MIN_NUM_CTX", 2048)
+    monkeypatch.setattr(ollama_model.cfg, "LLM_OLLAMA_MAX_NUM_CTX", 16384)
+    monkeypatch.setattr(ollama_model.cfg, "LLM_OLLAMA_REPLY_TOKENS", 1024)
+    monkeypatch.setattr(OllamaModel, "_server_semaphores", {})
+
+
+def test_instances_of_one_server_share_a_semaphore():
+    first = OllamaModel("llama3", "http://gpu-box:11434/")
+    second = OllamaModel("mistral", "http://gpu-box:11434")
+    other = OllamaModel("llama3", "http://other:11434")
+
+    assert first.semaphore is second.semaphore
+    assert first.semaphore is not other.semaphore
+    # Two requests in parallel, the third waits
+    assert first.semaphore.acquire(blocking=False) and second.semaphore.acquire(blocking=False)
+    assert not first.semaphore.acquire(blocking=False)
+
+
+def test_num_ctx_is_rounded_up_to_a_power_of_two_and_capped():
+    model = OllamaModel("llama3", "")
+
+    assert model._num_ctx_for("short prompt") == 2048
+    # 3 characters per token plus the reply tokens: 3000 tokens need 4096
+    assert model._num_ctx_for("x" * 3 * 2000) == 4096
+    assert model._num_ctx_for("x" * 3 * 7000) == 8192
+    assert model._num_ctx_for("x" * 3 * 100_000) == 16384
+
+
+def test_models_are_cached_per_num_ctx():
+    model = OllamaModel("llama3", "")
+
+    assert model._get_model(2048) is model.model
+    assert model._get_model(4096) is model._get_model(4096)
+    assert model._get_model(4096) is not model.model
+    assert model._get_model(4096).num_ctx == 4096
+    assert model._get_model(4096).keep_alive == model.keep_alive
+
+
+def test_invoke_uses_the_sized_model_inside_the_semaphore(monkeypatch):
+    model = OllamaModel("llama3", "")
+    calls = []
+
+    class FakeChat:
+        def __init__(self, num_ctx):
+            self.num_ctx = num_ctx
+
+        def invoke(self, prompt):
+            calls.append((self.num_ctx, model.semaphore._value))
+            return "reply"
+
+    monkeypatch.setattr(model, "_get_model", FakeChat)
+
+    assert model.invoke("x" * 3 * 2000) == "reply"
+    assert calls == [(4096, 1)]
+
+
+def test_warm_up_loads_the_model_in_the_background(monkeypatch):
+    monkeypatch.setattr(ollama_model.cfg, "LLM_OLLAMA_WARM_UP", True)
+    requests = []
+    sent = threading.Event()
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+    def post(url, json, timeout):
+        requests.append((url, json))
+        sent.set()
+        return Response()
+
+    monkeypatch.setattr(ollama_model.httpx, "post", post)
+    OllamaModel("llama3", "gpu-box:11434")
+
+    assert sent.wait(5)
+    url, payload = requests[0]
+    assert url == "http://gpu-box:11434/api/generate"
+    assert payload["model"] == "llama3" and payload["options"] == {"num_ctx": 2048}
@@ -0,0 +1,132 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from src.libs.resume_and_cover_builder import page_fetcher
+from src.libs.resume_and_cover_builder.page_fetcher import BROWSER, HTTP, PageFetcher
+
+POSTING = "<html><body><main><h1>Senior Engineer</h1><p>" + "We build data pipelines. " * 40 + "</p></main></body></html>"
+SHELL = '<html><body><noscript>Please enable JavaScript</noscript><div id="root"></div></body></html>'
+SHELL_WITH_TEASER = '<html><body><div id="root"></div><p>' + "Senior Engineer teaser. " * 15 + "</p></body></html>"
+
+
+class FakeDriver:
+    def __init__(self):
+        self.urls = []
+        self.page_source = ""
+
+    def get(self, url):
+        self.urls.append(url)
+        self.page_source = f"<html><body>rendered {url}</body></html>"
+
+
+class StubReadiness:
+    def __init__(self, budget):
+        self.budget = budget
+
+    def before_navigation(self, driver):
+        pass
+
+    def wait(self, driver, url):
+        return []
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """
+    Serve the HTML of each URL path from a dict through an httpx MockTransport.
+    """
+    served = {}
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        status, body, content_type = served.get(request.url.path, (404, "missing", "text/html"))
+        return httpx.Response(status, text=body, headers={"content-type": content_type})
+
+    monkeypatch.setattr(PageFetcher, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(page_fetcher, "PageReadiness", StubReadiness)
+    return served, requests
+
+
+def make_fetcher(tmp_path, **kwargs):
+    return PageFetcher(tmp_path / "strategies.json", min_text_length=300, **kwargs)
+
+
+def driver_factory():
+    drivers = []
+
+    def get_driver():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    return get_driver, drivers
+
+
+def test_js_shell_heuristic(tmp_path):
+    fetcher = make_fetcher(tmp_path)
+
+    assert fetcher.is_meaningful(POSTING)
+    assert not fetcher.is_meaningful(SHELL)
+    # Enough text for a static page, but a shell has to show twice as much
+    assert not fetcher.is_meaningful(SHELL_WITH_TEASER)
+    assert fetcher.is_meaningful(SHELL_WITH_TEASER.replace('<div id="root"></div>', ""))
+
+
+def test_static_page_never_starts_the_browser(tmp_path, pages):
+    served, requests = pages
+    served["/jobs/1"] = (200, POSTING, "text/html; charset=utf-8")
+    get_driver, drivers = driver_factory()
+
+    assert make_fetcher(tmp_path).fetch("https://static.example/jobs/1", get_driver) == POSTING
+    assert drivers == []
+    strategies = json.loads((tmp_path / "strategies.json").read_text())
+    assert strategies["static.example"]["strategy"] == HTTP
+
+
+def test_js_page_falls_back_to_the_browser_and_is_remembered(tmp_path, pages):
+    served, requests = pages
+    served["/jobs/1"] = (200, SHELL, "text/html")
+    served["/jobs/2"] = (200, SHELL, "text/html")
+    get_driver, drivers = driver_factory()
+
+    html = make_fetcher(tmp_path).fetch("https://app.example/jobs/1", get_driver)
+    assert "rendered https://app.example/jobs/1" in html
+    assert requests == ["/jobs/1"]
+
+    # A new fetcher reads the strategy file and goes straight to the browser
+    make_fetcher(tmp_path).fetch("https://app.example/jobs/2", get_driver)
+    assert requests == ["/jobs/1"]
+    assert [driver.urls for driver in drivers] == [["https://app.example/jobs/1"], ["https://app.example/jobs/2"]]
+
+
+def test_http_errors_fall_back_to_the_browser(tmp_path, pages):
+    served, requests = pages
+    served["/jobs/1"] = (403, POSTING, "text/html")
+    served["/jobs/2"] = (200, "%PDF-1.7", "application/pdf")
+    get_driver, drivers = driver_factory()
+
+    make_fetcher(tmp_path).fetch("https://blocked.example/jobs/1", get_driver)
+    make_fetcher(tmp_path).fetch("https://files.example/jobs/2", get_driver)
+
+    assert len(drivers) == 2
+
+
+def test_browser_strategy_expires(tmp_path, pages):
+    served, requests = pages
+    served["/jobs/1"] = (200, POSTING, "text/html; charset=utf-8")
+    old = time.time() - 3600
+    (tmp_path / "strategies.json").write_text(json.dumps({"site.example": {"strategy": BROWSER, "updated": old}}))
+    get_driver, drivers = driver_factory()
+
+    # Still fresh: the browser is used without trying HTTP
+    make_fetcher(tmp_path, strategy_ttl=7200).fetch("https://site.example/jobs/1", get_driver)
+    assert requests == [] and len(drivers) == 1
+
+    # Expired: HTTP is tried again and, since it works now, remembered
+    assert make_fetcher(tmp_path, strategy_ttl=60).fetch("https://site.example/jobs/1", get_driver) == POSTING
+    assert requests == ["/jobs/1"] and len(drivers) == 1
+    strategies = json.loads((tmp_path / "strategies.json").read_text())
+    assert strategies["site.example"]["strategy"] == HTTP
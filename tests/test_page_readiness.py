@@ -0,0 +1,181 @@
+import json
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from src.utils.page_readiness import DocumentReadyState, DomQuiescence, NetworkIdle, PageReadiness, SiteSelector
+
+
+def network_event(method, request_id):
+    return {"message": json.dumps({"message": {"method": method, "params": {"requestId": request_id}}})}
+
+
+class Element:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubDriver:
+    """
+    Driver whose page evolves by a scripted sequence of states; the last state of each sequence repeats.
+    """
+
+    def __init__(self, ready_states=("complete",), log_batches=None, resource_counts=(0,), elements=(), quiet=True):
+        self.ready_states = list(ready_states)
+        self.log_batches = None if log_batches is None else list(log_batches)
+        self.resource_counts = list(resource_counts)
+        self.elements = list(elements)
+        self.quiet = quiet
+        self.calls = []
+
+    @staticmethod
+    def _next(states):
+        return states.pop(0) if len(states) > 1 else states[0]
+
+    def execute_script(self, script):
+        self.calls.append("execute_script")
+        if "readyState" in script:
+            return self._next(self.ready_states)
+        return self._next(self.resource_counts)
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        self.calls.append("get_log")
+        if self.log_batches is None:
+            raise WebDriverException("log type 'performance' not found")
+        return self.log_batches.pop(0) if self.log_batches else []
+
+    def find_elements(self, by, selector):
+        self.calls.append("find_elements")
+        return [Element(self._next(self.elements))] if self.elements else []
+
+    def set_script_timeout(self, timeout):
+        self.script_timeout = timeout
+
+    def execute_async_script(self, script, quiet_ms, timeout_ms):
+        self.calls.append(("execute_async_script", quiet_ms, timeout_ms))
+        return self.quiet
+
+
+def names(reports):
+    return [report.strategy for report in reports]
+
+
+def test_site_selector_match_skips_the_remaining_checks():
+    driver = StubDriver(ready_states=["loading", "complete"], elements=["", "Senior Engineer"], log_batches=[])
+    readiness = PageReadiness(budget=2, strategies=[
+        DocumentReadyState(timeout=2, poll_interval=0.01),
+        SiteSelector(timeout=1, poll_interval=0.01),
+        NetworkIdle(timeout=1, poll_interval=0.01),
+        DomQuiescence(timeout=1),
+    ])
+
+    readiness.before_navigation(driver)
+    reports = readiness.wait(driver, "https://www.linkedin.com/jobs/view/1")
+
+    assert names(reports) == ["ready_state", "site_selector"]
+    assert all(report.ready for report in reports)
+    assert driver.calls.count("get_log") == 1  # Only the drain before navigation
+
+
+def test_unknown_site_waits_for_network_and_dom():
+    driver = StubDriver(log_batches=[])
+    readiness = PageReadiness(budget=2, strategies=[
+        DocumentReadyState(timeout=2, poll_interval=0.01),
+        SiteSelector(timeout=1, poll_interval=0.01),
+        NetworkIdle(timeout=1, idle_time=0.05, poll_interval=0.01),
+        DomQuiescence(timeout=0.5, quiet_time=0.2),
+    ])
+
+    reports = readiness.wait(driver, "https://careers.example.com/jobs/1")
+
+    assert names(reports) == ["ready_state", "network_idle", "dom_quiescence"]
+    assert all(report.ready for report in reports)
+    assert "find_elements" not in driver.calls
+    assert driver.calls[-1] == ("execute_async_script", 200, 500)
+
+
+def test_network_idle_tracks_requests_from_the_performance_log():
+    driver = StubDriver(log_batches=[
+        [network_event("Network.requestWillBeSent", "1"), network_event("Network.requestWillBeSent", "2")],
+        [],
+        [network_event("Network.loadingFinished", "1")],
+        [],
+        [network_event("Network.loadingFailed", "2")],
+    ])
+    idle = NetworkIdle(timeout=2, idle_time=0.05, max_in_flight=0, poll_interval=0.01)
+
+    report = idle.run(driver, "https://example.com", budget=2)
+
+    assert report.ready
+    assert idle._in_flight == set()
+    # Idle only after the last batch, so every batch has been read
+    assert driver.calls.count("get_log") > 5
+
+
+def test_network_idle_allows_long_lived_requests():
+    driver = StubDriver(log_batches=[[network_event("Network.requestWillBeSent", "poll")]])
+
+    assert NetworkIdle(timeout=1, idle_time=0.05, max_in_flight=1, poll_interval=0.01).run(driver, "", 1).ready
+    assert not NetworkIdle(timeout=0.2, idle_time=0.05, max_in_flight=0, poll_interval=0.01).run(
+        StubDriver(log_batches=[[network_event("Network.requestWillBeSent", "poll")]]), "", 1
+    ).ready
+
+
+def test_network_idle_falls_back_to_resource_timing_without_the_performance_log():
+    driver = StubDriver(log_batches=None, resource_counts=[3, 5, 8, 8])
+    idle = NetworkIdle(timeout=1, idle_time=0.05, poll_interval=0.01)
+
+    idle.before_navigation(driver)
+    assert idle.run(driver, "https://example.com", budget=1).ready
+    assert driver.calls.count("execute_script") >= 4
+
+
+def test_budget_caps_the_checks_and_skips_those_left_without_time():
+    driver = StubDriver(ready_states=["loading"])
+    readiness = PageReadiness(budget=0.2, strategies=[
+        DocumentReadyState(timeout=5, poll_interval=0.01),
+        DomQuiescence(timeout=5),
+    ])
+
+    start = time.monotonic()
+    reports = readiness.wait(driver, "https://example.com")
+
+    assert time.monotonic() - start < 1
+    assert names(reports) == ["ready_state"]
+    assert not reports[0].ready
+    assert 0.2 <= reports[0].waited < 1
+
+
+def test_checks_get_at_most_the_remaining_budget():
+    driver = StubDriver(ready_states=["loading", "loading", "complete"])
+    readiness = PageReadiness(budget=1, strategies=[
+        DocumentReadyState(timeout=1, poll_interval=0.05),
+        DomQuiescence(timeout=5, quiet_time=0.1),
+    ])
+
+    reports = readiness.wait(driver, "https://example.com")
+
+    assert names(reports) == ["ready_state", "dom_quiescence"]
+    _, _, timeout_ms = driver.calls[-1]
+    assert timeout_ms <= 1000 - reports[0].waited * 1000 + 1
+
+
+def test_driver_errors_fail_the_check_without_stopping_the_others():
+    class BrokenDriver(StubDriver):
+        def execute_async_script(self, *args):
+            raise WebDriverException("script timeout")
+
+    readiness = PageReadiness(budget=1, strategies=[DomQuiescence(timeout=1), DocumentReadyState(timeout=1)])
+
+    reports = readiness.wait(BrokenDriver(), "https://example.com")
+
+    assert [(report.strategy, report.ready) for report in reports] == [("dom_quiescence", False), ("ready_state", True)]
+
+
+def test_default_strategies_split_the_budget():
+    readiness = PageReadiness(budget=8)
+
+    assert [(strategy.name, strategy.timeout) for strategy in readiness.strategies] == [
+        ("ready_state", 8), ("site_selector", 4), ("network_idle", 4), ("dom_quiescence", 2),
+    ]
@@ -0,0 +1,82 @@
+import os
+from contextlib import contextmanager
+
+from src.libs.resume_and_cover_builder import resume_facade
+from src.libs.resume_and_cover_builder.asset_bundler import AssetBundler
+from src.libs.resume_and_cover_builder.config import global_config
+from src.libs.resume_and_cover_builder.pdf_render_cache import PdfRenderCache
+from src.libs.resume_and_cover_builder.resume_facade import ResumeFacade
+
+
+def test_key_depends_on_document_renderer_and_preprocessing():
+    key = PdfRenderCache.key("<p>a</p>", "chrome")
+    assert key == PdfRenderCache.key("<p>a</p>", "chrome")
+    assert key != PdfRenderCache.key("<p>b</p>", "chrome")
+    assert key != PdfRenderCache.key("<p>a</p>", "reportlab")
+    assert key != PdfRenderCache.key("<p>a</p>", "chrome", "bundle:True:abc")
+
+
+def test_put_get_and_copy(tmp_path):
+    cache = PdfRenderCache(tmp_path / "pdf", 2**20)
+    assert cache.get("missing") is None
+    cache.put("a", b"%PDF-a")
+    rendered = tmp_path / "rendered.pdf"
+    rendered.write_bytes(b"%PDF-b")
+    cache.put("b", rendered)
+
+    assert cache.get("a").read_bytes() == b"%PDF-a"
+    output = cache.copy(cache.get("b"), tmp_path / "out" / "resume.pdf")
+    assert output.read_bytes() == b"%PDF-b"
+    assert not list((tmp_path / "out").glob("*.tmp"))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PdfRenderCache(tmp_path, 250)
+    for index, key in enumerate(("old", "used", "new")):
+        cache.put(key, b"x" * 100)
+        os.utime(tmp_path / f"{key}.pdf", (1000 + index, 1000 + index))
+    # A hit makes "used" the most recent, so "old" and then "new" go first
+    assert cache.get("used") is not None
+    cache.put("newest", b"x" * 100)
+
+    assert sorted(path.stem for path in tmp_path.glob("*.pdf")) == ["newest", "used"]
+
+
+def test_hit_skips_bundling_and_rendering(tmp_path, monkeypatch):
+    monkeypatch.setattr(global_config, "PDF_RENDERER", "chrome", raising=False)
+    monkeypatch.setattr(global_config, "BUNDLE_ASSETS", True, raising=False)
+    monkeypatch.setattr(global_config, "SUBSET_FONTS", True, raising=False)
+    monkeypatch.setattr(global_config, "PDF_RENDER_CACHE_MAX_MB", 10, raising=False)
+    monkeypatch.setattr(global_config, "CACHE_DIRECTORY", tmp_path, raising=False)
+    calls = {"bundle": 0, "render": 0}
+
+    def bundle(self, html):
+        calls["bundle"] += 1
+        # Bundling downloads an asset, which changes the cache state
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / "font.woff2").write_bytes(b"font")
+        return html.replace("remote", "inline")
+
+    class Pool:
+        @contextmanager
+        def lease(self):
+            yield None
+
+    def render(html, driver):
+        calls["render"] += 1
+        return f"%PDF {html}".encode("utf-8")
+
+    monkeypatch.setattr(AssetBundler, "bundle", bundle)
+    monkeypatch.setattr(resume_facade.RenderPool, "default", classmethod(lambda cls: Pool()))
+    monkeypatch.setattr(resume_facade, "HTML_to_PDF_bytes", render)
+
+    first = ResumeFacade._render_pdf("<p>remote</p>")
+    second = ResumeFacade._render_pdf("<p>remote</p>")
+
+    assert first == second == b"%PDF <p>inline</p>"
+    assert calls == {"bundle": 1, "render": 1}
+
+    # Another asset in the cache can change the bundled document, so it is rendered again
+    (tmp_path / "assets" / "icons.css").write_bytes(b"css")
+    ResumeFacade._render_pdf("<p>remote</p>")
+    assert calls == {"bundle": 2, "render": 2}
@@ -0,0 +1,133 @@
+import pytest
+
+from src.utils import render_pool
+from src.utils.chrome_utils import chrome_render_options
+from src.utils.render_pool import RenderPool
+
+MB = 1024 * 1024
+
+
+class FakeDriver:
+    def __init__(self, slot: int, heap_growth: float = 0):
+        self.slot = slot
+        self.heap_growth = heap_growth
+        self.heap = 10 * MB
+        self.quit_called = False
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Performance.getMetrics":
+            # Metrics are read once at launch, then once after each render
+            heap, self.heap = self.heap, self.heap + self.heap_growth
+            return {"metrics": [{"name": "JSHeapUsedSize", "value": heap}]}
+        return {}
+
+    def quit(self):
+        self.quit_called = True
+
+
+def fake_factory(heap_growth: float = 0):
+    launched = []
+
+    def factory(slot):
+        launched.append(FakeDriver(slot, heap_growth))
+        return launched[-1]
+
+    return factory, launched
+
+
+def test_returned_browser_is_reused():
+    factory, launched = fake_factory()
+    pool = RenderPool(size=2, max_renders=10, driver_factory=factory)
+
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert first is second
+    assert len(launched) == 1 and not first.quit_called
+
+
+def test_browser_is_retired_after_max_renders():
+    factory, launched = fake_factory()
+    pool = RenderPool(size=1, max_renders=2, driver_factory=factory)
+
+    for _ in range(3):
+        with pool.lease():
+            pass
+
+    assert len(launched) == 2
+    assert launched[0].quit_called and not launched[1].quit_called
+
+
+def test_browser_is_retired_when_its_heap_grows_too_much():
+    factory, launched = fake_factory(heap_growth=30 * MB)
+    pool = RenderPool(size=1, max_renders=100, max_heap_growth_mb=50, driver_factory=factory)
+
+    with pool.lease():
+        pass
+    assert not launched[0].quit_called  # Grew by 30 MB
+    with pool.lease():
+        pass
+    assert launched[0].quit_called  # Grew by 60 MB
+    with pool.lease() as driver:
+        assert driver is launched[1]
+
+
+def test_browser_that_failed_a_render_is_retired():
+    factory, launched = fake_factory()
+    pool = RenderPool(size=1, max_renders=10, driver_factory=factory)
+
+    with pytest.raises(ValueError):
+        with pool.lease():
+            raise ValueError("render failed")
+
+    assert launched[0].quit_called
+    # The slot is free again for a replacement
+    with pool.lease() as driver:
+        assert driver is launched[1] and driver.slot == 0
+
+
+def test_shutdown_closes_idle_browsers_and_leased_ones_on_return():
+    factory, launched = fake_factory()
+    pool = RenderPool(size=2, max_renders=10, driver_factory=factory)
+
+    with pool.lease() as leased:
+        with pool.lease() as idle:
+            pass
+        pool.shutdown()
+        assert idle.quit_called and not leased.quit_called
+    assert leased.quit_called
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+
+
+def test_default_pool_is_shared_and_shut_down_at_exit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(RenderPool, "_default", None)
+    monkeypatch.setattr(render_pool.atexit, "register", registered.append)
+
+    pool = RenderPool.default()
+
+    assert RenderPool.default() is pool
+    assert registered == [pool.shutdown]
+
+
+def test_browsers_alive_at_the_same_time_get_distinct_slots():
+    factory, launched = fake_factory()
+    pool = RenderPool(size=2, max_renders=1, driver_factory=factory)
+    with pool.lease() as first, pool.lease() as second:
+        assert {first.slot, second.slot} == {0, 1}
+    # Both retired after one render; their replacements reuse the freed slots
+    with pool.lease() as third:
+        assert third.slot in (0, 1)
+    assert sorted(driver.slot for driver in launched[:2]) == [0, 1]
+
+
+def test_each_slot_has_its_own_disk_cache():
+    def disk_cache(options):
+        return next(argument for argument in options.arguments if argument.startswith("--disk-cache-dir="))
+
+    assert disk_cache(chrome_render_options(0)) != disk_cache(chrome_render_options(1))
+    assert disk_cache(chrome_render_options(1)).endswith("slot-1")
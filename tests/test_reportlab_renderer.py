@@ -0,0 +1,63 @@
+import io
+import logging
+from contextlib import contextmanager
+
+import pytest
+from pdfminer.high_level import extract_text
+
+from src.libs.resume_and_cover_builder import resume_facade
+from src.libs.resume_and_cover_builder.config import global_config
+from src.libs.resume_and_cover_builder.reportlab_renderer import (
+    HTML_to_PDF_reportlab, _unicode_fonts, can_render_reportlab,
+)
+from src.libs.resume_and_cover_builder.resume_facade import ResumeFacade
+
+
+def document(body: str) -> str:
+    return f"<html><head><style>body {{ font-family: 'Barlow', sans-serif; }}</style></head><body>{body}</body></html>"
+
+
+def pdf_text(pdf: bytes) -> str:
+    logging.getLogger("pdfminer").setLevel(logging.WARNING)
+    return extract_text(io.BytesIO(pdf))
+
+
+def test_western_text_uses_the_base_fonts():
+    pdf = HTML_to_PDF_reportlab(document("<h1>José Müller</h1><p>Café – résumé</p>"))
+
+    assert b"DejaVu" not in pdf
+    assert "José Müller" in pdf_text(pdf)
+
+
+def test_text_outside_winansi_keeps_its_characters():
+    if _unicode_fonts("Helvetica") is None:
+        pytest.skip("DejaVu fonts are not installed")
+    html = document("<h1>Łukasz Żółć</h1><p><b>Gdańsk</b>, <i>Kraków</i> → Łódź</p>")
+
+    assert can_render_reportlab(html)
+    text = pdf_text(HTML_to_PDF_reportlab(html))
+    assert "Łukasz Żółć" in text
+    assert "Gdańsk" in text and "Łódź" in text
+
+
+def test_cannot_render_characters_without_a_font():
+    assert can_render_reportlab(document("<p>Plain resume</p>"))
+    assert not can_render_reportlab(document("<p>日本語</p>"))
+
+
+def test_facade_falls_back_to_chrome(tmp_path, monkeypatch):
+    monkeypatch.setattr(global_config, "PDF_RENDERER", "reportlab", raising=False)
+    monkeypatch.setattr(global_config, "BUNDLE_ASSETS", False, raising=False)
+    monkeypatch.setattr(global_config, "PDF_RENDER_CACHE_MAX_MB", 0, raising=False)
+    monkeypatch.setattr(global_config, "CACHE_DIRECTORY", tmp_path, raising=False)
+
+    class Pool:
+        @contextmanager
+        def lease(self):
+            yield None
+
+    monkeypatch.setattr(resume_facade.RenderPool, "default", classmethod(lambda cls: Pool()))
+    monkeypatch.setattr(resume_facade, "HTML_to_PDF_bytes", lambda html, driver: b"%PDF chrome")
+
+    assert ResumeFacade._render_pdf(document("<p>日本語</p>")) == b"%PDF chrome"
+    assert ResumeFacade._render_pdf(document("<p>Plain</p>")).startswith(b"%PDF-")
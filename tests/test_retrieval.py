@@ -0,0 +1,25 @@
+import pytest
+
+from src.libs.resume_and_cover_builder.retrieval import (
+    BM25RetrievalBackend,
+    EmbeddingRetrievalBackend,
+    create_retrieval_backend,
+)
+
+
+def no_embeddings():
+    raise AssertionError("The embeddings model should not be built")
+
+
+def test_backends_are_created_by_name():
+    sentinel = object()
+
+    assert isinstance(create_retrieval_backend("bm25", no_embeddings), BM25RetrievalBackend)
+    backend = create_retrieval_backend("embeddings", lambda: sentinel)
+    assert isinstance(backend, EmbeddingRetrievalBackend)
+
+
+@pytest.mark.parametrize("name", ["faiss", "chroma"])
+def test_unknown_backends_are_rejected(name):
+    with pytest.raises(ValueError, match=name):
+        create_retrieval_backend(name, no_embeddings)
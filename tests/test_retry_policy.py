@@ -0,0 +1,120 @@
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.libs import retry_policy
+from src.libs.retry_policy import RetryError, RetryPolicy
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status_code: int = None, headers: dict = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waited = []
+    monkeypatch.setattr(retry_policy.time, "sleep", waited.append)
+    return waited
+
+
+def failing_then(result, *errors):
+    outcomes = iter(errors)
+    calls = []
+
+    def fn(*args, **kwargs):
+        calls.append((args, kwargs))
+        error = next(outcomes, None)
+        if error is not None:
+            raise error
+        return result
+
+    fn.calls = calls
+    return fn
+
+
+def test_classifies_errors():
+    policy = RetryPolicy(hedge=False)
+    assert policy.is_retryable(ApiError("rate limited", 429))
+    assert policy.is_retryable(ApiError("bad gateway", 502))
+    assert policy.is_retryable(TimeoutError("read timed out"))
+    assert not policy.is_retryable(ApiError("bad request", 400))
+    assert not policy.is_retryable(ApiError("You exceeded your quota: insufficient_quota", 429))
+    assert not policy.is_retryable(KeyError("content"))
+
+
+def test_reads_the_server_wait_time():
+    policy = RetryPolicy(hedge=False)
+    assert policy.retry_after(ApiError("slow down", 429, {"retry-after-ms": "1500"})) == 1.5
+    assert policy.retry_after(ApiError("slow down", 429, {"retry-after": "3"})) == 3.0
+    assert policy.retry_after(ApiError("Rate limit reached. Please try again in 250ms.")) == 0.25
+    assert policy.retry_after(ApiError("Please try again in 7.5s")) == 7.5
+    assert policy.retry_after(ApiError("overloaded", 529)) is None
+
+
+def test_backoff_is_jittered_below_the_capped_ceiling():
+    policy = RetryPolicy(base_delay=1, max_delay=5, hedge=False)
+    for attempt, ceiling in ((0, 1), (1, 2), (2, 4), (5, 5)):
+        delays = [policy.backoff(attempt) for _ in range(50)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def test_retries_until_success(sleeps):
+    fn = failing_then("ok", ApiError("overloaded", 503), ApiError("limited", 429, {"retry-after": "2"}))
+    policy = RetryPolicy(max_attempts=3, base_delay=1, hedge=False)
+
+    assert policy.call(fn, "prompt", temperature=0) == "ok"
+    assert len(fn.calls) == 3
+    assert fn.calls[0] == (("prompt",), {"temperature": 0})
+    assert 0 <= sleeps[0] <= 1 and sleeps[1] == 2.0
+
+
+def test_fatal_error_is_raised_without_retrying(sleeps):
+    fn = failing_then("ok", ApiError("bad request", 400))
+
+    with pytest.raises(ApiError):
+        RetryPolicy(hedge=False).call(fn)
+    assert len(fn.calls) == 1 and sleeps == []
+
+
+def test_gives_up_after_max_attempts(sleeps):
+    fn = failing_then("ok", *[ApiError("overloaded", 503)] * 5)
+
+    with pytest.raises(RetryError):
+        RetryPolicy(max_attempts=3, hedge=False).call(fn)
+    assert len(fn.calls) == 3 and len(sleeps) == 2
+
+
+def test_gives_up_when_the_wait_exceeds_the_deadline(sleeps):
+    fn = failing_then("ok", ApiError("limited", 429, {"retry-after": "30"}))
+
+    with pytest.raises(RetryError, match="Deadline"):
+        RetryPolicy(deadline=10, hedge=False).call(fn)
+    assert len(fn.calls) == 1 and sleeps == []
+
+
+def test_hedged_request_returns_the_faster_reply():
+    policy = RetryPolicy(hedge=True, hedge_percentile=0.5, hedge_min_samples=1)
+    policy._record_latency(0.05)
+    counter = itertools.count()
+    release = threading.Event()
+
+    def fn():
+        if next(counter) == 0:
+            # The first request hangs until the test is over
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    start = time.monotonic()
+    try:
+        assert policy.call(fn) == "fast"
+        assert time.monotonic() - start < 2
+    finally:
+        release.set()
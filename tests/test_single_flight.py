@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import time
+
+from src.libs.single_flight import SingleFlight
+
+
+def counting_call(result="reply", delay=0.0):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(delay)
+        return f"{result}-{len(calls)}"
+
+    return fn, calls
+
+
+def test_sequential_calls_are_not_cached(tmp_path):
+    single_flight = SingleFlight(lock_dir=tmp_path)
+    fn, calls = counting_call()
+
+    assert single_flight.do("key", fn) == ("reply-1", False)
+    assert single_flight.do("key", fn) == ("reply-2", False)
+    assert len(calls) == 2
+
+
+def test_concurrent_calls_in_process_share_one_call(tmp_path):
+    single_flight = SingleFlight(lock_dir=tmp_path)
+    fn, calls = counting_call(delay=0.3)
+    results = []
+
+    def call():
+        results.append(single_flight.do("key", fn))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert {value for value, _ in results} == {"reply-1"}
+
+
+def test_waits_for_result_of_another_process(tmp_path):
+    single_flight = SingleFlight(lock_dir=tmp_path, poll_interval=0.02)
+    key = "key"
+    lock_path = tmp_path / f"{key}.lock"
+    lock_path.write_text("12345")
+
+    waiters_seen = []
+
+    def other_process():
+        time.sleep(0.2)
+        waiters_seen.append(single_flight._has_waiters(key))
+        (tmp_path / f"{key}.json").write_text(json.dumps("from other process"))
+        os.remove(lock_path)
+
+    thread = threading.Thread(target=other_process)
+    thread.start()
+    fn, calls = counting_call()
+    result = single_flight.do(key, fn)
+    thread.join()
+
+    assert result == ("from other process", True)
+    assert calls == []
+    assert waiters_seen == [True]
+    # The only waiter read the reply, so nothing is left on disk
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_result_is_only_written_for_waiters(tmp_path):
+    single_flight = SingleFlight(lock_dir=tmp_path)
+
+    single_flight.do("alone", counting_call()[0])
+    assert list(tmp_path.iterdir()) == []
+
+    (tmp_path / "waited.999.1.wait").touch()
+    single_flight.do("waited", counting_call()[0])
+    assert json.loads((tmp_path / "waited.json").read_text()) == "reply-1"
+
+
+def test_result_published_before_the_lock_is_ignored(tmp_path):
+    single_flight = SingleFlight(lock_dir=tmp_path, poll_interval=0.02)
+    key = "key"
+    result_path = tmp_path / f"{key}.json"
+    result_path.write_text(json.dumps("old reply"))
+    old = time.time() - 5
+    os.utime(result_path, (old, old))
+    lock_path = tmp_path / f"{key}.lock"
+    lock_path.write_text("12345")
+
+    # The other process fails without publishing anything
+    threading.Timer(0.1, os.remove, [lock_path]).start()
+    fn, calls = counting_call()
+
+    assert single_flight.do(key, fn) == ("reply-1", False)
+    assert len(calls) == 1
+
+
+def test_abandoned_lock_is_broken(tmp_path):
+    single_flight = SingleFlight(lock_dir=tmp_path, lock_timeout=1, poll_interval=0.02)
+    lock_path = tmp_path / "key.lock"
+    lock_path.write_text("12345")
+    old = time.time() - 10
+    os.utime(lock_path, (old, old))
+    fn, calls = counting_call()
+
+    assert single_flight.do("key", fn) == ("reply-1", False)
+    assert not lock_path.exists()
+
+
+def test_files_of_dead_waiters_are_swept(tmp_path):
+    expired = tmp_path / "expired.json"
+    expired.write_text("{}")
+    marker = tmp_path / "expired.999.1.wait"
+    marker.touch()
+    fresh = tmp_path / "fresh.json"
+    fresh.write_text("{}")
+    old = time.time() - 120
+    os.utime(expired, (old, old))
+    os.utime(marker, (old, old))
+
+    SingleFlight(lock_dir=tmp_path, result_ttl=60, lock_timeout=60)
+
+    assert not expired.exists() and not marker.exists()
+    assert fresh.exists()
+
+
+def test_in_process_only(tmp_path):
+    single_flight = SingleFlight(lock_dir=None)
+    fn, calls = counting_call()
+
+    assert single_flight.do("key", fn) == ("reply-1", False)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_llm_call_key_includes_invocation_parameters():
+    from langchain_openai import ChatOpenAI
+
+    from src.libs.single_flight import llm_call_key
+
+    def model(temperature):
+        return ChatOpenAI(model_name="gpt-4o-mini", openai_api_key="sk-test", temperature=temperature)
+
+    class Adapter:
+        def __init__(self, model):
+            self.model = model
+
+    prompt = "Write a cover letter"
+    assert llm_call_key(model(0.4), prompt) == llm_call_key(model(0.4), prompt)
+    assert llm_call_key(model(0.4), prompt) != llm_call_key(model(0.9), prompt)
+    assert llm_call_key(Adapter(model(0.4)), prompt) == llm_call_key(model(0.4), prompt)
+    assert llm_call_key(model(0.4), prompt) != llm_call_key(model(0.4), "Write a resume")
+
+
+def test_two_processes_share_a_call_and_leave_nothing_on_disk(tmp_path):
+    # Separate instances do not share futures, like separate processes
+    leader, follower = SingleFlight(lock_dir=tmp_path, poll_interval=0.02), SingleFlight(lock_dir=tmp_path, poll_interval=0.02)
+    fn, calls = counting_call(delay=0.3)
+    results = []
+
+    thread = threading.Thread(target=lambda: results.append(leader.do("key", fn)))
+    thread.start()
+    time.sleep(0.1)
+    results.append(follower.do("key", fn))
+    thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("reply-1", False), ("reply-1", True)]
+    assert list(tmp_path.iterdir()) == []
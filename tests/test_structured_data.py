@@ -0,0 +1,60 @@
+import json
+
+from src.libs.resume_and_cover_builder.structured_data import extract_job_posting
+
+
+def test_json_ld_job_posting():
+    posting = {
+        "@context": "https://schema.org",
+        "@graph": [
+            {"@type": "WebPage", "name": "Careers"},
+            {
+                "@type": "JobPosting",
+                "title": "Senior Engineer",
+                "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+                "jobLocation": {"@type": "Place", "address": {"addressLocality": "Berlin", "addressCountry": "DE"}},
+                "description": "&lt;p&gt;Build &lt;b&gt;things&lt;/b&gt;.&lt;/p&gt;",
+            },
+        ],
+    }
+    html = f'<html><head><script type="application/ld+json">{json.dumps(posting)}</script></head><body></body></html>'
+
+    assert extract_job_posting(html) == {
+        "role": "Senior Engineer",
+        "company": "Acme",
+        "location": "Berlin, DE",
+        "description": "Build things.",
+    }
+
+
+def test_invalid_json_ld_is_skipped():
+    html = '<script type="application/ld+json">{not json</script>'
+
+    assert extract_job_posting(html) == {}
+
+
+def test_microdata_text_property_keeps_nested_elements():
+    html = """
+    <div itemscope itemtype="https://schema.org/JobPosting">
+      <h1 itemprop="title">Data Engineer</h1>
+      <div itemprop="description">
+        <div>First paragraph.</div>
+        <div>Second <div>nested</div> paragraph.</div>
+      </div>
+      <span itemprop="hiringOrganization" itemscope itemtype="https://schema.org/Organization">
+        <meta itemprop="name" content="Initech">
+      </span>
+    </div>
+    """
+
+    fields = extract_job_posting(html)
+
+    assert fields["role"] == "Data Engineer"
+    assert fields["description"] == "First paragraph. Second nested paragraph."
+    assert fields["company"] == "Initech"
+
+
+def test_open_graph_title_is_not_used_as_role():
+    html = '<head><meta property="og:title" content="Acme hiring Senior Engineer in Berlin | LinkedIn"></head>'
+
+    assert "role" not in extract_job_posting(html)